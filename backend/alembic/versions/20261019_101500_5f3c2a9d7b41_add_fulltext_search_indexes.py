@@ -0,0 +1,42 @@
+"""add_fulltext_search_indexes
+
+Revision ID: 5f3c2a9d7b41
+Revises: acba37c024c3
+Create Date: 2026-10-19 10:15:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+
+revision: str = '5f3c2a9d7b41'
+down_revision: Union[str, None] = 'acba37c024c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FULLTEXT_INDEXES = [
+    ('ft_users_search', 'users', ['name', 'surname', 'email']),
+    ('ft_heritage_resources_search', 'heritage_resources', ['name', 'ownership', 'management_model', 'postal_address']),
+    ('ft_heritage_resources_name', 'heritage_resources', ['name']),
+    ('ft_stakeholders_search', 'stakeholders', ['name', 'description']),
+    ('ft_stakeholders_name', 'stakeholders', ['name']),
+    ('ft_material_topics_search', 'material_topics', ['name', 'description']),
+    ('ft_material_topics_name', 'material_topics', ['name']),
+]
+
+
+def upgrade() -> None:
+
+
+    for index_name, table_name, columns in FULLTEXT_INDEXES:
+        op.create_index(index_name, table_name, columns, unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+
+
+    for index_name, table_name, _ in reversed(FULLTEXT_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,62 @@
+"""add_normalized_search_keys
+
+Revision ID: 8b1e4d6f2c90
+Revises: 5f3c2a9d7b41
+Create Date: 2026-10-19 11:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.text_normalization import fold_text
+
+
+
+revision: str = '8b1e4d6f2c90'
+down_revision: Union[str, None] = '5f3c2a9d7b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_KEYS = [
+    ('users', 'name', 100),
+    ('users', 'surname', 255),
+    ('users', 'email', 255),
+    ('heritage_resources', 'name', 255),
+    ('material_topics', 'name', 255),
+]
+
+BATCH_SIZE = 1000
+
+
+def _backfill(table_name: str, column_name: str) -> None:
+    bind = op.get_bind()
+    table = sa.table(table_name, sa.column('id'), sa.column(column_name), sa.column(f'{column_name}_search'))
+    rows = bind.execute(sa.select(table.c.id, table.c[column_name])).all()
+    update = (
+        sa.update(table)
+        .where(table.c.id == sa.bindparam('row_id'))
+        .values({f'{column_name}_search': sa.bindparam('search_key')})
+    )
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        bind.execute(update, [{'row_id': row[0], 'search_key': fold_text(row[1])} for row in batch])
+
+
+def upgrade() -> None:
+
+
+    for table_name, column_name, length in SEARCH_KEYS:
+        op.add_column(table_name, sa.Column(f'{column_name}_search', sa.String(length=length), nullable=True))
+        _backfill(table_name, column_name)
+        op.create_index(op.f(f'ix_{table_name}_{column_name}_search'), table_name, [f'{column_name}_search'], unique=False)
+
+
+def downgrade() -> None:
+
+
+    for table_name, column_name, _ in reversed(SEARCH_KEYS):
+        op.drop_index(op.f(f'ix_{table_name}_{column_name}_search'), table_name=table_name)
+        op.drop_column(table_name, f'{column_name}_search')
@@ -0,0 +1,48 @@
+"""add_materiality_aggregates
+
+Revision ID: 3d7a9c1e5b28
+Revises: 8b1e4d6f2c90
+Create Date: 2026-10-19 14:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+revision: str = '3d7a9c1e5b28'
+down_revision: Union[str, None] = '8b1e4d6f2c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+
+
+    op.create_table('materiality_aggregates',
+    sa.Column('material_topic_id', sa.Integer(), nullable=False),
+    sa.Column('stakeholder_type', sa.Enum('internal', 'external', name='stakeholder_type'), nullable=False),
+    sa.Column('assessment_count', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.BigInteger(), nullable=False),
+    sa.Column('score_sum_sq', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['material_topic_id'], ['material_topics.id'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('material_topic_id', 'stakeholder_type')
+    )
+    op.execute(
+        """
+        INSERT INTO materiality_aggregates
+            (material_topic_id, stakeholder_type, assessment_count, score_sum, score_sum_sq)
+        SELECT a.material_topic_id, s.type, COUNT(*), SUM(a.score), SUM(a.score * a.score)
+        FROM assessments a
+        JOIN stakeholders s ON s.id = a.stakeholder_id
+        GROUP BY a.material_topic_id, s.type
+        """
+    )
+
+
+def downgrade() -> None:
+
+
+    op.drop_table('materiality_aggregates')
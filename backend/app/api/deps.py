@@ -1,11 +1,13 @@
 from typing import Generator
-from fastapi import Depends, HTTPException, status
+import secrets
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
-from app import crud
+from app.services import auth_context
+from app.services.permissions import PermissionResolver
 from app.config import settings
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, ReadSessionLocal, has_read_replica
 from app.schemas.auth import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
@@ -14,18 +16,33 @@ def get_db() -> Generator:
     """
     Obtiene una sesión de la base de datos
     """
+    db = SessionLocal()
     try:
-        db = SessionLocal()
         yield db
     finally:
         db.close()
 
-async def get_current_user(
+def get_read_db(db: Session = Depends(get_db)) -> Generator:
+    """
+    Obtiene una sesión para búsquedas y listados de solo lectura. Va a la réplica
+    si DATABASE_REPLICA_URL está configurada; si no, reutiliza la sesión de get_db
+    para no ocupar una segunda conexión del pool.
+    """
+    if not has_read_replica():
+        yield db
+        return
+    read_db = ReadSessionLocal()
+    try:
+        yield read_db
+    finally:
+        read_db.close()
+
+def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme)
 ) -> TokenData:
     """
-    Obtiene el usuario actual
+    Obtiene el usuario actual a partir del contexto de autenticación cacheado.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -42,8 +59,27 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = crud.user.get_by_email(db, email=email)
-    if user is None:
+    context = auth_context.get_auth_context(db, email)
+    if context is None:
         raise credentials_exception
     
-    return TokenData(id=user.id, email=email, admin=user.admin)
\ No newline at end of file
+    return TokenData(id=context.user_id, email=email, admin=context.admin)
+
+def get_permissions(
+    db: Session = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user)
+) -> PermissionResolver:
+    """
+    Resolución de permisos del usuario actual para la petición en curso
+    """
+    return PermissionResolver(db, current_user)
+
+def verify_internal_token(request: Request) -> None:
+    """
+    Protege los endpoints internos (fuera de /api): si METRICS_TOKEN está
+    definido exige `Authorization: Bearer <token>`.
+    """
+    if settings.METRICS_TOKEN:
+        authorization = request.headers.get("authorization", "")
+        if not secrets.compare_digest(authorization, f"Bearer {settings.METRICS_TOKEN}"):
+            raise HTTPException(status_code=401, detail="Token de métricas no válido")
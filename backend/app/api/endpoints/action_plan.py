@@ -12,8 +12,8 @@ from app.schemas.action_plan import (
 from app.schemas.auth import TokenData
 from app.crud import action_plan as crud_action_plan
 from app.crud import reports as crud_reports
-from app.crud import ods as crud_ods
-from app.utils.graphs.internal_consistency import get_dimension_totals, generate_internal_consistency_graph
+from app.utils.graphs.internal_consistency import generate_internal_consistency_graph
+from app.crud import impact_analytics
 
 router = APIRouter()
 
@@ -341,15 +341,10 @@ def get_internal_consistency_graph(
             )
 
         
-        main_weight = float(report.main_impact_weight if report.main_impact_weight is not None else 0)
-        secondary_weight = float(report.secondary_impact_weight if report.secondary_impact_weight is not None else 0)
+        main_weight, secondary_weight = impact_analytics.get_report_weights(report)
 
         
-        primary_impacts = crud_action_plan.get_all_action_main_impacts(db, report_id)
-        secondary_impacts = crud_ods.get_all_action_secondary_impacts_counts(db, report_id)
-
-        
-        dimension_totals, dimension_totals_list = get_dimension_totals(primary_impacts, secondary_impacts, main_weight, secondary_weight)
+        dimension_totals, dimension_totals_list = impact_analytics.get_dimension_totals(db, report_id, main_weight, secondary_weight)
 
         
         graph_data_url, _ = generate_internal_consistency_graph(dimension_totals)
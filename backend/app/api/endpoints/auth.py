@@ -1,6 +1,7 @@
 from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app import crud
 from app.api import deps
@@ -16,20 +17,26 @@ async def login_access_token(
     db: Session = Depends(deps.get_db)
 ) -> Any:
     """
-    Login for access token using email and password
+    Login for access token using email and password.
+    Las consultas y bcrypt se ejecutan fuera del bucle de eventos; si el hash se
+    generó con otro coste, se vuelve a calcular con BCRYPT_ROUNDS.
     """
-    user = crud.user.get_by_email(db, email=form_data.email)
+    user = await run_in_threadpool(crud.user.get_by_email, db, email=form_data.email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Correo electrónico o contraseña incorrectos"
         )
     
-    if not security.verify_password(form_data.password, user.password):
+    if not await security.verify_password_async(form_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Correo electrónico o contraseña incorrectos"
         )
+
+    if security.needs_rehash(user.password):
+        new_hash = await security.get_password_hash_async(form_data.password)
+        await run_in_threadpool(crud.user.set_password_hash, db, user, new_hash)
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
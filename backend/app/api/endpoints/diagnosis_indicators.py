@@ -8,9 +8,8 @@ from app.schemas.diagnosis_indicators import (
     DiagnosisIndicatorCreate,
     DiagnosisIndicatorUpdate
 )
-from app.api.deps import get_db, get_current_user
-from app.schemas.auth import TokenData
-from app.services.user import check_user_permissions
+from app.api.deps import get_db, get_permissions
+from app.services.permissions import PermissionResolver
 from app.models.models import MaterialTopic
 
 router = APIRouter()
@@ -19,19 +18,14 @@ router = APIRouter()
 def get_all_by_report(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtiene todos los indicadores de un reporte
     """
-    if not current_user.admin:
-        has_permission, error_message = check_user_permissions(
-            db=db,
-            user_id=current_user.id,
-            report_id=report_id
-        )
-        if not has_permission:
-            raise HTTPException(status_code=403, detail=error_message)
+    has_permission, error_message = permissions.check(report_id)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
 
     try:
         indicators = crud.get_all_by_report(db, report_id)
@@ -43,7 +37,7 @@ def get_all_by_report(
 def create_indicator(
     indicator: DiagnosisIndicatorCreate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Crea un indicador de diagnóstico
@@ -54,15 +48,9 @@ def create_indicator(
     
     report_id = material_topic.report_id
 
-    if not current_user.admin:
-        has_permission, error_message = check_user_permissions(
-            db=db,
-            user_id=current_user.id,
-            report_id=report_id,
-            require_manager=True
-        )
-        if not has_permission:
-            raise HTTPException(status_code=403, detail=error_message)
+    has_permission, error_message = permissions.check(report_id, require_manager=True)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
     
     if indicator.type == 'quantitative' and (indicator.numeric_response is None or indicator.unit is None):
         raise HTTPException(
@@ -91,21 +79,14 @@ def update_indicator(
     indicator_id: int,
     indicator_update: DiagnosisIndicatorUpdate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualiza un indicador de diagnóstico
     """
-    report_id = crud.get_report_id_by_indicator(db, indicator_id)
-    if not current_user.admin:
-        has_permission, error_message = check_user_permissions(
-            db=db,
-            user_id=current_user.id,
-            report_id=report_id,
-            require_manager=True
-        )
-        if not has_permission:
-            raise HTTPException(status_code=403, detail=error_message)
+    _, has_permission, error_message = permissions.check_entity("diagnosis_indicator", indicator_id, require_manager=True)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
 
     indicator = crud.update_indicator(db, indicator_id, indicator_update)
     if not indicator:
@@ -116,21 +97,14 @@ def update_indicator(
 def delete_indicator(
     indicator_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Elimina un indicador de diagnóstico
     """
-    report_id = crud.get_report_id_by_indicator(db, indicator_id)
-    if not current_user.admin:
-        has_permission, error_message = check_user_permissions(
-            db=db,
-            user_id=current_user.id,
-            report_id=report_id,
-            require_manager=True
-        )
-        if not has_permission:
-            raise HTTPException(status_code=403, detail=error_message)
+    _, has_permission, error_message = permissions.check_entity("diagnosis_indicator", indicator_id, require_manager=True)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
 
     try:
         success = crud.delete_indicator(db, indicator_id)
@@ -144,20 +118,14 @@ def delete_indicator(
 def get_indicator(
     indicator_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtiene un indicador de diagnóstico
     """
-    report_id = crud.get_report_id_by_indicator(db, indicator_id)
-    if not current_user.admin:
-        has_permission, error_message = check_user_permissions(
-            db=db,
-            user_id=current_user.id,
-            report_id=report_id
-        )
-        if not has_permission:
-            raise HTTPException(status_code=403, detail=error_message)
+    _, has_permission, error_message = permissions.check_entity("diagnosis_indicator", indicator_id)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
 
     try:
         indicator = crud.get_indicator(db, indicator_id)
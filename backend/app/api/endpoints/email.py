@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from app.services.email import send_contact_info_to_server, send_change_password_verification_mail
 from app.schemas.email import ContactFormData
 from app.crud import user as crud_user
@@ -29,10 +30,10 @@ async def send_change_password_verification(data: PasswordResetRequest, db: Sess
     """
     try:
         
-        user = crud_user.get_by_email(db, email=data.email)
+        user = await run_in_threadpool(crud_user.get_by_email, db, email=data.email)
         if not user:
             return {"message": ""}
-        token = await crud_user.generate_change_password_token(db, data.email)
+        token = await run_in_threadpool(crud_user.generate_change_password_token, db, data.email)
         if not token:
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
         
@@ -1,17 +1,23 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, get_read_db, get_permissions
 from app.schemas.goals import Goal, GoalList, MainImpactUpdate
 from app.schemas.auth import TokenData
 from app.crud import goals as crud_goals
-from app.services.user import check_user_permissions
+from app.services.permissions import PermissionResolver
+from app.services.reference_data import get_reference_data
+from app.api.http_cache import not_modified, set_cache_headers
+
+REFERENCE_CACHE_CONTROL = "private, max-age=86400"
 
 router = APIRouter()
 
 @router.get("/goals/get/{ods_id}", response_model=GoalList)
 def get_goals_by_ods(
     ods_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
@@ -20,7 +26,13 @@ def get_goals_by_ods(
     """
 
     try:
+        etag = get_reference_data(db).etag
+        cached = not_modified(request, etag, REFERENCE_CACHE_CONTROL)
+        if cached:
+            return cached
+
         goals = crud_goals.get_goals_by_ods(db, ods_id)
+        set_cache_headers(response, etag, REFERENCE_CACHE_CONTROL)
         return {
             "items": goals,
             "total": len(goals)
@@ -35,20 +47,14 @@ def get_goals_by_ods(
 def update_main_impact(
     update_data: MainImpactUpdate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar el impacto principal de un asunto de materialidad.
     """
-    if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=update_data.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+    has_permission, error_message = permissions.check(update_data.report_id, require_manager=True)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
 
     try:
         crud_goals.update_main_impact(
@@ -71,7 +77,9 @@ def update_main_impact(
 
 @router.get("/goals/get-all", response_model=GoalList)
 def get_all_goals(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
@@ -79,7 +87,13 @@ def get_all_goals(
     """
 
     try:
+        etag = get_reference_data(db).etag
+        cached = not_modified(request, etag, REFERENCE_CACHE_CONTROL)
+        if cached:
+            return cached
+
         goals = crud_goals.get_all_goals(db)
+        set_cache_headers(response, etag, REFERENCE_CACHE_CONTROL)
         return {
             "items": goals,
             "total": len(goals)
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.api.deps import verify_internal_token
+from app.db.session import check_database_connection, get_pool_stats
+from app.services import survey_ingestion
+import logging
+
+
+router = APIRouter()
+internal_router = APIRouter()
+
+@router.get("/health")
+def health():
+    """
+    Estado del servicio para el balanceador y el healthcheck de Docker.
+    Solo indica si la base de datos responde (503 si no); los detalles están en
+    /health/details, fuera de /api.
+    """
+    try:
+        check_database_connection()
+    except Exception as e:
+        logging.error(f"Health check: error al conectar a la base de datos: {str(e)}")
+        raise HTTPException(status_code=503, detail="Base de datos no disponible")
+    return {"status": "ok"}
+
+@internal_router.get("/health/details", include_in_schema=False, dependencies=[Depends(verify_internal_token)])
+def health_details():
+    """
+    Diagnóstico interno: versión y latencia de la base de datos, pools de
+    conexiones y escritor de encuestas. Se sirve fuera de /api, como /metrics.
+    """
+    try:
+        database = check_database_connection()
+    except Exception as e:
+        logging.error(f"Health check: error al conectar a la base de datos: {str(e)}")
+        raise HTTPException(status_code=503, detail="Base de datos no disponible")
+
+    writer = survey_ingestion.get_writer()
+    return {
+        "status": "ok",
+        "database": {
+            "dialect": database["dialect"],
+            "version": database["version"],
+            "latency_ms": database["latency_ms"]
+        },
+        "pools": get_pool_stats(),
+        "survey_writer": writer.stats()["running"] if writer is not None else None
+    }
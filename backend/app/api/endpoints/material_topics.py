@@ -1,17 +1,16 @@
 from typing import List 
 from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_read_db, get_permissions
 from app.schemas.material_topics import (
     MaterialTopic,
     MaterialTopicCreate,
     MaterialTopicUpdate,
     MaterialTopicSearch
 )
-from app.schemas.auth import TokenData
 from app.crud import material_topics as crud_material_topic
 from app.utils.graphs.materiality_matrix import create_materiality_matrix_data, generate_matrix_image
-from app.services.user import check_user_permissions
+from app.services.permissions import PermissionResolver
 
 router = APIRouter()
 
@@ -20,22 +19,17 @@ router = APIRouter()
 @router.post("/material-topics/search", response_model=dict)
 def search_material_topics(
     search_params: MaterialTopicSearch,
-    db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Buscar asuntos relevantes con filtros opcionales.
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=search_params.report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(search_params.report_id)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         
         material_topics = crud_material_topic.search(
@@ -76,19 +70,14 @@ def search_material_topics(
 def create_material_topic(
     material_topic_data: MaterialTopicCreate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Crear un nuevo asunto de materialidad.
     """
-    if not current_user.admin:
-        has_permission, error_message = check_user_permissions(
-            db=db,
-            user_id=current_user.id,
-            report_id=material_topic_data.report_id
-        )
-        if not has_permission:
-            raise HTTPException(status_code=403, detail=error_message)
+    has_permission, error_message = permissions.check(material_topic_data.report_id)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
     
     existing_material_topic = crud_material_topic.get_by_name(db, material_topic_data.name)
     if existing_material_topic and existing_material_topic.report_id == material_topic_data.report_id:
@@ -111,7 +100,7 @@ def update_material_topic(
     material_topic_id: int,
     material_topic_data: MaterialTopicUpdate = Body(...),
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar un asunto de materialidad.
@@ -125,14 +114,9 @@ def update_material_topic(
         )
 
     
-    if not current_user.admin:
-        has_permission, error_message = check_user_permissions(
-            db=db,
-            user_id=current_user.id,
-            report_id=db_material_topic.report_id
-        )
-        if not has_permission:
-            raise HTTPException(status_code=403, detail=error_message)
+    has_permission, error_message = permissions.check(db_material_topic.report_id)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
     
     try:
         updated_material_topic = crud_material_topic.update(db, db_material_topic, material_topic_data)
@@ -147,7 +131,7 @@ def update_material_topic(
 def delete_material_topic(
     material_topic_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Eliminar un asunto de materialidad.
@@ -161,14 +145,9 @@ def delete_material_topic(
         )
 
     
-    if not current_user.admin:
-        has_permission, error_message = check_user_permissions(
-            db=db,
-            user_id=current_user.id,
-            report_id=db_material_topic.report_id
-        )
-        if not has_permission:
-            raise HTTPException(status_code=403, detail=error_message)
+    has_permission, error_message = permissions.check(db_material_topic.report_id)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
     
     try:
         crud_material_topic.delete(db, db_material_topic)
@@ -197,10 +176,10 @@ def get_all_material_topics(
         )
 
 @router.post("/material-topics/get/materiality-matrix", response_model=dict)
-async def get_materiality_matrix(
+def get_materiality_matrix(
     data: dict = Body(...),
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtiene la matriz de materialidad
@@ -208,21 +187,17 @@ async def get_materiality_matrix(
     report_id = data.get('report_id')
     normalize = data.get('normalize', False)
     scale = data.get('scale', None)
+    exact = data.get('exact', False)
     if report_id is None:
         raise HTTPException(status_code=400, detail="report_id es requerido")
     
     
-    if not current_user.admin:
-        has_permission, error_message = check_user_permissions(
-            db=db,
-            user_id=current_user.id,
-            report_id=report_id
-        )
-        if not has_permission:
-            raise HTTPException(status_code=403, detail=error_message)
+    has_permission, error_message = permissions.check(report_id)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
 
     try:
-        matrix_data = create_materiality_matrix_data(db, report_id, normalize=normalize, scale=scale)
+        matrix_data = create_materiality_matrix_data(db, report_id, normalize=normalize, scale=scale, exact=exact)
         matrix_image = generate_matrix_image(matrix_data, scale=scale)
         return {
             "matrix_data": matrix_data,
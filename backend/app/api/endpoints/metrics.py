@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.api.deps import verify_internal_token
+from app.services import metrics
+
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False, dependencies=[Depends(verify_internal_token)])
+def get_metrics():
+    """
+    Métricas en formato de exposición de Prometheus. Se sirve fuera de /api, así
+    que el proxy público no la expone; si METRICS_TOKEN está definido se exige
+    además `Authorization: Bearer <token>`.
+    """
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -11,7 +11,9 @@ from app.schemas.action_plan import SpecificObjective, Action, PerformanceIndica
 from app.crud import material_topics as crud_material_topics
 from app.crud import action_plan as crud_action_plan
 from app.crud import ods as crud_ods
-from app.services.monitoring_templates import generate_monitoring_template
+from app.utils.lazy import lazy_import
+
+monitoring_templates = lazy_import("app.services.monitoring_templates")
 
 
 router = APIRouter()
@@ -104,7 +106,7 @@ def get_monitoring_template(
             template_data.append(topic_dict)
 
         
-        doc = generate_monitoring_template(template_data)
+        doc = monitoring_templates.generate_monitoring_template(template_data)
         
         
         docx_buffer = io.BytesIO()
@@ -1,7 +1,7 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, get_permissions, get_read_db
 from app.schemas.ods import (
     ODS, SecondaryImpactUpdate, SecondaryImpactResponse, 
     DimensionResponse, ActionSecondaryImpactUpdate, ActionSecondaryImpactResponse,
@@ -10,22 +10,27 @@ from app.schemas.ods import (
 from app.schemas.auth import TokenData
 from app.crud import ods as crud_ods
 from app.crud import material_topics as crud_material_topics
-from app.crud import action_plan as crud_action_plan
 from app.utils.graphs.main_secondary_impacts import (
     get_main_impacts_material_topics_graph,
-    get_secondary_impacts_material_topics_graph
+    get_secondary_impacts_counts_graph
 )
 
-from app.services.user import check_user_permissions
-from app.models.models import MaterialTopic as MaterialTopicModel, Action as ActionModel
+from app.services.permissions import PermissionResolver
+from app.services.reference_data import get_reference_data
+from app.api.http_cache import not_modified, set_cache_headers
 
 
 
 router = APIRouter()
 
+REFERENCE_CACHE_CONTROL = "private, max-age=86400"
+PUBLIC_REFERENCE_CACHE_CONTROL = "public, max-age=86400"
+
 @router.get("/ods/get-all", response_model=ODSList)
 def get_all_ods(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
@@ -33,8 +38,13 @@ def get_all_ods(
     Permite el acceso a cualquier usuario autenticado ya que los ODS son recursos globales.
     """
     try:
+        etag = get_reference_data(db).etag
+        cached = not_modified(request, etag, REFERENCE_CACHE_CONTROL)
+        if cached:
+            return cached
        
         ods_list = crud_ods.get_all_ods(db)
+        set_cache_headers(response, etag, REFERENCE_CACHE_CONTROL)
         
         return ODSList(
             items=ods_list,
@@ -50,7 +60,7 @@ def get_all_ods(
 def get_secondary_impacts(
     material_topic_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener los impactos secundarios de un asunto de materialidad.
@@ -58,19 +68,12 @@ def get_secondary_impacts(
     """
     try:
         
-        material_topic = crud_material_topics.get(db, material_topic_id)
-        if not material_topic:
+        report_id, has_permission, error_message = permissions.check_entity("material_topic", material_topic_id)
+        if report_id is None:
             raise HTTPException(status_code=404, detail="asunto de materialidad no encontrado")
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
-        
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=material_topic.report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
 
         ods_ids = crud_ods.get_secondary_impacts(db, material_topic_id)
         return {
@@ -87,7 +90,7 @@ def get_secondary_impacts(
 def get_main_impacts_graph(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener la gráfica de impactos principales de un reporte.
@@ -95,14 +98,9 @@ def get_main_impacts_graph(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         
         material_topics = crud_material_topics.get_all_by_report(db, report_id)
@@ -121,7 +119,7 @@ def get_main_impacts_graph(
 def get_secondary_impacts_graph(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener la gráfica de impactos secundarios de un reporte.
@@ -129,20 +127,15 @@ def get_secondary_impacts_graph(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         
-        secondary_impacts = crud_ods.get_all_secondary_impacts_by_report(db, report_id)
+        impact_counts = crud_ods.get_secondary_impact_counts_by_report(db, report_id)
         
         
-        graph_data_url = get_secondary_impacts_material_topics_graph(secondary_impacts)
+        graph_data_url = get_secondary_impacts_counts_graph(impact_counts)
         
         return {"graph_data_url": graph_data_url}
     except Exception as e:
@@ -155,7 +148,7 @@ def get_secondary_impacts_graph(
 def update_secondary_impacts(
     update_data: SecondaryImpactUpdate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar los impactos secundarios de un asunto de materialidad.
@@ -163,20 +156,14 @@ def update_secondary_impacts(
     """
     try:
         
-        material_topic = crud_material_topics.get(db, update_data.material_topic_id)
-        if not material_topic:
+        report_id, has_permission, error_message = permissions.check_entity(
+            "material_topic", update_data.material_topic_id, require_manager=True
+        )
+        if report_id is None:
             raise HTTPException(status_code=404, detail="asunto de materialidad no encontrado")
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
-        
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=material_topic.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
 
         crud_ods.update_secondary_impacts(
             db,
@@ -194,14 +181,22 @@ def update_secondary_impacts(
         )
 
 @router.get("/ods/get-all/dimensions", response_model=DimensionResponse)
-async def get_all_dimensions(
-    db: Session = Depends(get_db)
+def get_all_dimensions(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db)
 ):
     """
     Obtiene todas las dimensiones de los ODS con sus ODS correspondientes.
     """
     try:
+        etag = get_reference_data(db).etag
+        cached = not_modified(request, etag, PUBLIC_REFERENCE_CACHE_CONTROL)
+        if cached:
+            return cached
+
         ods_by_dimension = crud_ods.get_all_ods_with_dimension(db)
+        set_cache_headers(response, etag, PUBLIC_REFERENCE_CACHE_CONTROL)
         
         
         dimensions = []
@@ -223,7 +218,7 @@ async def get_all_dimensions(
 def get_action_secondary_impacts(
     action_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener los impactos secundarios de una acción.
@@ -231,24 +226,11 @@ def get_action_secondary_impacts(
     """
     try:
 
-        action = db.query(ActionModel).filter(ActionModel.id == action_id).first()
-        report_id = crud_action_plan.get_report_id_by_action(db, action_id)
-        if not action:
+        report_id, has_permission, error_message = permissions.check_entity("action", action_id)
+        if report_id is None:
             raise HTTPException(status_code=404, detail="Acción no encontrada")
-
-        
-        if not current_user.admin:
-            
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id
-            )
-            
-            
-            if not has_permission:
-                
-                raise HTTPException(status_code=403, detail=error_message)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         
         ods_ids = crud_ods.get_action_secondary_impacts(db, action_id)
@@ -270,7 +252,7 @@ def update_action_secondary_impacts(
     action_id: int,
     update_data: ActionSecondaryImpactUpdate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar los impactos secundarios de una acción.
@@ -278,20 +260,11 @@ def update_action_secondary_impacts(
     """
     try:
         
-        report_id = crud_action_plan.get_report_id_by_action(db, action_id)
-        if not report_id:
+        report_id, has_permission, error_message = permissions.check_entity("action", action_id, require_manager=True)
+        if report_id is None:
             raise HTTPException(status_code=404, detail="Acción no encontrada en una memoria de sostenibilidad")
-
-        
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         if update_data.action_id != action_id:
             raise HTTPException(
@@ -324,7 +297,7 @@ def update_action_secondary_impacts(
 def get_all_action_secondary_impacts(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener el recuento de impactos secundarios de todas las acciones de un reporte.
@@ -333,14 +306,9 @@ def get_all_action_secondary_impacts(
     try:
         
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
         
 
         impacts = crud_ods.get_all_action_secondary_impacts_counts(db, report_id)
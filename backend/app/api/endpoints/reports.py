@@ -1,14 +1,14 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Body, UploadFile, File, Form
+from typing import List, Optional, Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Body, UploadFile, File, Form, Query, Request, Header
 from fastapi.responses import FileResponse, Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_
 import os
 import uuid
+import hashlib
 from pathlib import Path
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, get_read_db, get_permissions
 from app.crud import reports as crud_reports
-from app.crud import resources as crud_resources
 from app.schemas.reports import (
     SustainabilityReport, 
     SustainabilityReportCreate, 
@@ -28,13 +28,15 @@ from app.schemas.reports import (
     ReportPhotoResponse,
     ReportPhotoUpdate,
     UserRoleResponse,
-    ReportSearch
+    ReportSearch,
+    PublicReportSearch
 )
 from app.schemas.auth import TokenData
 from app.models.models import SustainabilityReport as SustainabilityReportModel, HeritageResource as HeritageResourceModel, ReportNorm as ReportNormModel, ReportLogo as ReportLogoModel, ReportAgreement as ReportAgreementModel, ReportBibliography as ReportBibliographyModel, ReportPhoto as ReportPhotoModel, SustainabilityTeamMember
-from app.services.user import check_user_permissions
+from app.services.permissions import PermissionResolver
+from app.services import public_catalogue, tracing
+from app.api.http_cache import not_modified, set_cache_headers
 import logging
-from PIL import Image
 from app.config import Settings
 import io
 
@@ -43,10 +45,10 @@ settings = Settings()
 router = APIRouter()
 
 @router.get("/reports/get/{report_id}", response_model=SustainabilityReport)
-async def get_report(
+def get_report(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener una memoria de sostenibilidad por su ID.
@@ -54,14 +56,9 @@ async def get_report(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         report = crud_reports.get_report(db=db, report_id=report_id)
         if not report:
@@ -79,7 +76,7 @@ async def get_report(
 
 @router.get("/reports/get-all/templates/", response_model=dict)
 def get_all_report_templates(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
@@ -107,98 +104,29 @@ def get_all_report_templates(
         
 
 @router.post("/reports/search", response_model=dict)
-async def search_reports(
+def search_reports(
     search_params: ReportSearch,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
     Buscar memorias de sostenibilidad con filtros opcionales.
+    Admite paginación (limit/offset) y ordenación (sort_by/sort_order).
     """
     try:
-        
-        search_term = search_params.search_term
-        heritage_resource_name = search_params.heritage_resource_name
-        year = search_params.year
-        state = search_params.state
-
-        
-        if heritage_resource_name:
-            
-            resources = crud_resources.search(
-                db=db,
-                name=heritage_resource_name
-            )
-            
-            if not resources:
-                return {
-                    "items": [],
-                    "total": 0
-                }
-            
-            
-            resource_ids = [r.id for r in resources]
-            
-            
-            reports = crud_reports.search_reports(
-                db=db,
-                user_id=current_user.id if not current_user.admin else None,
-                is_admin=current_user.admin,
-                heritage_resource_ids=resource_ids,
-                year=year,
-                state=state
-            )
-        
-        
-        elif year or state:
-            reports = crud_reports.search_reports(
-                db=db,
-                user_id=current_user.id if not current_user.admin else None,
-                is_admin=current_user.admin,
-                year=year,
-                state=state
-            )
-        
-        
-        elif search_term:
-            
-            resources = crud_resources.search(
-                db=db,
-                name=search_term
-            )
-            
-            
-            resource_ids = [r.id for r in resources]
-            
-            
-            reports = crud_reports.search_reports(
-                db=db,
-                user_id=current_user.id if not current_user.admin else None,
-                is_admin=current_user.admin,
-                heritage_resource_ids=resource_ids
-            )
-        
-        
-        else:
-            reports = crud_reports.search_reports(
-                db=db,
-                user_id=current_user.id if not current_user.admin else None,
-                is_admin=current_user.admin
-            )
-
-        
-        resource_ids = [report.heritage_resource_id for report in reports]
-        resources = crud_resources.get_all_by_resources_ids(db, resource_ids)
-        
-        
-        resources_dict = {resource.id: resource for resource in resources}
-
-        
-        for report in reports:
-            if report.heritage_resource_id in resources_dict:
-                report.heritage_resource_name = resources_dict[report.heritage_resource_id].name
-
-        total = len(reports)
+        reports, total = crud_reports.search_reports(
+            db=db,
+            user_id=current_user.id if not current_user.admin else None,
+            is_admin=current_user.admin,
+            search_term=search_params.search_term,
+            heritage_resource_name=search_params.heritage_resource_name,
+            year=search_params.year,
+            state=search_params.state,
+            limit=search_params.limit,
+            offset=search_params.offset,
+            sort_by=search_params.sort_by,
+            sort_order=search_params.sort_order
+        )
 
         return {
             "items": reports,
@@ -212,109 +140,93 @@ async def search_reports(
         )
 
 @router.post("/public-reports/search", response_model=dict)
-async def search_public_reports(
-    search_params: ReportSearch = Body(...),
-    db: Session = Depends(get_db)
+def search_public_reports(
+    search_params: PublicReportSearch = Body(...),
+    db: Session = Depends(get_read_db)
 ):
     """
     Buscar memorias de sostenibilidad públicas con filtros opcionales.
+    Admite paginación (limit/offset) y ordenación (sort_by/sort_order).
+    Se resuelve sobre el catálogo público en memoria.
     """
     try:
-        
-        search_term = search_params.search_term
-        heritage_resource_name = search_params.heritage_resource_name
-        year = search_params.year
-
-        
-        if heritage_resource_name:
-            resources = crud_resources.search(
-                db=db,
-                name=heritage_resource_name
-            )
-            
-            if not resources:
-                return {
-                    "items": [],
-                    "total": 0
-                }
-            
-            
-            resource_ids = [r.id for r in resources]
-
-            
-            reports = crud_reports.search_reports(
-                db=db,
-                heritage_resource_ids=resource_ids,
-                state="Published"
-            )
-        
-        
-        elif year:
-            reports = crud_reports.search_reports(
-                db=db,
-                year=year,
-                state="Published"
-            )
-        
-        
-        elif search_term:
-            resources = crud_resources.search(
-                db=db,
-                name=search_term
-            )
-            
-            resource_ids = [r.id for r in resources]
-
-            
-            reports = crud_reports.search_reports(
-                db=db,
-                heritage_resource_ids=resource_ids,
-                state="Published"
-            )
-        
-        
-        else:
-            reports = crud_reports.search_reports(
-                db=db,
-                state="Published"
-            )
-
-        
-        resource_ids = [report.heritage_resource_id for report in reports]
-        resources = crud_resources.get_all_by_resources_ids(db, resource_ids)
+        catalogue = public_catalogue.get_catalogue(db)
+        items, total = public_catalogue.search_catalogue(
+            catalogue,
+            search_term=search_params.search_term,
+            heritage_resource_name=search_params.heritage_resource_name,
+            year=search_params.year,
+            limit=min(search_params.limit, crud_reports.REPORT_SEARCH_MAX_LIMIT) if search_params.limit else None,
+            offset=search_params.offset,
+            sort_by=search_params.sort_by,
+            sort_order=search_params.sort_order
+        )
 
+        return {
+            "items": items,
+            "total": total
+        }
         
-        resources_dict = {resource.id: resource for resource in resources}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error al buscar memorias públicas: {str(e)}"
+        )
 
-        
-        items = []
-        for report in reports:
-            if report.heritage_resource_id in resources_dict:
-                resource = resources_dict[report.heritage_resource_id]
-                items.append({
-                    "resource_id": report.heritage_resource_id,
-                    "resource_name": resource.name,
-                    "year": report.year,
-                    "report_id": report.id
-                })
+@router.get("/public-reports/catalogue", response_model=dict)
+def get_public_catalogue(
+    request: Request,
+    response: Response,
+    search_term: Optional[str] = None,
+    heritage_resource_name: Optional[str] = None,
+    year: Optional[int] = None,
+    limit: Optional[int] = Query(default=None, ge=1),
+    offset: int = Query(default=0, ge=0),
+    sort_by: Literal['year', 'heritage_resource_name', 'id'] = 'year',
+    sort_order: Literal['asc', 'desc'] = 'desc',
+    db: Session = Depends(get_read_db)
+):
+    """
+    Obtener el catálogo de memorias publicadas.
+    Responde con ETag y devuelve 304 si el cliente ya tiene la versión actual.
+    """
+    try:
+        catalogue = public_catalogue.get_catalogue(db)
+        etag = f"{catalogue.etag}-{hashlib.sha1(str(request.url.query).encode()).hexdigest()[:12]}"
+        cache_control = f"public, max-age={min(settings.PUBLIC_CATALOGUE_TTL, 60)}"
+        cached = not_modified(request, etag, cache_control)
+        if cached:
+            return cached
+
+        items, total = public_catalogue.search_catalogue(
+            catalogue,
+            search_term=search_term,
+            heritage_resource_name=heritage_resource_name,
+            year=year,
+            limit=min(limit, crud_reports.REPORT_SEARCH_MAX_LIMIT) if limit else None,
+            offset=offset,
+            sort_by=sort_by,
+            sort_order=sort_order
+        )
 
+        set_cache_headers(response, etag, cache_control)
         return {
             "items": items,
-            "total": len(items)
+            "total": total
         }
-        
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Error al buscar memorias públicas: {str(e)}"
+            detail=f"Error al obtener el catálogo público: {str(e)}"
         )
         
 
 @router.post("/reports/create", response_model=SustainabilityReport)
-async def create_report(
+def create_report(
     report: SustainabilityReportCreate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Crear una nueva memoria de sostenibilidad.
@@ -322,15 +234,9 @@ async def create_report(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report.heritage_resource_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report.heritage_resource_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
         
         
         existing_report = db.query(SustainabilityReportModel).filter(
@@ -363,11 +269,11 @@ async def create_report(
         )
 
 @router.put("/reports/update/{report_id}", response_model=SustainabilityReport)
-async def update_report(
+def update_report(
     report_id: int,
     update_request: SustainabilityReportUpdate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar una memoria de sostenibilidad existente.
@@ -375,15 +281,9 @@ async def update_report(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         db_report = crud_reports.update_report(
             db=db, 
@@ -411,10 +311,10 @@ async def update_report(
         )
 
 @router.delete("/reports/delete/{report_id}")
-async def delete_report(
+def delete_report(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Eliminar una memoria de sostenibilidad.
@@ -422,15 +322,9 @@ async def delete_report(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         success = crud_reports.delete_report(db=db, report_id=report_id)
         if not success:
@@ -446,72 +340,89 @@ async def delete_report(
             detail=f"Error al eliminar la memoria: {str(e)}"
         )
 
+def check_profile_header(profile: Optional[str], current_user: TokenData) -> Optional[str]:
+    """
+    Valida la cabecera X-Report-Profile: solo los admin pueden pedir un perfil
+    y el valor debe ser uno de tracing.PROFILERS.
+    """
+    if not profile:
+        return None
+    if not current_user.admin:
+        raise HTTPException(status_code=403, detail="Solo un administrador puede perfilar la generación de informes")
+    profiler = profile.strip().lower()
+    if profiler not in tracing.PROFILERS:
+        raise HTTPException(status_code=400, detail=f"Perfilador no soportado: {profile}. Opciones: {', '.join(tracing.PROFILERS)}")
+    return profiler
+
+def run_report_generation(db: Session, report_id: int, profiler: Optional[str]) -> dict:
+    """
+    Genera el HTML de la memoria. Con `profiler`, la generación se perfila y el
+    resultado incluye las rutas de los ficheros guardados en REPORT_PROFILES_DIR.
+    """
+    if not profiler:
+        return {"url": crud_reports.generate_report_html(db, report_id)}
+
+    with tracing.profile_to(settings.REPORT_PROFILES_DIR / str(report_id), f"report_{report_id}", profiler, report_id=report_id) as profile:
+        url = crud_reports.generate_report_html(db, report_id)
+    return {"url": url, "profile": profile["files"]}
+
 @router.get("/reports/generate-preview/{report_id}")
-async def generate_preview(
+def generate_preview(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions),
+    profile: Optional[str] = Header(None, alias="X-Report-Profile")
 ):
     """
     Generar un preview de una memoria de sostenibilidad.
+    Un admin puede enviar `X-Report-Profile: cprofile|pyinstrument` para guardar
+    un perfil de la generación.
     """
-    if not current_user.admin:
-        has_permission, error_message = check_user_permissions(
-            db=db,
-            user_id=current_user.id,
-            report_id=report_id,
-            require_manager=True
-        )
-        if not has_permission:
-            raise HTTPException(status_code=403, detail=error_message)
+    profiler = check_profile_header(profile, permissions.current_user)
+    has_permission, error_message = permissions.check(report_id, require_manager=True)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
         
     try: 
-        url = crud_reports.generate_report_html(db, report_id)
-        return {"url": url}
+        return run_report_generation(db, report_id, profiler)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/reports/publish/{report_id}")
-async def publish_report(
+def publish_report(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions),
+    profile: Optional[str] = Header(None, alias="X-Report-Profile")
 ):
     """
     Publicar una memoria de sostenibilidad.
     Permite la publicación si el usuario es admin o si es gestor dla memoria.
+    Admite la cabecera X-Report-Profile igual que generate-preview.
     """
+    profiler = check_profile_header(profile, permissions.current_user)
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
         
         
-        report = db.query(SustainabilityReportModel).filter(SustainabilityReportModel.id == report_id).first()
-        if report:
-            report.state = 'Published'
-            db.commit()
+        crud_reports.publish_report(db, report_id)
 
         
-        report_url = crud_reports.generate_report_html(db, report_id)
+        result = run_report_generation(db, report_id, profiler)
 
-        return {"message": "Memoria publicada correctamente", "url": report_url}
+        return {"message": "Memoria publicada correctamente", **result}
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/reports/get-all/norms/{report_id}", response_model=List[ReportNorm])
-async def get_all_report_norms(
+def get_all_report_norms(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener todas las normativas de una memoria de sostenibilidad.
@@ -519,14 +430,9 @@ async def get_all_report_norms(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         
         report = crud_reports.get_report(db, report_id)
@@ -547,10 +453,10 @@ async def get_all_report_norms(
         )
 
 @router.post("/reports/norms", response_model=ReportNorm)
-async def create_norm(
+def create_norm(
     norm: ReportNormCreate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Crear una nueva normativa para una memoria.
@@ -558,15 +464,9 @@ async def create_norm(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=norm.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(norm.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         db_norm = crud_reports.create_norm(db=db, norm=norm)
         return db_norm
@@ -578,11 +478,11 @@ async def create_norm(
         )
 
 @router.put("/reports/update/norm/{norm_id}", response_model=ReportNorm)
-async def update_norm(
+def update_norm(
     norm_id: int,
     norm: ReportNormUpdate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar una normativa existente.
@@ -590,15 +490,9 @@ async def update_norm(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=norm.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(norm.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         db_norm = crud_reports.get_norm_by_id(db, norm_id)
         if not db_norm:
@@ -617,10 +511,10 @@ async def update_norm(
         )
 
 @router.delete("/reports/delete/norm/{norm_id}")
-async def delete_norm(
+def delete_norm(
     norm_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Eliminar una normativa.
@@ -636,15 +530,9 @@ async def delete_norm(
             )
 
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=db_norm.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(db_norm.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         crud_reports.delete_norm(db, norm_id)
         return {"message": "Normativa eliminada correctamente"}
@@ -656,11 +544,11 @@ async def delete_norm(
         )
 
 @router.post("/reports/update/cover/{report_id}")
-async def update_cover_photo(
+def update_cover_photo(
     report_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar la foto de portada de una memoria.
@@ -668,15 +556,9 @@ async def update_cover_photo(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         report = crud_reports.get_report(db, report_id)
         if not report:
@@ -697,7 +579,7 @@ async def update_cover_photo(
                 
 
         
-        content = await file.read()
+        content = file.file.read()
         
         file_url = crud_reports.update_cover_photo(db, report, content)
 
@@ -707,11 +589,11 @@ async def update_cover_photo(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/reports/upload/logos/{report_id}", response_model=ReportLogoResponse)
-async def upload_logo(
+def upload_logo(
     report_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Subir un nuevo logo para una memoria.
@@ -719,15 +601,9 @@ async def upload_logo(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         report = crud_reports.get_report(db, report_id)
         if not report:
@@ -739,7 +615,7 @@ async def upload_logo(
             raise HTTPException(status_code=400, detail="Formato de archivo no permitido")
 
         
-        content = await file.read()
+        content = file.file.read()
 
         new_logo = crud_reports.upload_logo(db, report, content, file_extension)
 
@@ -753,10 +629,10 @@ async def upload_logo(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/reports/get-all/logos/{report_id}", response_model=List[ReportLogoResponse])
-async def get_all_report_logos(
+def get_all_report_logos(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener todos los logos de una memoria como data URLs.
@@ -764,14 +640,9 @@ async def get_all_report_logos(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
         
         
         report = crud_reports.get_report(db, report_id)
@@ -789,10 +660,10 @@ async def get_all_report_logos(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/reports/delete/logo/{logo_id}")
-async def delete_logo(
+def delete_logo(
     logo_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Eliminar un logo de una memoria y su archivo físico asociado.
@@ -805,15 +676,9 @@ async def delete_logo(
             raise HTTPException(status_code=404, detail="Logo no encontrado")
 
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=logo.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(logo.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         crud_reports.delete_logo(db, logo_id, logo)
 
@@ -823,10 +688,10 @@ async def delete_logo(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/reports/get/cover/{report_id}")
-async def get_cover_photo(
+def get_cover_photo(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener la imagen de portada de una memoria.
@@ -834,14 +699,9 @@ async def get_cover_photo(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         
         report = crud_reports.get_report(db, report_id)
@@ -872,10 +732,10 @@ async def get_cover_photo(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/reports/get-all/agreements/{report_id}", response_model=List[ReportAgreement])
-async def get_all_report_agreements(
+def get_all_report_agreements(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener todos los acuerdos de una memoria de sostenibilidad.
@@ -883,14 +743,9 @@ async def get_all_report_agreements(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         
         report = crud_reports.get_report(db, report_id)
@@ -911,10 +766,10 @@ async def get_all_report_agreements(
         )
 
 @router.post("/reports/create/agreements", response_model=ReportAgreement)
-async def create_agreement(
+def create_agreement(
     agreement: ReportAgreementCreate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Crear un nuevo acuerdo para una memoria.
@@ -922,15 +777,9 @@ async def create_agreement(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=agreement.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(agreement.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         db_agreement = crud_reports.create_agreement(db, agreement)
         return ReportAgreement.model_validate(db_agreement, from_attributes=True)
@@ -942,11 +791,11 @@ async def create_agreement(
         )
 
 @router.put("/reports/update/agreements/{agreement_id}", response_model=ReportAgreement)
-async def update_agreement(
+def update_agreement(
     agreement_id: int,
     agreement: ReportAgreementUpdate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar un acuerdo existente.
@@ -954,15 +803,9 @@ async def update_agreement(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=agreement.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(agreement.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         db_agreement = crud_reports.get_agreement_by_id(db, agreement_id)
         if not db_agreement:
@@ -981,10 +824,10 @@ async def update_agreement(
         )
 
 @router.delete("/reports/delete/agreements/{agreement_id}")
-async def delete_agreement(
+def delete_agreement(
     agreement_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Eliminar un acuerdo.
@@ -1000,15 +843,9 @@ async def delete_agreement(
             )
 
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=db_agreement.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(db_agreement.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         crud_reports.delete_agreement(db, agreement_id, db_agreement)
         return {"message": "Acuerdo eliminado correctamente"}
@@ -1020,10 +857,10 @@ async def delete_agreement(
         )
 
 @router.post("/reports/create/bibliographies", response_model=ReportBibliography)
-async def create_bibliography(
+def create_bibliography(
     bibliography: ReportBibliographyCreate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Crear una nueva bibliografía para una memoria.
@@ -1031,15 +868,9 @@ async def create_bibliography(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=bibliography.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(bibliography.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         db_bibliography = crud_reports.create_bibliography(db, bibliography)
         return db_bibliography
@@ -1051,11 +882,11 @@ async def create_bibliography(
         )
 
 @router.put("/reports/update/bibliographies/{bibliography_id}", response_model=ReportBibliography)
-async def update_bibliography(
+def update_bibliography(
     bibliography_id: int,
     bibliography: ReportBibliographyUpdate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar una bibliografía existente.
@@ -1063,15 +894,9 @@ async def update_bibliography(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=bibliography.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(bibliography.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         db_bibliography = crud_reports.get_bibliography_by_id(db, bibliography_id)
         if not db_bibliography:
@@ -1090,10 +915,10 @@ async def update_bibliography(
         )
 
 @router.delete("/reports/delete/bibliographies/{bibliography_id}")
-async def delete_bibliography(
+def delete_bibliography(
     bibliography_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Eliminar una bibliografía.
@@ -1109,15 +934,9 @@ async def delete_bibliography(
             )
 
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=db_bibliography.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(db_bibliography.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         crud_reports.delete_bibliography(db, bibliography_id, db_bibliography)
         return {"message": "Bibliografía eliminada correctamente"}
@@ -1129,10 +948,10 @@ async def delete_bibliography(
         )
 
 @router.get("/reports/get-all/bibliographies/{report_id}", response_model=List[ReportBibliography])
-async def get_all_report_bibliographies(
+def get_all_report_bibliographies(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener todas las referencias bibliográficas de una memoria de sostenibilidad.
@@ -1140,14 +959,9 @@ async def get_all_report_bibliographies(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         
         report = db.query(SustainabilityReportModel).filter(SustainabilityReportModel.id == report_id).first()
@@ -1169,11 +983,11 @@ async def get_all_report_bibliographies(
 
 
 @router.post("/reports/update/organization-chart/{report_id}")
-async def update_organization_chart(
+def update_organization_chart(
     report_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar el organigrama de una memoria.
@@ -1181,15 +995,9 @@ async def update_organization_chart(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         report = crud_reports.get_report(db, report_id)
         if not report:
@@ -1208,7 +1016,7 @@ async def update_organization_chart(
             except Exception as e:
                 pass 
 
-        content = await file.read()
+        content = file.file.read()
 
         file_url = crud_reports.update_organization_chart(db, report, content)
 
@@ -1218,12 +1026,12 @@ async def update_organization_chart(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/reports/upload/photos/{report_id}", response_model=ReportPhotoResponse)
-async def upload_photo(
+def upload_photo(
     report_id: int,
     file: UploadFile = File(...),
     description: str = Form(None),
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Subir una nueva foto para una memoria.
@@ -1231,15 +1039,9 @@ async def upload_photo(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         
         report = crud_reports.get_report(db, report_id)
@@ -1247,7 +1049,7 @@ async def upload_photo(
             raise HTTPException(status_code=404, detail="Memoria no encontrada")
 
         
-        content = await file.read()
+        content = file.file.read()
 
         
         file_extension = os.path.splitext(file.filename)[1].lower()
@@ -1267,10 +1069,10 @@ async def upload_photo(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/reports/get-all/photos/{report_id}", response_model=List[ReportPhotoResponse])
-async def get_all_report_photos(
+def get_all_report_photos(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener todas las fotos de una memoria.
@@ -1278,14 +1080,9 @@ async def get_all_report_photos(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(report_id)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
         
         
         report = crud_reports.get_report(db, report_id)
@@ -1303,10 +1100,10 @@ async def get_all_report_photos(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.delete("/reports/delete/photo/{photo_id}")
-async def delete_photo(
+def delete_photo(
     photo_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Eliminar una foto de una memoria y su archivo físico asociado.
@@ -1319,15 +1116,9 @@ async def delete_photo(
             raise HTTPException(status_code=404, detail="Foto no encontrada")
 
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=photo.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(photo.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         crud_reports.delete_photo(db, photo_id, photo)
 
@@ -1337,11 +1128,11 @@ async def delete_photo(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/reports/update/photo/{photo_id}", response_model=ReportPhotoResponse)
-async def update_photo(
+def update_photo(
     photo_id: int,
     photo_update: ReportPhotoUpdate,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar la descripción de una foto.
@@ -1354,15 +1145,9 @@ async def update_photo(
             raise HTTPException(status_code=404, detail="Foto no encontrada")
 
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=photo.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(photo.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
 
         photo = crud_reports.update_photo(db, photo_id, photo_update)
 
@@ -1401,10 +1186,10 @@ def get_user_role(
     return {"role": team_member.type}
 
 @router.get("/reports/get/organization-chart/{report_id}")
-async def get_organization_chart(
+def get_organization_chart(
     report_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Obtener la imagen del organigrama de una memoria.
@@ -1412,14 +1197,9 @@ async def get_organization_chart(
     """
     
     
-    if not current_user.admin:
-        has_permission, error_message = check_user_permissions(
-            db=db,
-            user_id=current_user.id,
-            report_id=report_id
-        )
-        if not has_permission:
-            raise HTTPException(status_code=403, detail=error_message)
+    has_permission, error_message = permissions.check(report_id)
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
 
     
     report = crud_reports.get_report(db, report_id)
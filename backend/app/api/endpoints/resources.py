@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from app.schemas.resources import HeritageResourceCreate, HeritageResource, ResourceSearch, HeritageResourceUpdate
 from app.schemas.auth import TokenData
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, get_read_db
 from app.crud import resources as crud_resources
 from sqlalchemy import or_
 from app.models.models import HeritageResource as HeritageResourceModel, SustainabilityReport as SustainabilityReportModel
@@ -11,7 +11,7 @@ from app.models.models import HeritageResource as HeritageResourceModel, Sustain
 router = APIRouter()
 
 @router.post("/resources/create", response_model=HeritageResource)
-async def create_resource(
+def create_resource(
     resource: HeritageResourceCreate = Body(...),
     db: Session = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
@@ -49,9 +49,9 @@ async def create_resource(
         )
 
 @router.post("/resources/search", response_model=dict)
-async def search_resources(
+def search_resources(
     search_params: ResourceSearch = Body(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
@@ -72,7 +72,8 @@ async def search_resources(
             name=search_params.name,
             ownership=search_params.ownership,
             management_model=search_params.management_model,
-            postal_address=search_params.postal_address
+            postal_address=search_params.postal_address,
+            prefix=search_params.prefix
         )
         total = len(resources)
 
@@ -103,7 +104,7 @@ async def search_resources(
         )
 
 @router.put("/resources/update/{resource_id}", response_model=HeritageResource)
-async def update_resource(
+def update_resource(
     resource_id: int,
     resource_data: HeritageResourceUpdate = Body(...),
     db: Session = Depends(get_db),
@@ -144,7 +145,7 @@ async def update_resource(
         )
 
 @router.delete("/resources/delete/{resource_id}")
-async def delete_resource(
+def delete_resource(
     resource_id: int,
     db: Session = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
@@ -171,7 +172,7 @@ async def delete_resource(
 
 
 @router.get("/resources/get-all/reports/{resource_id}", response_model=dict)
-async def get_all_reports_by_resource(
+def get_all_reports_by_resource(
     resource_id: int,
     db: Session = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
@@ -192,7 +193,7 @@ async def get_all_reports_by_resource(
         )
 
 @router.get("/resources/get-all/", response_model=dict)
-async def get_all_resources(
+def get_all_resources(
     db: Session = Depends(get_db),
     current_user: TokenData = Depends(get_current_user)
 ):
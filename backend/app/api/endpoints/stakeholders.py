@@ -1,16 +1,15 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_read_db, get_permissions
 from app.schemas.stakeholders import (
     Stakeholder,
     StakeholderCreate,
     StakeholderUpdate,
     StakeholderSearch
 )
-from app.schemas.auth import TokenData
 from app.crud import stakeholders as crud_stakeholder
-from app.services.user import check_user_permissions
+from app.services.permissions import PermissionResolver
 from app.schemas.stakeholders import StakeholderSearch
 
 router = APIRouter()
@@ -18,7 +17,7 @@ router = APIRouter()
 @router.post("/stakeholders/search", response_model=dict)
 def search_stakeholders(
     search_params: StakeholderSearch = Body(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Buscar grupos de interés con filtros opcionales.
@@ -60,7 +59,7 @@ def search_stakeholders(
 def create_stakeholder(
     stakeholder_data: StakeholderCreate = Body(...),
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Crear un nuevo grupo de interés.
@@ -68,15 +67,9 @@ def create_stakeholder(
     """
     try:
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=stakeholder_data.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(stakeholder_data.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
     
         
         existing_stakeholder = crud_stakeholder.get_by_name(db, stakeholder_data.name)
@@ -100,7 +93,7 @@ def update_stakeholder(
     stakeholder_id: int,
     stakeholder_data: StakeholderUpdate = Body(...),
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Actualizar un grupo de interés.
@@ -109,15 +102,9 @@ def update_stakeholder(
     try:
 
         
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=stakeholder_data.report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
+        has_permission, error_message = permissions.check(stakeholder_data.report_id, require_manager=True)
+        if not has_permission:
+            raise HTTPException(status_code=403, detail=error_message)
         
         db_stakeholder = crud_stakeholder.get(db, stakeholder_id)
         if not db_stakeholder:
@@ -146,24 +133,22 @@ def update_stakeholder(
 def delete_stakeholder(
     stakeholder_id: int,
     db: Session = Depends(get_db),
-    current_user: TokenData = Depends(get_current_user)
+    permissions: PermissionResolver = Depends(get_permissions)
 ):
     """
     Eliminar un grupo de interés.
     Solo permite la eliminación si el usuario es admin o si es gestor del reporte.
     """
+    report_id, has_permission, error_message = permissions.check_entity("stakeholder", stakeholder_id, require_manager=True)
+    if report_id is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Grupo de interés no encontrado"
+        )
+    if not has_permission:
+        raise HTTPException(status_code=403, detail=error_message)
+
     try:
-        
-        if not current_user.admin:
-            has_permission, error_message = check_user_permissions(
-                db=db,
-                user_id=current_user.id,
-                report_id=report_id,
-                require_manager=True
-            )
-            if not has_permission:
-                raise HTTPException(status_code=403, detail=error_message)
-    
         db_stakeholder = crud_stakeholder.get(db, stakeholder_id)
         if not db_stakeholder:
             raise HTTPException(
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Response
 from sqlalchemy.orm import Session
 from typing import List
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, get_read_db
 from app.schemas.auth import TokenData
 from app.schemas.surveys import (
     Assessment,
@@ -11,6 +11,8 @@ from app.schemas.surveys import (
     Survey
 )
 from app.crud import surveys as crud_surveys
+from app.config import settings
+from app.services import survey_ingestion
 
 router = APIRouter()
 
@@ -18,12 +20,29 @@ router = APIRouter()
 @router.post("/survey/create/assessments", response_model=dict)
 def create_assessments(
     assessments_data: MultipleAssessmentsCreate,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Crear múltiples valoraciones para una encuesta.
+    Con la escritura por lotes activa, las valoraciones se encolan y se responde 202.
     """
     try:
+        if survey_ingestion.get_writer() is not None:
+            total = crud_surveys.enqueue_assessments(
+                db,
+                assessments_data.stakeholder_id,
+                assessments_data.assessments,
+                assessments_data.report_id,
+                assessments_data.scale
+            )
+            response.status_code = 202
+            return {
+                "items": [],
+                "total": total,
+                "queued": True
+            }
+
         created_assessments = crud_surveys.create_assessments(
             db,
             assessments_data.stakeholder_id,
@@ -32,12 +51,8 @@ def create_assessments(
             assessments_data.scale
         )
         
-        assesments_schema = [ Assessment(
-                id=assesment.id,
-                stakeholder_id=assesment.stakeholder_id,
-                material_topic_id=assesment.material_topic_id,
-                score=assesment.score
-            ) 
+        assesments_schema = [
+            Assessment(**assesment) if "id" in assesment else AssessmentCreate(**assesment)
             for assesment in created_assessments
         ]
 
@@ -50,16 +65,33 @@ def create_assessments(
             status_code=400,
             detail=str(e)
         )
+    except survey_ingestion.SurveyBackpressureError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(settings.SURVEY_FLUSH_INTERVAL)))}
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error al crear las valoraciones: {str(e)}"
         )
 
+@router.get("/survey/ingestion/metrics", response_model=dict)
+def get_ingestion_metrics(
+    current_user: TokenData = Depends(get_current_user)
+):
+    """
+    Métricas de la ingesta de respuestas: cola, rechazos por saturación y latencias de escritura.
+    """
+    if not current_user.admin:
+        raise HTTPException(status_code=403, detail="No tienes permisos para realizar esta acción")
+    return survey_ingestion.ingestion_stats()
+
 @router.post("/survey/search/", response_model=dict)
-async def search_surveys(
+def search_surveys(
     search_params: SurveySearch,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Buscar encuestas privadas activas con filtros opcionales.
@@ -3,14 +3,13 @@ from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, get_read_db
 from app.schemas.user import User, UserSearch, UserCreate
 from app.schemas.team import (
     TeamMemberSearch,
     TeamMemberBase,
     TeamMemberCreate,
     TeamMemberCreateParams,
-    TeamMemberList,
     TeamMemberUpdate
 )
 from app.schemas.auth import TokenData
@@ -22,7 +21,7 @@ router = APIRouter()
 @router.post("/team/users/search", response_model=dict)
 def search_available_users(
     search_params: UserSearch = Body(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
@@ -35,7 +34,8 @@ def search_available_users(
             search_term=search_params.search_term,
             name=search_params.name,
             surname=search_params.surname,
-            email=search_params.email
+            email=search_params.email,
+            prefix=search_params.prefix
             )
         
         total = len(users)
@@ -56,39 +56,17 @@ def search_available_users(
 @router.post("/team/search/members", response_model=dict)
 def search_team_members(
     search_params: TeamMemberSearch = Body(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
     Buscar miembros del equipo de un reporte con filtros opcionales.
-    Carga los datos de usuario para cada miembro del equipo.
+    Admite paginación (limit/offset).
     """
     try:
-        result = crud_team.search_team_members(db, search_params.report_id, search_params)
-        role_mapping = {
-            'manager': 'Gestor de Sostenibilidad',
-            'consultant': 'Consultor',
-            'external_advisor': 'Asesor Externo'
-        }
-        members_with_user_data = []
-        for member in result:
-            user = crud_user.get(db, member.user_id)
-            if user:
-                member_dict = {
-                    "id": member.id,
-                    "name": user.name,
-                    "surname": user.surname,
-                    "email": user.email,
-                    "phone_number": user.phone_number,
-                    "role": role_mapping.get(member.type, member.type),
-                    "organization": member.organization,
-                    "report_id": member.report_id,
-                    "user_id": member.user_id
-                }
-                members_with_user_data.append(TeamMemberList(**member_dict))
-        total = len(members_with_user_data)
+        members, total = crud_team.search_team_members(db, search_params.report_id, search_params)
         return {
-            "items": members_with_user_data,
+            "items": members,
             "total": total
         }
     except Exception as e:
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, get_read_db
 from app.schemas.user import User, UserSearch, UserUpdate, UserCreate, ChangePasswordRequest
 from app.schemas.auth import TokenData
 from app.crud import user as crud_user
@@ -11,7 +12,7 @@ router = APIRouter()
 @router.post("/users/search", response_model=dict)
 def search_users(
     search_params: UserSearch = Body(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: TokenData = Depends(get_current_user)
 ):
     """
@@ -30,7 +31,8 @@ def search_users(
             name=search_params.name,
             surname=search_params.surname,
             email=search_params.email,
-            is_admin=search_params.is_admin
+            is_admin=search_params.is_admin,
+            prefix=search_params.prefix
         )
         total = len(users)
 
@@ -153,7 +155,7 @@ def change_password(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/users/verify-reset-token/{token}")
-async def verify_reset_token(token: str, db: Session = Depends(get_db)):
+def verify_reset_token(token: str, db: Session = Depends(get_db)):
     """
     Verifica un token de restablecimiento de contraseña.
     """
@@ -172,7 +174,7 @@ async def reset_password(
     Restablece la contraseña de un usuario.
     """
     try:
-        user = crud_user.reset_password(db, token, new_password)
+        user = await run_in_threadpool(crud_user.reset_password, db, token, new_password)
         if not user:
             raise HTTPException(status_code=400, detail="Token inválido o expirado")
         return {"message": "Contraseña actualizada correctamente"}
@@ -0,0 +1,27 @@
+from typing import Optional
+from fastapi import Request, Response
+
+
+def cache_headers(etag: str, cache_control: str) -> dict:
+    """
+    Cabeceras de caché HTTP para una respuesta con ETag.
+    """
+    return {"ETag": f'"{etag}"', "Cache-Control": cache_control}
+
+
+def not_modified(request: Request, etag: str, cache_control: str) -> Optional[Response]:
+    """
+    Devuelve una respuesta 304 si el cliente ya tiene la versión indicada por el ETag.
+    """
+    headers = cache_headers(etag, cache_control)
+    if_none_match = request.headers.get("if-none-match", "")
+    if headers["ETag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    """
+    Añade ETag y Cache-Control a la respuesta.
+    """
+    response.headers.update(cache_headers(etag, cache_control))
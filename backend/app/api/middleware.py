@@ -0,0 +1,58 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services import metrics
+
+
+class RequestMetricsMiddleware:
+    """
+    Middleware ASGI que mide cada petición HTTP: latencia hasta el último byte de
+    la respuesta, código, tamaño del cuerpo y consultas SQL (número y tiempo).
+    La ruta se etiqueta con la plantilla del endpoint para no crear una serie
+    por cada id; las peticiones sin ruta (404, /static) se agrupan.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: tuple = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        response_bytes = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        stats, token = metrics.start_request()
+        metrics.registry.add_in_flight(1)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.registry.add_in_flight(-1)
+            metrics.end_request(token)
+            metrics.record_request(
+                scope["method"],
+                _route_label(scope),
+                status,
+                time.perf_counter() - started,
+                response_bytes,
+                stats
+            )
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    if scope["path"].startswith("/static/"):
+        return "/static"
+    return "<sin ruta>"
@@ -3,6 +3,8 @@ import secrets
 from urllib.parse import quote_plus
 import os
 from pathlib import Path
+from typing import Optional
+import tempfile
 import dotenv
 
 dotenv.load_dotenv()
@@ -16,6 +18,8 @@ class Settings(BaseModel):
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  
     ALGORITHM: str = "HS256"
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
 
     
     BASE_DIR: Path = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -56,8 +60,64 @@ class Settings(BaseModel):
     FRONTEND_URL: str = os.getenv("FRONTEND_URL")
     ADMIN_EMAIL: str = os.getenv("ADMIN_EMAIL")
 
+    
+    PUBLIC_CATALOGUE_TTL: int = int(os.getenv("PUBLIC_CATALOGUE_TTL", "300"))
+    PUBLIC_CATALOGUE_SNAPSHOT: Optional[str] = os.getenv("PUBLIC_CATALOGUE_SNAPSHOT")
+
+    
+    SURVEY_STATE_TTL: int = int(os.getenv("SURVEY_STATE_TTL", "30"))
+    SURVEY_BUFFERED_WRITES: bool = os.getenv("SURVEY_BUFFERED_WRITES", "false").lower() in ("1", "true", "yes")
+    SURVEY_QUEUE_SIZE: int = int(os.getenv("SURVEY_QUEUE_SIZE", "5000"))
+    SURVEY_FLUSH_INTERVAL: float = float(os.getenv("SURVEY_FLUSH_INTERVAL", "0.5"))
+    SURVEY_BATCH_SIZE: int = int(os.getenv("SURVEY_BATCH_SIZE", "1000"))
+
+    
+    AUTH_CONTEXT_TTL: int = int(os.getenv("AUTH_CONTEXT_TTL", "60"))
+    AUTH_CONTEXT_MAXSIZE: int = int(os.getenv("AUTH_CONTEXT_MAXSIZE", "10000"))
+    OWNERSHIP_CACHE_TTL: int = int(os.getenv("OWNERSHIP_CACHE_TTL", "3600"))
+    OWNERSHIP_CACHE_MAXSIZE: int = int(os.getenv("OWNERSHIP_CACHE_MAXSIZE", "50000"))
+
+    
+    THREADPOOL_SIZE: int = int(os.getenv("THREADPOOL_SIZE", "40"))
+
+    # Servidor de producción (gunicorn.conf.py). Las cachés con invalidación
+    # compartida sincronizan sus workers a través de ficheros en CACHE_SYNC_DIR.
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+    WORKER_MAX_REQUESTS: int = int(os.getenv("WORKER_MAX_REQUESTS", "500"))
+    WORKER_MAX_REQUESTS_JITTER: int = int(os.getenv("WORKER_MAX_REQUESTS_JITTER", "50"))
+    WORKER_TIMEOUT: int = int(os.getenv("WORKER_TIMEOUT", "120"))
+    WORKER_GRACEFUL_TIMEOUT: int = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", "30"))
+    DB_CONNECTION_BUDGET: int = int(os.getenv("DB_CONNECTION_BUDGET", "120"))
+    CACHE_SYNC_DIR: Path = Path(os.getenv("CACHE_SYNC_DIR") or os.path.join(tempfile.gettempdir(), "patrimonio2030-cache"))
+
+    # /metrics (formato Prometheus). Con METRICS_MULTIPROCESS (lo activa
+    # gunicorn.conf.py con varios workers) cada worker vuelca su estado en
+    # METRICS_DIR cada METRICS_SNAPSHOT_INTERVAL segundos.
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    METRICS_TOKEN: Optional[str] = os.getenv("METRICS_TOKEN")
+    METRICS_DIR: Path = Path(os.getenv("METRICS_DIR") or os.path.join(tempfile.gettempdir(), "patrimonio2030-metrics"))
+    METRICS_SNAPSHOT_INTERVAL: float = float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "5"))
+    METRICS_MULTIPROCESS: bool = os.getenv("METRICS_MULTIPROCESS", "false").lower() in ("1", "true", "yes")
+
+    # Trazas de generación de informes: se registra un resumen por etapa si tarda
+    # más de REPORT_TRACE_LOG_THRESHOLD segundos. Los perfiles que pide un admin con
+    # la cabecera X-Report-Profile se guardan en REPORT_PROFILES_DIR/<report_id>,
+    # fuera de static/ porque REPORTS_DIR es público.
+    REPORT_TRACE_LOG_THRESHOLD: float = float(os.getenv("REPORT_TRACE_LOG_THRESHOLD", "2"))
+    REPORT_PROFILES_DIR: Path = Path(os.getenv("REPORT_PROFILES_DIR") or BASE_DIR / "logs" / "report_profiles")
+
+    # Con THREADPOOL_SIZE hilos por worker, pool_size + max_overflow debería cubrir
+    # los hilos que consultan a la vez; si no, esperan hasta DB_POOL_TIMEOUT.
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DATABASE_REPLICA_URL: Optional[str] = os.getenv("DATABASE_REPLICA_URL")
+    DB_REPLICA_POOL_SIZE: int = int(os.getenv("DB_REPLICA_POOL_SIZE", os.getenv("DB_POOL_SIZE", "10")))
+    DB_REPLICA_MAX_OVERFLOW: int = int(os.getenv("DB_REPLICA_MAX_OVERFLOW", os.getenv("DB_MAX_OVERFLOW", "30")))
+
     def create_directories(self):
-        """Crea todos los directorios necesarios si no existen."""
+        """Crea todos los directorios necesarios si no existen (se llama al arrancar el servidor)."""
         directories = [
             self.STATIC_DIR,
             self.UPLOADS_DIR,
@@ -86,4 +146,3 @@ class Settings(BaseModel):
         case_sensitive = True
 
 settings = Settings()
-settings.create_directories()  
\ No newline at end of file
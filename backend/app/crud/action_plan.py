@@ -6,8 +6,10 @@ from sqlalchemy import func
 from app.models.models import (
     SpecificObjective, Action, PerformanceIndicator,
     PerformanceIndicatorQuantitative, PerformanceIndicatorQualitative,
-    MaterialTopic, ODS
+    MaterialTopic
 )
+from app.crud import impact_analytics
+from app.services.permissions import resolve_report_id
 from app.schemas.action_plan import (
     SpecificObjectiveCreate, SpecificObjectiveUpdate,
     ActionCreate, ActionUpdate,
@@ -161,16 +163,10 @@ def get_action_by_id(db: Session, action_id: int) -> Optional[Action]:
 
 def get_report_id_by_action(db: Session, action_id: int) -> int:
     """
-    Obtiene el ID de una memoria a partir de una acción.
+    Obtiene el ID de una memoria a partir de una acción (índice de pertenencia cacheado).
     """
     try:
-        material_topic = db.query(MaterialTopic
-        ).join(SpecificObjective, MaterialTopic.id == SpecificObjective.material_topic_id
-        ).join(Action, SpecificObjective.id == Action.specific_objective_id
-        ).filter(Action.id == action_id).first()
-        if not material_topic:
-            return None
-        return material_topic.report_id
+        return resolve_report_id(db, "action", action_id)
     except Exception as e:
         raise e
 
@@ -228,28 +224,40 @@ def delete_action(db: Session, action_id: int) -> bool:
         raise e
 
 
+def _performance_indicators_with_data(db: Session):
+    """
+    Indicadores de rendimiento con sus datos cuantitativos y cualitativos en una
+    sola consulta (LEFT JOIN por clave primaria: como mucho una fila de cada).
+    """
+    return db.query(
+        PerformanceIndicator,
+        PerformanceIndicatorQuantitative,
+        PerformanceIndicatorQualitative
+    ).outerjoin(
+        PerformanceIndicatorQuantitative,
+        PerformanceIndicatorQuantitative.performance_indicator_id == PerformanceIndicator.id
+    ).outerjoin(
+        PerformanceIndicatorQualitative,
+        PerformanceIndicatorQualitative.performance_indicator_id == PerformanceIndicator.id
+    )
+
 def get_all_performance_indicators(db: Session, action_id: int) -> List[PerformanceIndicator]:
     """
     Obtiene todos los indicadores de rendimiento de una acción.
     """
     try:
-        indicators = db.query(PerformanceIndicator).filter(
+        rows = _performance_indicators_with_data(db).filter(
             PerformanceIndicator.action_id == action_id
-        ).all()
+        ).order_by(PerformanceIndicator.id).all()
 
-        for indicator in indicators:
+        indicators = []
+        for indicator, quantitative_data, qualitative_data in rows:
             if indicator.type == 'quantitative':
-                quantitative_data = db.query(PerformanceIndicatorQuantitative).filter(
-                    PerformanceIndicatorQuantitative.performance_indicator_id == indicator.id
-                ).first()
                 if quantitative_data:
                     indicator.quantitative_data = quantitative_data
-            else:
-                qualitative_data = db.query(PerformanceIndicatorQualitative).filter(
-                    PerformanceIndicatorQualitative.performance_indicator_id == indicator.id
-                ).first()
-                if qualitative_data:
-                    indicator.qualitative_data = qualitative_data
+            elif qualitative_data:
+                indicator.qualitative_data = qualitative_data
+            indicators.append(indicator)
 
         return indicators
     except Exception as e:
@@ -260,7 +268,7 @@ def get_all_performance_indicators_by_report(db: Session, report_id: int) -> Lis
     Obtiene todos los indicadores de rendimiento de una memoria.
     """
     try:
-        indicators = db.query(PerformanceIndicator).join(
+        rows = _performance_indicators_with_data(db).join(
             Action,
             PerformanceIndicator.action_id == Action.id
         ).join(
@@ -271,11 +279,11 @@ def get_all_performance_indicators_by_report(db: Session, report_id: int) -> Lis
             SpecificObjective.material_topic_id == MaterialTopic.id
         ).filter(
             MaterialTopic.report_id == report_id
-        ).all()
+        ).order_by(PerformanceIndicator.id).all()
 
         result = []
         
-        for indicator in indicators:
+        for indicator, quantitative_data, qualitative_data in rows:
             indicator_dict = {
                 "id": indicator.id,
                 "name": indicator.name,
@@ -286,22 +294,15 @@ def get_all_performance_indicators_by_report(db: Session, report_id: int) -> Lis
             }
             
             if indicator.type == 'quantitative':
-                quantitative_data = db.query(PerformanceIndicatorQuantitative).filter(
-                    PerformanceIndicatorQuantitative.performance_indicator_id == indicator.id
-                ).first()
                 if quantitative_data:
                     indicator_dict["quantitative_data"] = PerformanceIndicatorQuantitativeData(
                         numeric_response=quantitative_data.numeric_response,
                         unit=quantitative_data.unit
                     ).model_dump()
-            else:
-                qualitative_data = db.query(PerformanceIndicatorQualitative).filter(
-                    PerformanceIndicatorQualitative.performance_indicator_id == indicator.id
-                ).first()
-                if qualitative_data:
-                    indicator_dict["qualitative_data"] = PerformanceIndicatorQualitativeData(
-                        response=qualitative_data.response
-                    ).model_dump()
+            elif qualitative_data:
+                indicator_dict["qualitative_data"] = PerformanceIndicatorQualitativeData(
+                    response=qualitative_data.response
+                ).model_dump()
             
             result.append(PerformanceIndicatorSchema.model_validate(indicator_dict))
 
@@ -474,26 +475,7 @@ def get_all_action_main_impacts(db: Session, report_id: int) -> List[dict]:
     Obtiene el recuento de impactos principales de todas las acciones de una memoria.
     """
     try:
-        
-        actions = db.query(Action.ods_id, ODS.name.label('ods_name'))\
-            .join(SpecificObjective, Action.specific_objective_id == SpecificObjective.id)\
-            .join(MaterialTopic, SpecificObjective.material_topic_id == MaterialTopic.id)\
-            .outerjoin(ODS, Action.ods_id == ODS.id)\
-            .filter(MaterialTopic.report_id == report_id)\
-            .filter(Action.ods_id.isnot(None))\
-            .all()
-
-        
-        ods_counts = {}
-        for ods_id, ods_name in actions:
-            if ods_id not in ods_counts:
-                ods_counts[ods_id] = {"ods_id": ods_id, "ods_name": ods_name, "count": 0}
-            ods_counts[ods_id]["count"] += 1
-        
-        
-        result = list(ods_counts.values())
-        
-        return result
+        return impact_analytics.get_main_impact_counts(db, report_id)
     except Exception as e:
         raise e
 
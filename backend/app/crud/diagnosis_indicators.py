@@ -5,40 +5,35 @@ from decimal import Decimal
 
 from app.models.models import DiagnosisIndicator as DiagnosisIndicatorModel, DiagnosisIndicatorQuantitative, DiagnosisIndicatorQualitative, MaterialTopic
 from app.schemas.diagnosis_indicators import DiagnosisIndicatorCreate, DiagnosisIndicatorUpdate, DiagnosisIndicator
+from app.services.permissions import resolve_report_id
 
 
 
 def get_all_by_report(db: Session, report_id: int) -> List[DiagnosisIndicator]:
     """
     Obtiene todos los indicadores de diagnóstico de una memoria.
+    Los datos cuantitativos o cualitativos se traen en la misma consulta
+    (LEFT JOIN por su clave primaria, como mucho una fila por indicador).
     """
     try:
-        
-        indicators = (
-            db.query(DiagnosisIndicatorModel)
-            .join(MaterialTopic)
+        rows = (
+            db.query(DiagnosisIndicatorModel, DiagnosisIndicatorQuantitative, DiagnosisIndicatorQualitative)
+            .join(MaterialTopic, DiagnosisIndicatorModel.material_topic_id == MaterialTopic.id)
+            .outerjoin(DiagnosisIndicatorQuantitative, DiagnosisIndicatorQuantitative.diagnosis_indicator_id == DiagnosisIndicatorModel.id)
+            .outerjoin(DiagnosisIndicatorQualitative, DiagnosisIndicatorQualitative.diagnosis_indicator_id == DiagnosisIndicatorModel.id)
             .filter(MaterialTopic.report_id == report_id)
+            .order_by(DiagnosisIndicatorModel.id)
             .all()
         )
         
-        
-        for indicator in indicators:
+        indicators = []
+        for indicator, quantitative_data, qualitative_data in rows:
             if indicator.type == 'quantitative':
-                quantitative_data = (
-                    db.query(DiagnosisIndicatorQuantitative)
-                    .filter(DiagnosisIndicatorQuantitative.diagnosis_indicator_id == indicator.id)
-                    .first()
-                )
                 if quantitative_data:
                     indicator.quantitative_data = quantitative_data
-            else:
-                qualitative_data = (
-                    db.query(DiagnosisIndicatorQualitative)
-                    .filter(DiagnosisIndicatorQualitative.diagnosis_indicator_id == indicator.id)
-                    .first()
-                )
-                if qualitative_data:
-                    indicator.qualitative_data = qualitative_data
+            elif qualitative_data:
+                indicator.qualitative_data = qualitative_data
+            indicators.append(indicator)
         return [DiagnosisIndicator.from_orm(indicator) for indicator in indicators]
     except Exception as e:
         raise e
@@ -85,13 +80,10 @@ def create_indicator(
 
 def get_report_id_by_indicator(db: Session, indicator_id: int) -> int:
     """
-    Obtiene el ID de una memoria a partir de un indicador de diagnóstico.
+    Obtiene el ID de una memoria a partir de un indicador de diagnóstico (índice de pertenencia cacheado).
     """
     try:
-        material_topic_indicator = db.query(MaterialTopic).join(DiagnosisIndicatorModel, DiagnosisIndicatorModel.material_topic_id == MaterialTopic.id).filter(DiagnosisIndicatorModel.id == indicator_id).first()
-        if not material_topic_indicator:
-            return None
-        return material_topic_indicator.report_id
+        return resolve_report_id(db, "diagnosis_indicator", indicator_id)
     except Exception as e:
         raise e
 
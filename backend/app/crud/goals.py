@@ -1,13 +1,14 @@
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from app.models.models import Goal, MaterialTopic
+from app.services.reference_data import get_reference_data
 
 def get_goals_by_ods(db: Session, ods_id: int) -> List[Goal]:
     """
     Obtiene todos los objetivos de un ODS.
     """
     try:
-        return db.query(Goal).filter(Goal.ods_id == ods_id).all()
+        return list(get_reference_data(db).goals_by_ods.get(ods_id, ()))
     except Exception as e:
         raise e
 
@@ -38,6 +39,6 @@ def get_all_goals(db: Session) -> List[Goal]:
     Obtiene todos los objetivos.
     """
     try:
-        return db.query(Goal).all()
+        return list(get_reference_data(db).goals)
     except Exception as e:
         raise e
@@ -0,0 +1,153 @@
+from typing import Dict, List, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import select, union_all, literal, func, case, Float
+from app.models.models import (
+    SustainabilityReport,
+    MaterialTopic,
+    SpecificObjective,
+    Action,
+    SecondaryODSAction
+)
+from app.services.reference_data import DIMENSION_ODS, get_reference_data
+
+
+CONSISTENCY_DIMENSIONS = {
+    "PERSONAS": DIMENSION_ODS["Persona"],
+    "PLANETA": DIMENSION_ODS["Planeta"],
+    "PROSPERIDAD": DIMENSION_ODS["Prosperidad"],
+    "PAZ": DIMENSION_ODS["Paz"],
+    "ALIANZAS": DIMENSION_ODS["Alianzas"]
+}
+
+
+def _report_impacts(report_id: int):
+    """
+    Subconsulta con un registro por impacto (ods_id, action_id, kind) de las acciones de una memoria:
+    kind = 'main' para el ODS principal de la acción y 'secondary' para cada ODS secundario.
+    """
+    main_impacts = select(
+        Action.ods_id.label("ods_id"),
+        Action.id.label("action_id"),
+        literal("main").label("kind")
+    ).join(SpecificObjective, Action.specific_objective_id == SpecificObjective.id)\
+        .join(MaterialTopic, SpecificObjective.material_topic_id == MaterialTopic.id)\
+        .where(MaterialTopic.report_id == report_id, Action.ods_id.isnot(None))
+
+    secondary_impacts = select(
+        SecondaryODSAction.ods_id.label("ods_id"),
+        SecondaryODSAction.action_id.label("action_id"),
+        literal("secondary").label("kind")
+    ).join(Action, SecondaryODSAction.action_id == Action.id)\
+        .join(SpecificObjective, Action.specific_objective_id == SpecificObjective.id)\
+        .join(MaterialTopic, SpecificObjective.material_topic_id == MaterialTopic.id)\
+        .where(MaterialTopic.report_id == report_id)
+
+    return union_all(main_impacts, secondary_impacts).subquery("impacts")
+
+
+def get_ods_impact_counts(db: Session, report_id: int) -> Dict[int, Dict[str, int]]:
+    """
+    Obtiene, por ODS, el número de impactos principales y secundarios de las acciones
+    de una memoria con una única consulta agrupada. `secondary_action_id` es la
+    primera acción (menor id) con ese ODS como impacto secundario.
+    """
+    try:
+        impacts = _report_impacts(report_id)
+        rows = db.execute(
+            select(
+                impacts.c.ods_id,
+                func.sum(case((impacts.c.kind == "main", 1), else_=0)),
+                func.sum(case((impacts.c.kind == "secondary", 1), else_=0)),
+                func.min(case((impacts.c.kind == "secondary", impacts.c.action_id)))
+            ).group_by(impacts.c.ods_id).order_by(impacts.c.ods_id)
+        ).all()
+        return {
+            ods_id: {
+                "main": int(main_count or 0),
+                "secondary": int(secondary_count or 0),
+                "secondary_action_id": secondary_action_id
+            }
+            for ods_id, main_count, secondary_count, secondary_action_id in rows
+        }
+    except Exception as e:
+        raise e
+
+
+def get_main_impact_counts(db: Session, report_id: int) -> List[dict]:
+    """
+    Obtiene el recuento de impactos principales de las acciones por ODS.
+    """
+    try:
+        ods_by_id = get_reference_data(db).ods_by_id
+        return [
+            {"ods_id": ods_id, "ods_name": ods_by_id[ods_id].name if ods_id in ods_by_id else None, "count": counts["main"]}
+            for ods_id, counts in get_ods_impact_counts(db, report_id).items()
+            if counts["main"]
+        ]
+    except Exception as e:
+        raise e
+
+
+def get_secondary_impact_counts(db: Session, report_id: int) -> List[dict]:
+    """
+    Obtiene el recuento de impactos secundarios de las acciones por ODS.
+    """
+    try:
+        ods_by_id = get_reference_data(db).ods_by_id
+        return [
+            {
+                "ods_id": ods_id,
+                "action_id": counts["secondary_action_id"],
+                "ods_name": ods_by_id[ods_id].name if ods_id in ods_by_id else None,
+                "count": counts["secondary"]
+            }
+            for ods_id, counts in get_ods_impact_counts(db, report_id).items()
+            if counts["secondary"]
+        ]
+    except Exception as e:
+        raise e
+
+
+def get_report_weights(report: SustainabilityReport) -> Tuple[float, float]:
+    """
+    Pesos de impacto principal y secundario de una memoria (0 si no están definidos).
+    """
+    main_weight = float(report.main_impact_weight if report.main_impact_weight is not None else 0)
+    secondary_weight = float(report.secondary_impact_weight if report.secondary_impact_weight is not None else 0)
+    return main_weight, secondary_weight
+
+
+def get_dimension_totals(
+    db: Session,
+    report_id: int,
+    main_weight: float,
+    secondary_weight: float
+) -> Tuple[Dict[str, float], List[dict]]:
+    """
+    Calcula el impacto ponderado por dimensión (coherencia interna) en una sola consulta:
+    SUM(CASE ...) por dimensión sobre la unión de impactos principales y secundarios.
+    """
+    try:
+        impacts = _report_impacts(report_id)
+        weight = case(
+            (impacts.c.kind == "main", literal(main_weight, Float)),
+            else_=literal(secondary_weight, Float)
+        )
+        row = db.execute(
+            select(*[
+                func.sum(case((impacts.c.ods_id.in_(ods_ids), weight), else_=0)).label(dimension)
+                for dimension, ods_ids in CONSISTENCY_DIMENSIONS.items()
+            ])
+        ).one()
+
+        dimension_totals = {
+            dimension: float(row[index] or 0)
+            for index, dimension in enumerate(CONSISTENCY_DIMENSIONS)
+        }
+        dimension_totals_list = [
+            {"dimension": dimension, "total": total}
+            for dimension, total in dimension_totals.items()
+        ]
+        return dimension_totals, dimension_totals_list
+    except Exception as e:
+        raise e
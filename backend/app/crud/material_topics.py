@@ -1,7 +1,7 @@
 from typing import Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from app.models.models import MaterialTopic
+from app.services.search import apply_text_search
 from app.schemas.material_topics import MaterialTopicCreate, MaterialTopicUpdate
 
 def create(db: Session, material_topic_data: MaterialTopicCreate) -> MaterialTopic:
@@ -87,7 +87,7 @@ def search(
     report_id: Optional[int] = None,
 ) -> tuple[List[MaterialTopic], int]:
     """
-    Busca asuntos de materialidad.
+    Busca asuntos de materialidad, ordenados por relevancia cuando hay índice FULLTEXT.
     """
     try:
         query = db.query(MaterialTopic)
@@ -95,17 +95,9 @@ def search(
         if report_id:
             query = query.filter(MaterialTopic.report_id == report_id)
 
-        if search_term:
-            search = f"%{search_term}%"
-            query = query.filter(
-                or_(
-                    MaterialTopic.name.ilike(search),
-                    MaterialTopic.description.ilike(search)
-                )
-            )
+        query = apply_text_search(query, db, [MaterialTopic.name, MaterialTopic.description], search_term)
 
-        if name:
-            query = query.filter(MaterialTopic.name.ilike(f"%{name}%"))
+        query = apply_text_search(query, db, [MaterialTopic.name], name)
 
         material_topics = query.all()
 
@@ -0,0 +1,207 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.models.models import Assessment, MaterialityAggregate, MaterialTopic, Stakeholder
+
+
+AggregateKey = Tuple[int, str]
+
+
+def _upsert_deltas(db: Session, deltas: Dict[AggregateKey, List[int]]) -> None:
+    """
+    Suma los incrementos (n, suma, suma de cuadrados) a cada fila (asunto, tipo),
+    creándola si no existe: INSERT ... ON DUPLICATE KEY / ON CONFLICT en MySQL,
+    SQLite y PostgreSQL, y UPDATE o INSERT fila a fila en el resto. Las claves se ordenan para que dos transacciones
+    concurrentes bloqueen las filas en el mismo orden.
+    """
+    if not deltas:
+        return
+    table = MaterialityAggregate.__table__
+    values = [
+        {
+            "material_topic_id": topic_id,
+            "stakeholder_type": stakeholder_type,
+            "assessment_count": count,
+            "score_sum": total,
+            "score_sum_sq": total_sq
+        }
+        for (topic_id, stakeholder_type), (count, total, total_sq) in sorted(deltas.items())
+    ]
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "mysql":
+        statement = mysql_insert(table).values(values)
+        statement = statement.on_duplicate_key_update(
+            assessment_count=table.c.assessment_count + statement.inserted.assessment_count,
+            score_sum=table.c.score_sum + statement.inserted.score_sum,
+            score_sum_sq=table.c.score_sum_sq + statement.inserted.score_sum_sq
+        )
+    elif dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+        statement = dialect_insert(table).values(values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.material_topic_id, table.c.stakeholder_type],
+            set_={
+                "assessment_count": table.c.assessment_count + statement.excluded.assessment_count,
+                "score_sum": table.c.score_sum + statement.excluded.score_sum,
+                "score_sum_sq": table.c.score_sum_sq + statement.excluded.score_sum_sq
+            }
+        )
+    else:
+        _update_or_insert(db, values)
+        return
+    db.execute(statement)
+
+
+def _update_or_insert(db: Session, values: List[Dict[str, int]]) -> None:
+    """
+    Alternativa portable para otros dialectos: un UPDATE por fila y un INSERT si
+    la fila (asunto, tipo) aún no existe.
+    """
+    table = MaterialityAggregate.__table__
+    for row in values:
+        result = db.execute(
+            update(table).where(
+                table.c.material_topic_id == row["material_topic_id"],
+                table.c.stakeholder_type == row["stakeholder_type"]
+            ).values(
+                assessment_count=table.c.assessment_count + row["assessment_count"],
+                score_sum=table.c.score_sum + row["score_sum"],
+                score_sum_sq=table.c.score_sum_sq + row["score_sum_sq"]
+            )
+        )
+        if result.rowcount == 0:
+            db.execute(insert(table).values(**row))
+
+
+def apply_assessment_rows(db: Session, rows: Iterable[Dict[str, int]], sign: int = 1) -> None:
+    """
+    Actualiza los acumulados con valoraciones recién insertadas (sign=1) o
+    eliminadas (sign=-1). Cada fila tiene material_topic_id, stakeholder_id y score.
+    No hace commit: debe ir en la misma transacción que el cambio de valoraciones.
+    """
+    try:
+        rows = list(rows)
+        if not rows:
+            return
+        stakeholder_ids = {row["stakeholder_id"] for row in rows}
+        stakeholder_types = dict(
+            db.query(Stakeholder.id, Stakeholder.type).filter(Stakeholder.id.in_(stakeholder_ids)).all()
+        )
+
+        deltas: Dict[AggregateKey, List[int]] = {}
+        for row in rows:
+            stakeholder_type = stakeholder_types.get(row["stakeholder_id"])
+            if stakeholder_type is None:
+                continue
+            delta = deltas.setdefault((row["material_topic_id"], stakeholder_type), [0, 0, 0])
+            score = row["score"]
+            delta[0] += sign
+            delta[1] += sign * score
+            delta[2] += sign * score * score
+        _upsert_deltas(db, deltas)
+    except Exception as e:
+        raise e
+
+
+def _stakeholder_moments(db: Session, stakeholder_id: int) -> List[Tuple[int, int, int, int]]:
+    return db.query(
+        Assessment.material_topic_id,
+        func.count(Assessment.id),
+        func.sum(Assessment.score),
+        func.sum(Assessment.score * Assessment.score)
+    ).filter(
+        Assessment.stakeholder_id == stakeholder_id
+    ).group_by(Assessment.material_topic_id).all()
+
+
+def remove_stakeholder(db: Session, stakeholder_id: int, stakeholder_type: str) -> None:
+    """
+    Descuenta de los acumulados las valoraciones de un grupo de interés que se va
+    a eliminar (sus valoraciones se borran en cascada). No hace commit.
+    """
+    try:
+        _upsert_deltas(db, {
+            (topic_id, stakeholder_type): [-int(count), -int(total or 0), -int(total_sq or 0)]
+            for topic_id, count, total, total_sq in _stakeholder_moments(db, stakeholder_id)
+        })
+    except Exception as e:
+        raise e
+
+
+def move_stakeholder(db: Session, stakeholder_id: int, old_type: str, new_type: str) -> None:
+    """
+    Traslada las valoraciones de un grupo de interés al cambiar su tipo. No hace commit.
+    """
+    try:
+        if old_type == new_type:
+            return
+        deltas: Dict[AggregateKey, List[int]] = {}
+        for topic_id, count, total, total_sq in _stakeholder_moments(db, stakeholder_id):
+            moments = [int(count), int(total or 0), int(total_sq or 0)]
+            deltas[(topic_id, old_type)] = [-value for value in moments]
+            deltas[(topic_id, new_type)] = moments
+        _upsert_deltas(db, deltas)
+    except Exception as e:
+        raise e
+
+
+def rebuild_materiality_aggregates(db: Session, report_id: Optional[int] = None) -> int:
+    """
+    Recalcula los acumulados a partir de las valoraciones, de una memoria o de todas.
+    Devuelve el número de filas generadas.
+    """
+    try:
+        table = MaterialityAggregate.__table__
+        topic_ids = select(MaterialTopic.id).where(MaterialTopic.report_id == report_id)
+
+        clear = delete(table)
+        if report_id is not None:
+            clear = clear.where(table.c.material_topic_id.in_(topic_ids))
+        db.execute(clear)
+
+        moments = select(
+            Assessment.material_topic_id,
+            Stakeholder.type,
+            func.count(Assessment.id),
+            func.sum(Assessment.score),
+            func.sum(Assessment.score * Assessment.score)
+        ).join(
+            Stakeholder, Assessment.stakeholder_id == Stakeholder.id
+        ).group_by(Assessment.material_topic_id, Stakeholder.type)
+        if report_id is not None:
+            moments = moments.where(Assessment.material_topic_id.in_(topic_ids))
+
+        result = db.execute(insert(table).from_select(
+            ["material_topic_id", "stakeholder_type", "assessment_count", "score_sum", "score_sum_sq"],
+            moments
+        ))
+        db.commit()
+        return result.rowcount
+    except Exception as e:
+        db.rollback()
+        raise e
+
+
+def get_report_aggregates(db: Session, report_id: int) -> List[Tuple[int, str, int, int, int]]:
+    """
+    Acumulados (asunto, tipo, n, suma, suma de cuadrados) de los asuntos de una memoria.
+    """
+    try:
+        return db.query(
+            MaterialityAggregate.material_topic_id,
+            MaterialityAggregate.stakeholder_type,
+            MaterialityAggregate.assessment_count,
+            MaterialityAggregate.score_sum,
+            MaterialityAggregate.score_sum_sq
+        ).join(
+            MaterialTopic, MaterialityAggregate.material_topic_id == MaterialTopic.id
+        ).filter(
+            MaterialTopic.report_id == report_id,
+            MaterialityAggregate.assessment_count > 0
+        ).all()
+    except Exception as e:
+        raise e
@@ -1,14 +1,17 @@
 from typing import List, Optional, Dict
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from app.models.models import ODS, SecondaryODSMaterialTopic, MaterialTopic, SecondaryODSAction, Action, SpecificObjective
 from collections import Counter
+from app.services.reference_data import get_reference_data
+from app.crud import impact_analytics
 
 def get_all_ods(db: Session) -> List[ODS]:
     """
-    Obtiene todos los ODS.
+    Obtiene todos los ODS (desde el registro de datos de referencia).
     """
     try:
-        return db.query(ODS).all()
+        return list(get_reference_data(db).ods)
     except Exception as e:
         raise
 
@@ -27,23 +30,46 @@ def get_secondary_impacts(db: Session, material_topic_id: int) -> List[int]:
 def get_all_secondary_impacts_by_report(db: Session, report_id: int) -> List[dict]:
     """
     Obtiene los ODS de impacto secundario para una memoria.
+    Una sola consulta (asuntos con sus impactos por LEFT JOIN) agrupada en Python.
     """
     try:
-        
-        material_topics = db.query(MaterialTopic)\
+        rows = db.query(MaterialTopic.id, SecondaryODSMaterialTopic.ods_id)\
+            .outerjoin(SecondaryODSMaterialTopic, SecondaryODSMaterialTopic.material_topic_id == MaterialTopic.id)\
             .filter(MaterialTopic.report_id == report_id)\
+            .order_by(MaterialTopic.id, SecondaryODSMaterialTopic.ods_id)\
             .all()
         
         
-        result = []
-        for topic in material_topics:
-            secondary_impacts = get_secondary_impacts(db, topic.id)
-            result.append({
-                "material_topic_id": topic.id,
-                "ods_ids": secondary_impacts
-            })
+        impacts_by_topic: Dict[int, List[int]] = {}
+        for material_topic_id, ods_id in rows:
+            ods_ids = impacts_by_topic.setdefault(material_topic_id, [])
+            if ods_id is not None:
+                ods_ids.append(ods_id)
         
-        return result
+        return [
+            {"material_topic_id": material_topic_id, "ods_ids": ods_ids}
+            for material_topic_id, ods_ids in impacts_by_topic.items()
+        ]
+    except Exception as e:
+        raise e
+
+def get_secondary_impact_counts_by_report(db: Session, report_id: int) -> List[int]:
+    """
+    Obtiene el número de impactos secundarios por ODS de una memoria
+    como vector de 17 posiciones (posición i = ODS i+1), agregado en SQL.
+    """
+    try:
+        rows = db.query(SecondaryODSMaterialTopic.ods_id, func.count())\
+            .join(MaterialTopic, SecondaryODSMaterialTopic.material_topic_id == MaterialTopic.id)\
+            .filter(MaterialTopic.report_id == report_id)\
+            .group_by(SecondaryODSMaterialTopic.ods_id)\
+            .all()
+        
+        impact_counts = [0] * 17
+        for ods_id, count in rows:
+            if 1 <= ods_id <= 17:
+                impact_counts[ods_id - 1] = count
+        return impact_counts
     except Exception as e:
         raise e
 
@@ -78,26 +104,8 @@ def get_all_ods_with_dimension(db: Session) -> Dict[str, List[ODS]]:
     Obtiene todos los ODS agrupados por su dimensión.
     """
     try:
-        
-        all_ods = db.query(ODS).all()
-        
-        
-        dimensions = {
-            "Persona": [1, 2, 3, 4, 5],
-            "Planeta": [6, 12, 13, 14, 15],
-            "Prosperidad": [7, 8, 9, 10, 11],
-            "Paz": [16],
-            "Alianzas": [17]
-        }
-        
-        
-        ods_by_dimension = {}
-        for dimension, ods_numbers in dimensions.items():
-            ods_by_dimension[dimension] = [
-                ods for ods in all_ods if ods.id in ods_numbers
-            ]
-        
-        return ods_by_dimension
+        ods_by_dimension = get_reference_data(db).ods_by_dimension
+        return {dimension: list(ods_list) for dimension, ods_list in ods_by_dimension.items()}
     except Exception as e:
         raise Exception(f"Error al obtener ODS por dimensión: {str(e)}")
 def get_action_secondary_impacts(db: Session, action_id: int) -> List[int]:
@@ -149,28 +157,8 @@ def get_all_action_secondary_impacts_counts(db: Session, report_id: int) -> List
     Obtiene el recuento de impactos secundarios de todas las acciones de un reporte.
     """
     try:
-        
-        secondary_impacts = db.query(SecondaryODSAction.ods_id, SecondaryODSAction.action_id, ODS.name.label('ods_name'))\
-            .join(Action, SecondaryODSAction.action_id == Action.id)\
-            .join(SpecificObjective, Action.specific_objective_id == SpecificObjective.id)\
-            .join(MaterialTopic, SpecificObjective.material_topic_id == MaterialTopic.id)\
-            .join(ODS, SecondaryODSAction.ods_id == ODS.id)\
-            .filter(MaterialTopic.report_id == report_id)\
-            .all()
-
-        
-        ods_counts = {}
-        for ods_id, action_id, ods_name in secondary_impacts:
-            if ods_id not in ods_counts:
-                ods_counts[ods_id] = {"ods_id": ods_id, "action_id": action_id, "ods_name": ods_name, "count": 0}
-            ods_counts[ods_id]["count"] += 1
-        
-        
-        result = list(ods_counts.values())
-        
-        return result
+        return impact_analytics.get_secondary_impact_counts(db, report_id)
     except Exception as e:
-        print(e)
         raise e
 
 def get_all_action_secondary_impacts(db: Session, report_id: int) -> List[dict]:
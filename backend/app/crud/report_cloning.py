@@ -0,0 +1,203 @@
+from typing import Dict, List, Tuple, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, literal, func
+from app.models.models import (
+    SustainabilityTeamMember,
+    ReportAgreement,
+    ReportBibliography,
+    ReportNorm,
+    MaterialTopic,
+    DiagnosisIndicator,
+    DiagnosisIndicatorQualitative,
+    DiagnosisIndicatorQuantitative,
+    SpecificObjective,
+    Action,
+    PerformanceIndicator,
+    PerformanceIndicatorQualitative,
+    PerformanceIndicatorQuantitative,
+    SecondaryODSAction,
+    SecondaryODSMaterialTopic,
+    Stakeholder
+)
+
+
+def _fetch_rows(db: Session, model, *criteria) -> List[Dict[str, Any]]:
+    """
+    Lee las filas de una tabla como diccionarios columna -> valor.
+    """
+    return [dict(row) for row in db.execute(select(model.__table__).where(*criteria)).mappings().all()]
+
+
+def _copy_values(row: Dict[str, Any], overrides: Dict[str, Any], skip: Tuple[str, ...] = ("id",)) -> Dict[str, Any]:
+    """
+    Copia los valores de una fila, omitiendo la clave primaria y aplicando los nuevos valores.
+    """
+    values = {key: value for key, value in row.items() if key not in skip}
+    values.update(overrides)
+    return values
+
+
+def _insert_mapped(db: Session, model, rows: List[Tuple[int, Dict[str, Any]]], inserted_filter) -> Dict[int, int]:
+    """
+    Inserta en bloque las filas y devuelve el mapa explícito id antiguo -> id nuevo.
+
+    Si el dialecto soporta INSERT ... RETURNING con orden garantizado se emite una
+    única sentencia. En otro caso (MySQL) se inserta con executemany (un INSERT de
+    varias filas) y se vuelven a leer los ids de las filas que cumplen
+    `inserted_filter` (la memoria o los padres recién creados) con id mayor que el
+    máximo previo de la tabla: dentro de una sentencia los autoincrementos crecen
+    en el orden de las filas, así que ordenar por id reproduce el orden de inserción.
+    """
+    if not rows:
+        return {}
+
+    values = [row_values for _, row_values in rows]
+    dialect = db.get_bind().dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        new_ids = db.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            values
+        ).scalars().all()
+    else:
+        last_id = db.execute(select(func.max(model.id))).scalar() or 0
+        db.execute(insert(model.__table__), values)
+        new_ids = db.execute(
+            select(model.id).where(inserted_filter, model.id > last_id).order_by(model.id)
+        ).scalars().all()
+        if len(new_ids) != len(rows):
+            raise RuntimeError(
+                f"Clonado de {model.__tablename__}: se esperaban {len(rows)} filas nuevas y hay {len(new_ids)}"
+            )
+    return {old_id: new_id for (old_id, _), new_id in zip(rows, new_ids)}
+
+
+def _insert_bulk(db: Session, model, rows: List[Dict[str, Any]]) -> None:
+    """
+    Inserta en bloque filas que no necesitan mapa de ids (executemany multi-fila).
+    """
+    if rows:
+        db.execute(insert(model.__table__), rows)
+
+
+def _insert_select_by_report(db: Session, model, template_report_id: int, new_report_id: int) -> None:
+    """
+    Copia las filas de una tabla ligada a la memoria con un único INSERT ... SELECT.
+    """
+    columns = [
+        column for column in model.__table__.columns
+        if not column.primary_key and column.name != "report_id"
+    ]
+    db.execute(
+        insert(model.__table__).from_select(
+            [column.name for column in columns] + ["report_id"],
+            select(*columns, literal(new_report_id)).where(model.report_id == template_report_id)
+        )
+    )
+
+
+def clone_report_data(db: Session, template_report_id: int, new_report_id: int) -> Dict[str, Dict[int, int]]:
+    """
+    Clona las tablas relacionadas de una memoria plantilla en una memoria nueva.
+
+    Trabaja por conjuntos (una sentencia por tabla, más la relectura de ids en
+    MySQL) dentro de la transacción actual y no hace commit: el llamante decide cuándo confirmar. Devuelve los mapas
+    id antiguo -> id nuevo de las entidades que tienen hijos.
+    """
+
+    template_topics = _fetch_rows(db, MaterialTopic, MaterialTopic.report_id == template_report_id)
+    material_topic_id_map = _insert_mapped(db, MaterialTopic, [
+        (row["id"], _copy_values(row, {"report_id": new_report_id}))
+        for row in template_topics
+    ], MaterialTopic.report_id == new_report_id)
+
+
+    template_indicators = _fetch_rows(
+        db, DiagnosisIndicator,
+        DiagnosisIndicator.material_topic_id.in_(list(material_topic_id_map.keys()))
+    ) if material_topic_id_map else []
+    indicator_id_map = _insert_mapped(db, DiagnosisIndicator, [
+        (row["id"], _copy_values(row, {"material_topic_id": material_topic_id_map[row["material_topic_id"]]}))
+        for row in template_indicators
+    ], DiagnosisIndicator.material_topic_id.in_(list(material_topic_id_map.values())))
+
+
+    if indicator_id_map:
+        for model in (DiagnosisIndicatorQuantitative, DiagnosisIndicatorQualitative):
+            rows = _fetch_rows(db, model, model.diagnosis_indicator_id.in_(list(indicator_id_map.keys())))
+            _insert_bulk(db, model, [
+                _copy_values(row, {"diagnosis_indicator_id": indicator_id_map[row["diagnosis_indicator_id"]]}, skip=())
+                for row in rows
+            ])
+
+
+    template_objectives = _fetch_rows(
+        db, SpecificObjective,
+        SpecificObjective.material_topic_id.in_(list(material_topic_id_map.keys()))
+    ) if material_topic_id_map else []
+    objective_id_map = _insert_mapped(db, SpecificObjective, [
+        (row["id"], _copy_values(row, {"material_topic_id": material_topic_id_map[row["material_topic_id"]]}))
+        for row in template_objectives
+    ], SpecificObjective.material_topic_id.in_(list(material_topic_id_map.values())))
+
+
+    template_actions = _fetch_rows(
+        db, Action,
+        Action.specific_objective_id.in_(list(objective_id_map.keys()))
+    ) if objective_id_map else []
+    action_id_map = _insert_mapped(db, Action, [
+        (row["id"], _copy_values(row, {"specific_objective_id": objective_id_map[row["specific_objective_id"]]}))
+        for row in template_actions
+    ], Action.specific_objective_id.in_(list(objective_id_map.values())))
+
+
+    template_performance = _fetch_rows(
+        db, PerformanceIndicator,
+        PerformanceIndicator.action_id.in_(list(action_id_map.keys()))
+    ) if action_id_map else []
+    performance_id_map = _insert_mapped(db, PerformanceIndicator, [
+        (row["id"], _copy_values(row, {"action_id": action_id_map[row["action_id"]]}))
+        for row in template_performance
+    ], PerformanceIndicator.action_id.in_(list(action_id_map.values())))
+
+
+    if performance_id_map:
+        for model in (PerformanceIndicatorQuantitative, PerformanceIndicatorQualitative):
+            rows = _fetch_rows(db, model, model.performance_indicator_id.in_(list(performance_id_map.keys())))
+            _insert_bulk(db, model, [
+                _copy_values(row, {"performance_indicator_id": performance_id_map[row["performance_indicator_id"]]}, skip=())
+                for row in rows
+            ])
+
+
+    if action_id_map:
+        rows = _fetch_rows(db, SecondaryODSAction, SecondaryODSAction.action_id.in_(list(action_id_map.keys())))
+        _insert_bulk(db, SecondaryODSAction, [
+            _copy_values(row, {
+                "action_id": action_id_map[row["action_id"]],
+                "specific_objective_id": objective_id_map[row["specific_objective_id"]]
+            }, skip=())
+            for row in rows
+        ])
+
+
+    if material_topic_id_map:
+        rows = _fetch_rows(
+            db, SecondaryODSMaterialTopic,
+            SecondaryODSMaterialTopic.material_topic_id.in_(list(material_topic_id_map.keys()))
+        )
+        _insert_bulk(db, SecondaryODSMaterialTopic, [
+            _copy_values(row, {"material_topic_id": material_topic_id_map[row["material_topic_id"]]}, skip=())
+            for row in rows
+        ])
+
+
+    for model in (Stakeholder, ReportAgreement, ReportBibliography, ReportNorm, SustainabilityTeamMember):
+        _insert_select_by_report(db, model, template_report_id, new_report_id)
+
+    return {
+        "material_topics": material_topic_id_map,
+        "diagnosis_indicators": indicator_id_map,
+        "specific_objectives": objective_id_map,
+        "actions": action_id_map,
+        "performance_indicators": performance_id_map
+    }
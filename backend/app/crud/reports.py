@@ -1,6 +1,6 @@
 from typing import List, Optional, Tuple, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func
 from app.models.models import (
     SustainabilityReport,
     HeritageResource,
@@ -9,19 +9,7 @@ from app.models.models import (
     ReportLogo as ReportLogoModel,
     ReportAgreement as ReportAgreementModel,
     ReportBibliography as ReportBibliographyModel,
-    ReportNorm as ReportNormModel,
-    MaterialTopic,
-    DiagnosisIndicator,
-    DiagnosisIndicatorQualitative,
-    DiagnosisIndicatorQuantitative,
-    SpecificObjective,
-    Action,
-    PerformanceIndicator,
-    PerformanceIndicatorQualitative,
-    PerformanceIndicatorQuantitative,
-    SecondaryODSAction,
-    SecondaryODSMaterialTopic,
-    Stakeholder
+    ReportNorm as ReportNormModel
 )
 from app.schemas.reports import (
     SustainabilityReportCreate,
@@ -53,11 +41,10 @@ from fastapi import HTTPException
 from app.utils.image_processing import process_cover_image
 from app.config import Settings
 from fastapi import UploadFile
-import requests
 from io import BytesIO
 from app.utils.graphs.materiality_matrix import create_materiality_matrix_data, generate_matrix_image
 from app.utils.graphs.main_secondary_impacts import get_main_impacts_material_topics_graph, get_secondary_impacts_material_topics_graph
-from app.utils.graphs.internal_consistency import generate_internal_consistency_graph, get_dimension_totals
+from app.utils.graphs.internal_consistency import generate_internal_consistency_graph
 from app.crud import resources as crud_resources
 from app.crud import material_topics as crud_material_topic
 from app.crud import diagnosis_indicators as crud_diagnosis_indicators
@@ -66,7 +53,14 @@ from app.crud import action_plan as crud_action_plan
 from app.crud import stakeholders as crud_stakeholders
 from app.crud import team as crud_team
 from app.crud import goals as crud_goals
-from app.services.report_generator import ReportGenerator
+from app.crud import impact_analytics
+from app.crud.report_cloning import clone_report_data
+from app.services.search import apply_text_search
+from app.services import public_catalogue, survey_ingestion, auth_context, tracing
+from app.utils.lazy import lazy_import
+
+# Jinja2, BeautifulSoup y la paginación solo se cargan al generar un informe.
+report_generator = lazy_import("app.services.report_generator")
 
 settings = Settings()
 
@@ -83,10 +77,14 @@ def create_report(db: Session, report: SustainabilityReportCreate) -> Sustainabi
         db.commit()
         db.refresh(db_report)
 
+        if db_report.state == 'Published':
+            public_catalogue.invalidate_catalogue()
+
         
         if report.template_report_id:
             transfer_report_data(db, report.template_report_id, db_report.id)
             transfer_report_images(db, report.template_report_id, db_report.id)
+            auth_context.invalidate_report_members(db, db_report.id)
 
         return db_report
     except Exception as e:
@@ -94,67 +92,101 @@ def create_report(db: Session, report: SustainabilityReportCreate) -> Sustainabi
         raise e
 
 
+REPORT_SEARCH_MAX_LIMIT = 100
+
+REPORT_SORT_COLUMNS = {
+    'year': SustainabilityReport.year,
+    'state': SustainabilityReport.state,
+    'heritage_resource_name': HeritageResource.name,
+    'id': SustainabilityReport.id
+}
+
+
 def search_reports(
     db: Session,
     user_id: Optional[int] = None,
     is_admin: bool = False,
     search_term: Optional[str] = None,
+    heritage_resource_name: Optional[str] = None,
     heritage_resource_ids: Optional[List[int]] = None,
     year: Optional[int] = None,
-    state: Optional[str] = None
+    state: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    sort_by: str = 'year',
+    sort_order: str = 'desc'
 ) -> Tuple[List[SustainabilityReportWithRole], int]:
     """
     Busca memorias de sostenibilidad con los filtros especificados.
-    Retorna una tupla con la lista de memorias y el total de resultados.
+    Retorna una tupla con la página de memorias y el total de resultados.
+
+    Memoria, nombre del recurso y rol del usuario se obtienen en una sola consulta;
+    el total se calcula con COUNT(*) solo cuando se pagina.
     """
     try:
-        query = db.query(SustainabilityReport)
+        with_role = not is_admin and user_id is not None
+
+        columns = [SustainabilityReport, HeritageResource.name]
+        if with_role:
+            columns += [SustainabilityTeamMember.type, SustainabilityTeamMember.organization]
+
+        query = db.query(*columns).join(
+            HeritageResource,
+            SustainabilityReport.heritage_resource_id == HeritageResource.id
+        )
         
         
-        if not is_admin and user_id:
+        if with_role:
             query = query.join(
                 SustainabilityTeamMember,
                 SustainabilityReport.id == SustainabilityTeamMember.report_id
             ).filter(SustainabilityTeamMember.user_id == user_id)
         
         
-        if heritage_resource_ids:
+        if heritage_resource_ids is not None:
             query = query.filter(SustainabilityReport.heritage_resource_id.in_(heritage_resource_ids))
         
+        query = apply_text_search(query, db, [HeritageResource.name], heritage_resource_name, ranked=False)
+        
         if year:
             query = query.filter(SustainabilityReport.year == year)
         
         if state:
             query = query.filter(SustainabilityReport.state == state)
         
-        if search_term:
-            query = query.filter(
-                or_(
-                    SustainabilityReport.observation.ilike(f"%{search_term}%")                  
-                )
-            )
+        query = apply_text_search(query, db, [HeritageResource.name], search_term, ranked=False)
         
         
-        reports = query.all()
+        sort_column = REPORT_SORT_COLUMNS.get(sort_by, SustainabilityReport.year)
+        sort_column = sort_column.asc() if sort_order == 'asc' else sort_column.desc()
+        page_query = query.order_by(sort_column, SustainabilityReport.id.desc())
+
+        if limit is not None:
+            page_query = page_query.offset(offset).limit(min(limit, REPORT_SEARCH_MAX_LIMIT))
+        elif offset:
+            page_query = page_query.offset(offset)
+
+        rows = page_query.all()
         
         
         reports_with_roles = []
-        for report in reports:
-            report_with_role = SustainabilityReportWithRole.from_orm(report)
-            if not is_admin and user_id:
-                team_member = db.query(SustainabilityTeamMember).filter(
-                    SustainabilityTeamMember.report_id == report.id,
-                    SustainabilityTeamMember.user_id == user_id
-                ).first()
-                if team_member:
-                    report_with_role.user_role = UserReportRole(
-                        report_id=report.id,
-                        role=team_member.type,
-                        organization=team_member.organization
-                    )
+        for row in rows:
+            report_with_role = SustainabilityReportWithRole.from_orm(row[0])
+            report_with_role.heritage_resource_name = row[1]
+            if with_role:
+                report_with_role.user_role = UserReportRole(
+                    report_id=row[0].id,
+                    role=row[2],
+                    organization=row[3]
+                )
             reports_with_roles.append(report_with_role)
+
+        if limit is None and not offset:
+            total = len(reports_with_roles)
+        else:
+            total = query.with_entities(func.count()).order_by(None).scalar()
         
-        return reports_with_roles
+        return reports_with_roles, total
     except Exception as e:
         raise e
 
@@ -212,19 +244,44 @@ def get_all_report_templates(db: Session) -> List[tuple]:
     except Exception as e:
         raise e
 
+CATALOGUE_FIELDS = {'state', 'year', 'heritage_resource_id'}
+
 def update_report(db: Session, report_id: int, report: SustainabilityReportUpdate) -> Optional[SustainabilityReport]:
     """
     Actualiza una memoria.
     """
     try:
         db_report = get_report(db, report_id)
+        changes = report.dict(exclude_unset=True)
+        was_published = db_report is not None and db_report.state == 'Published'
         if db_report:
-            for key, value in report.dict(exclude_unset=True).items():
+            for key, value in changes.items():
                 setattr(db_report, key, value)
         db.commit()
         db.refresh(db_report)
+
+        if (was_published or db_report.state == 'Published') and CATALOGUE_FIELDS & changes.keys():
+            public_catalogue.invalidate_catalogue()
+        if 'survey_state' in changes:
+            survey_ingestion.invalidate_survey_state(report_id)
+        return db_report
+    except Exception as e:
+        raise e
+
+def publish_report(db: Session, report_id: int) -> Optional[SustainabilityReport]:
+    """
+    Marca una memoria como publicada y reconstruye el catálogo público.
+    """
+    try:
+        db_report = get_report(db, report_id)
+        if not db_report:
+            return None
+        db_report.state = 'Published'
+        db.commit()
+        public_catalogue.rebuild_catalogue(db)
         return db_report
     except Exception as e:
+        db.rollback()
         raise e
 
 def delete_report(db: Session, report_id: int) -> bool:
@@ -270,8 +327,14 @@ def delete_report(db: Session, report_id: int) -> bool:
         if report_dir.exists():
             shutil.rmtree(report_dir)
             
+        was_published = db_report.state == 'Published'
+        auth_context.invalidate_report_members(db, report_id)
         db.delete(db_report)
         db.commit()
+
+        if was_published:
+            public_catalogue.invalidate_catalogue()
+        survey_ingestion.invalidate_survey_state(report_id)
         return True
 
     except Exception as e:
@@ -319,9 +382,8 @@ def get_report_data(db: Session, report_id: int) -> Dict[str, Any]:
         ods = crud_ods.get_all_ods(db)
         goals = crud_goals.get_all_goals(db)
         action_secondary_impacts = crud_ods.get_all_action_secondary_impacts(db, report_id)
-        action_secondary_impacts_counts = crud_ods.get_all_action_secondary_impacts_counts(db, report_id)
-        primary_impacts = crud_action_plan.get_all_action_main_impacts(db, report_id)
-        dimension_totals, dimension_totals_list = get_dimension_totals(primary_impacts, action_secondary_impacts_counts, float(report.main_impact_weight), float(report.secondary_impact_weight))
+        main_weight, secondary_weight = impact_analytics.get_report_weights(report)
+        dimension_totals, dimension_totals_list = impact_analytics.get_dimension_totals(db, report_id, main_weight, secondary_weight)
         
         
         
@@ -413,65 +475,68 @@ def get_report_data(db: Session, report_id: int) -> Dict[str, Any]:
 def generate_report_html(db: Session, report_id: int) -> str:
     """
     Genera el HTML de una memoria de sostenibilidad.
+    Cada etapa se mide con una traza (ver app.services.tracing).
     """
     try: 
-        report_data = get_report_data(db, report_id)
-        matrix_data = create_materiality_matrix_data(db, report_id, scale=report_data['scale'])
-        def save_base64_image(data_url, path, base_dir=None, report_id=None):
-            
-            
-            
-            if report_id:
-                report_dir = settings.REPORTS_DIR / str(report_id)
-                if not os.path.exists(report_dir):
-                    os.makedirs(report_dir, exist_ok=True)
+        with tracing.trace("generate_report_html", log_threshold=settings.REPORT_TRACE_LOG_THRESHOLD, report_id=report_id):
+            with tracing.span("get_report_data"):
+                report_data = get_report_data(db, report_id)
+            with tracing.span("create_materiality_matrix_data"):
+                matrix_data = create_materiality_matrix_data(db, report_id, scale=report_data['scale'])
+            def save_base64_image(data_url, path, base_dir=None, report_id=None):
                 
-                filename = os.path.basename(path)
-                path = report_dir / filename
-            
-            header, encoded = data_url.split(',', 1)
-            dir_path = os.path.dirname(path)
-            if not os.path.exists(dir_path):
-                os.makedirs(dir_path, exist_ok=True)
-            with open(path, "wb") as f:
-                f.write(base64.b64decode(encoded))
-            
-            
-            if base_dir:
-                relative_path = str(path).replace(str(base_dir), '').replace('/', '\\')
-                if relative_path.startswith('\\'):
-                    relative_path = relative_path[1:]
-                return f"\\{base_dir.name}\\{relative_path}"
-            return str(path)
-
-        
-        matrix_img_b64 = generate_matrix_image(matrix_data, scale=report_data['scale'])
-        matrix_img_path = settings.REPORTS_DIR / f"{report_id}_materiality_matrix.png"
-        report_data['materiality_matrix'] = save_base64_image(matrix_img_b64, matrix_img_path, settings.STATIC_DIR, report_id)
-        report_data['legend'] = matrix_data
-
-        
-        main_impacts_img_b64 = get_main_impacts_material_topics_graph(report_data['material_topics'])
-        main_impacts_img_path = settings.REPORTS_DIR / f"{report_id}_main_impacts.png"
-        report_data['main_impacts_graph'] = save_base64_image(main_impacts_img_b64, main_impacts_img_path, settings.STATIC_DIR, report_id)
-
-        
-        secondary_impacts_img_b64 = get_secondary_impacts_material_topics_graph(report_data['secondary_impacts'])
-        secondary_impacts_img_path = settings.REPORTS_DIR / f"{report_id}_secondary_impacts.png"
-        report_data['secondary_impacts_graph'] = save_base64_image(secondary_impacts_img_b64, secondary_impacts_img_path, settings.STATIC_DIR, report_id)
-
-        
-        internal_consistency_img_b64, dimension_totals_list = generate_internal_consistency_graph(report_data['dimension_totals'])
-        internal_consistency_img_path = settings.REPORTS_DIR / f"{report_id}_internal_consistency.png"
-        report_data['internal_consistency_graph'] = save_base64_image(internal_consistency_img_b64, internal_consistency_img_path, settings.STATIC_DIR, report_id)
-        report_data['dimension_totals'] = dimension_totals_list
-        
-        
-        generator = ReportGenerator()
-        url_preview = generator.generate_report_preview(report_data)
-        url = generator.generate_report(report_data)
-        logger.info(f"URL: {url_preview}")
-        return url_preview
+                
+                
+                if report_id:
+                    report_dir = settings.REPORTS_DIR / str(report_id)
+                    if not os.path.exists(report_dir):
+                        os.makedirs(report_dir, exist_ok=True)
+                    
+                    filename = os.path.basename(path)
+                    path = report_dir / filename
+                
+                header, encoded = data_url.split(',', 1)
+                dir_path = os.path.dirname(path)
+                if not os.path.exists(dir_path):
+                    os.makedirs(dir_path, exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(base64.b64decode(encoded))
+                
+                
+                if base_dir:
+                    relative_path = str(path).replace(str(base_dir), '').replace('/', '\\')
+                    if relative_path.startswith('\\'):
+                        relative_path = relative_path[1:]
+                    return f"\\{base_dir.name}\\{relative_path}"
+                return str(path)
+
+            with tracing.span("graph:materiality_matrix"):
+                matrix_img_b64 = generate_matrix_image(matrix_data, scale=report_data['scale'])
+                matrix_img_path = settings.REPORTS_DIR / f"{report_id}_materiality_matrix.png"
+                report_data['materiality_matrix'] = save_base64_image(matrix_img_b64, matrix_img_path, settings.STATIC_DIR, report_id)
+                report_data['legend'] = matrix_data
+
+            with tracing.span("graph:main_impacts"):
+                main_impacts_img_b64 = get_main_impacts_material_topics_graph(report_data['material_topics'])
+                main_impacts_img_path = settings.REPORTS_DIR / f"{report_id}_main_impacts.png"
+                report_data['main_impacts_graph'] = save_base64_image(main_impacts_img_b64, main_impacts_img_path, settings.STATIC_DIR, report_id)
+
+            with tracing.span("graph:secondary_impacts"):
+                secondary_impacts_img_b64 = get_secondary_impacts_material_topics_graph(report_data['secondary_impacts'])
+                secondary_impacts_img_path = settings.REPORTS_DIR / f"{report_id}_secondary_impacts.png"
+                report_data['secondary_impacts_graph'] = save_base64_image(secondary_impacts_img_b64, secondary_impacts_img_path, settings.STATIC_DIR, report_id)
+
+            with tracing.span("graph:internal_consistency"):
+                internal_consistency_img_b64, dimension_totals_list = generate_internal_consistency_graph(report_data['dimension_totals'])
+                internal_consistency_img_path = settings.REPORTS_DIR / f"{report_id}_internal_consistency.png"
+                report_data['internal_consistency_graph'] = save_base64_image(internal_consistency_img_b64, internal_consistency_img_path, settings.STATIC_DIR, report_id)
+                report_data['dimension_totals'] = dimension_totals_list
+
+            generator = report_generator.ReportGenerator()
+            url_preview = generator.generate_report_preview(report_data)
+            url = generator.generate_report(report_data)
+            logger.info(f"URL: {url_preview}")
+            return url_preview
     except Exception as e:
         logger.error(f"Error al generar el HTML del reporte: {str(e)}")
         raise 
@@ -988,6 +1053,7 @@ def get_team_member(db: Session, user_id: int, report_id: int) -> Sustainability
 def transfer_report_data(db: Session, template_report_id: int, new_report_id: int) -> None:
     """
     Transfiere todos los datos de texto y tablas relacionadas de una memoria a otra.
+    La copia de las tablas se hace por conjuntos en una única transacción.
     """
     try:
         
@@ -1013,302 +1079,12 @@ def transfer_report_data(db: Session, template_report_id: int, new_report_id: in
             valor = getattr(template_report, attr)
             if valor not in [None, '']:
                 setattr(new_report, attr, valor)
-        
-        db.commit()
-        db.refresh(new_report)
-
-        
-        template_material_topics = db.query(MaterialTopic).filter(
-            MaterialTopic.report_id == template_report_id
-        ).all()
-
-        
-        material_topic_id_map = {}
-
-        for mt in template_material_topics:
-            new_mt = MaterialTopic(
-                report_id=new_report_id,
-                name=mt.name,
-                description=mt.description,
-                priority=mt.priority,
-                main_objective=mt.main_objective,
-                goal_ods_id=mt.goal_ods_id,
-                goal_number=mt.goal_number
-            )
-            db.add(new_mt)
-        
-        db.commit()
-
-        
-        new_material_topics = db.query(MaterialTopic).filter(
-            MaterialTopic.report_id == new_report_id
-        ).all()
-        
-        for old_mt, new_mt in zip(template_material_topics, new_material_topics):
-            material_topic_id_map[old_mt.id] = new_mt.id
-
-        
-        template_indicators = db.query(DiagnosisIndicator).filter(
-            DiagnosisIndicator.material_topic_id.in_(material_topic_id_map.keys())
-        ).all()
-
-        indicator_id_map = {}
-
-        for di in template_indicators:
-            new_di = DiagnosisIndicator(
-                name=di.name,
-                type=di.type,
-                material_topic_id=material_topic_id_map[di.material_topic_id]
-            )
-            db.add(new_di)
-        
-        db.commit()
-
-        
-        new_indicators = db.query(DiagnosisIndicator).filter(
-            DiagnosisIndicator.material_topic_id.in_(material_topic_id_map.values())
-        ).all()
-
-        for old_di, new_di in zip(template_indicators, new_indicators):
-            indicator_id_map[old_di.id] = new_di.id
-
-        
-        
-        template_quantitative = db.query(DiagnosisIndicatorQuantitative).filter(
-            DiagnosisIndicatorQuantitative.diagnosis_indicator_id.in_(indicator_id_map.keys())
-        ).all()
-
-        for diq in template_quantitative:
-            new_diq = DiagnosisIndicatorQuantitative(
-                diagnosis_indicator_id=indicator_id_map[diq.diagnosis_indicator_id],
-                numeric_response=diq.numeric_response,
-                unit=diq.unit
-            )
-            db.add(new_diq)
-
-        
-        template_qualitative = db.query(DiagnosisIndicatorQualitative).filter(
-            DiagnosisIndicatorQualitative.diagnosis_indicator_id.in_(indicator_id_map.keys())
-        ).all()
-
-        for diq in template_qualitative:
-            new_diq = DiagnosisIndicatorQualitative(
-                diagnosis_indicator_id=indicator_id_map[diq.diagnosis_indicator_id],
-                response=diq.response
-            )
-            db.add(new_diq)
-
-        db.commit()
-
-        
-        template_objectives = db.query(SpecificObjective).filter(
-            SpecificObjective.material_topic_id.in_(material_topic_id_map.keys())
-        ).all()
-
-        objective_id_map = {}
-
-        for so in template_objectives:
-            new_so = SpecificObjective(
-                description=so.description,
-                responsible=so.responsible,
-                material_topic_id=material_topic_id_map[so.material_topic_id]
-            )
-            db.add(new_so)
-
-        db.commit()
-
-        
-        new_objectives = db.query(SpecificObjective).filter(
-            SpecificObjective.material_topic_id.in_(material_topic_id_map.values())
-        ).all()
-
-        for old_so, new_so in zip(template_objectives, new_objectives):
-            objective_id_map[old_so.id] = new_so.id
-
-        
-        template_actions = db.query(Action).filter(
-            Action.specific_objective_id.in_(objective_id_map.keys())
-        ).all()
-
-        action_id_map = {}
-
-        for action in template_actions:
-            new_action = Action(
-                description=action.description,
-                difficulty=action.difficulty,
-                execution_time=action.execution_time,
-                ods_id=action.ods_id,
-                specific_objective_id=objective_id_map[action.specific_objective_id]
-            )
-            db.add(new_action)
-
-        db.commit()
-
-        
-        new_actions = db.query(Action).filter(
-            Action.specific_objective_id.in_(objective_id_map.values())
-        ).all()
-
-        for old_action, new_action in zip(template_actions, new_actions):
-            action_id_map[old_action.id] = new_action.id
-
-        
-        template_performance = db.query(PerformanceIndicator).filter(
-            PerformanceIndicator.action_id.in_(action_id_map.keys())
-        ).all()
-
-        performance_id_map = {}
-
-        for pi in template_performance:
-            new_pi = PerformanceIndicator(
-                name=pi.name,
-                human_resources=pi.human_resources,
-                material_resources=pi.material_resources,
-                type=pi.type,
-                action_id=action_id_map[pi.action_id]
-            )
-            db.add(new_pi)
-
-        db.commit()
-
-        
-        new_performance = db.query(PerformanceIndicator).filter(
-            PerformanceIndicator.action_id.in_(action_id_map.values())
-        ).all()
-
-        for old_pi, new_pi in zip(template_performance, new_performance):
-            performance_id_map[old_pi.id] = new_pi.id
-
-        
-        
-        template_quantitative = db.query(PerformanceIndicatorQuantitative).filter(
-            PerformanceIndicatorQuantitative.performance_indicator_id.in_(performance_id_map.keys())
-        ).all()
-
-        for piq in template_quantitative:
-            new_piq = PerformanceIndicatorQuantitative(
-                performance_indicator_id=performance_id_map[piq.performance_indicator_id],
-                numeric_response=piq.numeric_response,
-                unit=piq.unit
-            )
-            db.add(new_piq)
 
         
-        template_qualitative = db.query(PerformanceIndicatorQualitative).filter(
-            PerformanceIndicatorQualitative.performance_indicator_id.in_(performance_id_map.keys())
-        ).all()
-
-        for piq in template_qualitative:
-            new_piq = PerformanceIndicatorQualitative(
-                performance_indicator_id=performance_id_map[piq.performance_indicator_id],
-                response=piq.response
-            )
-            db.add(new_piq)
-
-        db.commit()
-
-        
-        template_secondary_ods = db.query(SecondaryODSAction).filter(
-            SecondaryODSAction.action_id.in_(action_id_map.keys())
-        ).all()
-
-        for soa in template_secondary_ods:
-            new_soa = SecondaryODSAction(
-                action_id=action_id_map[soa.action_id],
-                specific_objective_id=objective_id_map[soa.specific_objective_id],
-                ods_id=soa.ods_id
-            )
-            db.add(new_soa)
-
-        
-        template_secondary_mt = db.query(SecondaryODSMaterialTopic).filter(
-            SecondaryODSMaterialTopic.material_topic_id.in_(material_topic_id_map.keys())
-        ).all()
-
-        for somt in template_secondary_mt:
-            new_somt = SecondaryODSMaterialTopic(
-                material_topic_id=material_topic_id_map[somt.material_topic_id],
-                ods_id=somt.ods_id
-            )
-            db.add(new_somt)
-
-        
-        template_stakeholders = db.query(Stakeholder).filter(
-            Stakeholder.report_id == template_report_id
-        ).all()
-
-        stakeholder_id_map = {}
-
-        for stakeholder in template_stakeholders:
-            new_stakeholder = Stakeholder(
-                name=stakeholder.name,
-                description=stakeholder.description,
-                type=stakeholder.type,
-                report_id=new_report_id
-            )
-            db.add(new_stakeholder)
-
-        db.commit()
-
-        
-        new_stakeholders = db.query(Stakeholder).filter(
-            Stakeholder.report_id == new_report_id
-        ).all()
-
-        for old_st, new_st in zip(template_stakeholders, new_stakeholders):
-            stakeholder_id_map[old_st.id] = new_st.id
-
-        
-        template_agreements = db.query(ReportAgreementModel).filter(
-            ReportAgreementModel.report_id == template_report_id
-        ).all()
-
-        for agreement in template_agreements:
-            new_agreement = ReportAgreementModel(
-                report_id=new_report_id,
-                agreement=agreement.agreement
-            )
-            db.add(new_agreement)
-
-        
-        template_bibliographies = db.query(ReportBibliographyModel).filter(
-            ReportBibliographyModel.report_id == template_report_id
-        ).all()
-
-        for bibliography in template_bibliographies:
-            new_bibliography = ReportBibliographyModel(
-                report_id=new_report_id,
-                reference=bibliography.reference
-            )
-            db.add(new_bibliography)
-
-        
-        template_norms = db.query(ReportNormModel).filter(
-            ReportNormModel.report_id == template_report_id
-        ).all()
-
-        for norm in template_norms:
-            new_norm = ReportNormModel(
-                report_id=new_report_id,
-                norm=norm.norm
-            )
-            db.add(new_norm)
-
-        
-        template_team_members = db.query(SustainabilityTeamMember).filter(
-            SustainabilityTeamMember.report_id == template_report_id
-        ).all()
-
-        for member in template_team_members:
-            new_member = SustainabilityTeamMember(
-                report_id=new_report_id,
-                user_id=member.user_id,
-                type=member.type,
-                organization=member.organization
-            )
-            db.add(new_member)
+        clone_report_data(db, template_report_id, new_report_id)
 
         db.commit()
+        db.refresh(new_report)
 
     except Exception as e:
         db.rollback()
@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional, Dict, Any
 from app.models.models import HeritageResource, HeritageResourceTypology, HeritageResourceSocialNetwork, SustainabilityReport, SustainabilityTeamMember
 from datetime import datetime
+from app.services.search import apply_text_search
+from app.services import public_catalogue
 
 def create(db: Session, resource_data: Dict[str, Any]) -> HeritageResource:
     """
@@ -87,48 +89,29 @@ def search(
     name: Optional[str] = None,
     ownership: Optional[str] = None,
     management_model: Optional[str] = None,
-    postal_address: Optional[str] = None
+    postal_address: Optional[str] = None,
+    prefix: bool = False
 ) -> List[HeritageResource]:
     """
-    Busca recursos patrimoniales.
+    Busca recursos patrimoniales, ordenados por relevancia cuando hay índice FULLTEXT.
+    Con prefix=True el nombre se compara por prefijo sobre la clave sin tildes.
     """
     try:
         query = db.query(HeritageResource)
 
-        def normalize_text(text: str) -> Optional[str]:
-            if not text or text.isspace():
-                return None
-            return text.strip()
-
         
-        if search_term:
-            search = normalize_text(search_term)
-            if search:
-                search = f"%{search}%"
-                query = query.filter(
-                    HeritageResource.name.ilike(search) |
-                    HeritageResource.ownership.ilike(search) |
-                    HeritageResource.management_model.ilike(search) |
-                    HeritageResource.postal_address.ilike(search)
-                )
+        query = apply_text_search(query, db, [
+            HeritageResource.name,
+            HeritageResource.ownership,
+            HeritageResource.management_model,
+            HeritageResource.postal_address
+        ], search_term, prefix=prefix)
 
         
-        if name:
-            name_val = normalize_text(name)
-            if name_val:
-                query = query.filter(HeritageResource.name.ilike(f"%{name_val}%"))
-        if ownership:
-            ownership_val = normalize_text(ownership)
-            if ownership_val:
-                query = query.filter(HeritageResource.ownership.ilike(f"%{ownership_val}%"))
-        if management_model:
-            management_model_val = normalize_text(management_model)
-            if management_model_val:
-                query = query.filter(HeritageResource.management_model.ilike(f"%{management_model_val}%"))
-        if postal_address:
-            postal_address_val = normalize_text(postal_address)
-            if postal_address_val:
-                query = query.filter(HeritageResource.postal_address.ilike(f"%{postal_address_val}%"))
+        query = apply_text_search(query, db, [HeritageResource.name], name, prefix=prefix)
+        query = apply_text_search(query, db, [HeritageResource.ownership], ownership)
+        query = apply_text_search(query, db, [HeritageResource.management_model], management_model)
+        query = apply_text_search(query, db, [HeritageResource.postal_address], postal_address)
 
         return query.all()
     except Exception as e:
@@ -147,6 +130,8 @@ def update(
         if not db_resource:
             return None
 
+        previous_name = db_resource.name
+
         
         for field, value in resource_data.items():
             if field not in ["typology", "social_networks"] and value is not None:
@@ -183,6 +168,9 @@ def update(
 
         db.commit()
         db.refresh(db_resource)
+
+        if db_resource.name != previous_name:
+            public_catalogue.invalidate_catalogue()
         return db_resource
     except Exception as e:
         raise e
@@ -199,6 +187,7 @@ def delete(db: Session, resource_id: int) -> bool:
         
         db.delete(db_resource)
         db.commit()
+        public_catalogue.invalidate_catalogue()
         return True
     except Exception as e:
         raise e
@@ -1,7 +1,8 @@
 from typing import Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
 from app.models.models import Stakeholder
+from app.services.search import apply_text_search
+from app.crud import materiality_aggregates
 from app.schemas.stakeholders import StakeholderCreate, StakeholderUpdate
 
 
@@ -51,10 +52,13 @@ def update(db: Session, stakeholder: Stakeholder, stakeholder_data: StakeholderU
         if hasattr(stakeholder_data, 'dict'):
             stakeholder_data = stakeholder_data.dict(exclude_unset=True)
             
+        old_type = stakeholder.type
         for field, value in stakeholder_data.items():
             if hasattr(stakeholder, field):
                 setattr(stakeholder, field, value)
         
+        if stakeholder.type != old_type:
+            materiality_aggregates.move_stakeholder(db, stakeholder.id, old_type, stakeholder.type)
         db.add(stakeholder)
         db.commit()
         db.refresh(stakeholder)
@@ -67,6 +71,7 @@ def delete(db: Session, stakeholder: Stakeholder) -> None:
     Elimina un stakeholder.
     """
     try:
+        materiality_aggregates.remove_stakeholder(db, stakeholder.id, stakeholder.type)
         db.delete(stakeholder)
         db.commit()
     except Exception as e:
@@ -80,7 +85,7 @@ def search(
     report_id: Optional[int] = None
 ) -> tuple[List[Stakeholder], int]:
     """
-    Busca stakeholders.
+    Busca stakeholders, ordenados por relevancia cuando hay índice FULLTEXT.
     """
     try:
         query = db.query(Stakeholder)
@@ -88,17 +93,9 @@ def search(
         if report_id:
             query = query.filter(Stakeholder.report_id == report_id)
 
-        if search_term:
-            search = f"%{search_term}%"
-            query = query.filter(
-                or_(
-                    Stakeholder.name.ilike(search),
-                    Stakeholder.description.ilike(search)
-                )
-            )
+        query = apply_text_search(query, db, [Stakeholder.name, Stakeholder.description], search_term)
 
-        if name:
-            query = query.filter(Stakeholder.name.ilike(f"%{name}%"))
+        query = apply_text_search(query, db, [Stakeholder.name], name)
 
         if type:
             query = query.filter(Stakeholder.type == type)
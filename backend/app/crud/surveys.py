@@ -2,6 +2,8 @@ from typing import List, Optional, Dict, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from app.models.models import Assessment, SustainabilityReport, MaterialTopic, Stakeholder, HeritageResource
+from app.services.search import apply_text_search
+from app.services import survey_ingestion
 
 
 def create_assessments(
@@ -10,33 +12,41 @@ def create_assessments(
     assessments: List[Dict],
     report_id: int,
     scale: int
-) -> List[Assessment]:
+) -> List[Dict]:
     """
-    Crea las evaluaciones de una encuesta.
+    Crea las evaluaciones de una encuesta con un único INSERT de varias filas.
+    Devuelve las filas insertadas, con su id si el dialecto admite RETURNING.
     """
     try:
-        
-        report = db.query(SustainabilityReport).filter(SustainabilityReport.id == report_id).first()
-        if not report or report.survey_state != 'active':
-            raise ValueError("La encuesta no está activa")
-
-        created_assessments = []
-        for assessment_data in assessments:
-            
-            score = assessment_data['score']
-            if score < 1 or score > scale:
-                raise ValueError(f"Score {score} fuera del rango permitido [1,{scale}]")
-            
-            assessment = Assessment(
-                material_topic_id=assessment_data['material_topic_id'],
-                stakeholder_id=stakeholder_id,
-                score=score
-            )
-            db.add(assessment)
-            created_assessments.append(assessment)
-        
+        submission = survey_ingestion.build_submission(db, stakeholder_id, assessments, report_id, scale)
+        rows = list(submission.rows)
+        ids = survey_ingestion.insert_rows(db, rows, return_ids=True)
         db.commit()
-        return created_assessments
+        if ids is None:
+            return rows
+        return [{"id": assessment_id, **row} for assessment_id, row in zip(ids, rows)]
+    except Exception as e:
+        db.rollback()
+        raise e
+
+def enqueue_assessments(
+    db: Session,
+    stakeholder_id: int,
+    assessments: List[Dict],
+    report_id: int,
+    scale: int
+) -> int:
+    """
+    Valida las evaluaciones de una encuesta y las deja en la cola del escritor por lotes.
+    Devuelve el número de evaluaciones aceptadas.
+    """
+    try:
+        writer = survey_ingestion.get_writer()
+        if writer is None:
+            raise RuntimeError("La escritura por lotes de encuestas no está activa")
+        submission = survey_ingestion.build_submission(db, stakeholder_id, assessments, report_id, scale)
+        writer.submit(submission)
+        return len(submission.rows)
     except Exception as e:
         raise e
 
@@ -64,30 +74,12 @@ def search_surveys(
         )
 
         
-        if heritage_resource_name:
-            
-            resources = db.query(HeritageResource).filter(
-                HeritageResource.name.ilike(f"%{heritage_resource_name}%")
-            ).all()
-            if resources:
-                resource_ids = [r.id for r in resources]
-                query = query.filter(SustainabilityReport.heritage_resource_id.in_(resource_ids))
-            else:
-                return [], 0
+        query = apply_text_search(query, db, [HeritageResource.name], heritage_resource_name)
 
         if year:
             query = query.filter(SustainabilityReport.year == year)
 
-        if search_term:
-            
-            resources = db.query(HeritageResource).filter(
-                HeritageResource.name.ilike(f"%{search_term}%")
-            ).all()
-            if resources:
-                resource_ids = [r.id for r in resources]
-                query = query.filter(SustainabilityReport.heritage_resource_id.in_(resource_ids))
-            else:
-                return [], 0
+        query = apply_text_search(query, db, [HeritageResource.name], search_term)
 
         return query.all()
 
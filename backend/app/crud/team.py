@@ -1,15 +1,28 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, func
 from app.models.models import HeritageResource, SustainabilityReport, SustainabilityTeamMember, User
-from app.schemas.team import TeamMemberSearch, TeamMemberCreate
+from app.schemas.team import TeamMemberSearch, TeamMemberCreate, TeamMemberList
+from app.services.search import apply_text_search, build_text_search
+from app.services import auth_context
+from app.utils.text_normalization import fold_text
+
+
+TEAM_SEARCH_MAX_LIMIT = 100
+
+TEAM_ROLE_LABELS = {
+    'manager': 'Gestor de Sostenibilidad',
+    'consultant': 'Consultor',
+    'external_advisor': 'Asesor Externo'
+}
 
 def search_available_users(
     db: Session,
     search_term: Optional[str] = None,
     name: Optional[str] = None,
     surname: Optional[str] = None,
-    email: Optional[str] = None
+    email: Optional[str] = None,
+    prefix: bool = False
 ) -> List[User]:
     """
     Busca usuarios disponibles para agregar a un equipo.
@@ -17,93 +30,107 @@ def search_available_users(
     try:
         query = db.query(User).filter(User.admin == False)
 
-        def normalize_text(text: str) -> Optional[str]:
-            if not text or text.isspace():
-                return None
-            return text.strip()
-
-        if search_term:
-            search = normalize_text(search_term)
-            if search:
-                search = f"%{search}%"
-                query = query.filter(
-                    User.name.ilike(search) |
-                    User.surname.ilike(search) |
-                    User.email.ilike(search)
-                )
-        if name:
-            name_val = normalize_text(name)
-            if name_val:
-                query = query.filter(User.name.ilike(f"%{name_val}%"))
-        if surname:
-            surname_val = normalize_text(surname)
-            if surname_val:
-                query = query.filter(User.surname.ilike(f"%{surname_val}%"))
-        if email:
-            email_val = normalize_text(email)
-            if email_val:
-                query = query.filter(User.email.ilike(f"%{email_val}%"))
+        query = apply_text_search(query, db, [User.name, User.surname, User.email], search_term, prefix=prefix)
+        query = apply_text_search(query, db, [User.name], name, prefix=prefix)
+        query = apply_text_search(query, db, [User.surname], surname, prefix=prefix)
+        query = apply_text_search(query, db, [User.email], email, prefix=prefix)
 
         return query.all()
     except Exception as e:
         raise e
 
+def _matching_roles(term: Optional[str]) -> Optional[List[str]]:
+    """
+    Tipos de miembro cuyo código o nombre visible contiene el término (sin tildes
+    ni mayúsculas). None si no hay término.
+    """
+    folded = fold_text(term)
+    if not folded:
+        return None
+    return [
+        member_type for member_type, label in TEAM_ROLE_LABELS.items()
+        if folded in member_type or folded in fold_text(label)
+    ]
+
 def search_team_members(
     db: Session,
     report_id: int,
     search_params: TeamMemberSearch
-) -> dict:
+) -> Tuple[List[TeamMemberList], int]:
     """
     Busca miembros del equipo de una memoria con filtros opcionales.
+    Retorna una tupla con la página de miembros y el total de resultados.
+
+    Miembro y datos de usuario se obtienen en una sola consulta (join con users)
+    y todos los filtros se aplican en SQL; el total se calcula con COUNT(*) solo
+    cuando se pagina.
     """
     try:
-        query = db.query(SustainabilityTeamMember).filter(SustainabilityTeamMember.report_id == report_id)
-
-        def normalize_text(text: str) -> str:
-            if not text or text.isspace():
-                return None
-            return text.strip()
-
-        if search_params.search_term:
-            search = normalize_text(search_params.search_term)
-            if search:
-                search = f"%{search}%"
-                query = query.filter(
-                    or_(
-                        SustainabilityTeamMember.name.ilike(search),
-                        SustainabilityTeamMember.surname.ilike(search),
-                        SustainabilityTeamMember.email.ilike(search),
-                        SustainabilityTeamMember.role.ilike(search),
-                        SustainabilityTeamMember.organization.ilike(search)
-                    )
-                )
-
-        if search_params.name:
-            name = normalize_text(search_params.name)
-            if name:
-                query = query.filter(SustainabilityTeamMember.name.ilike(f"%{name}%"))
-
-        if search_params.surname:
-            surname = normalize_text(search_params.surname)
-            if surname:
-                query = query.filter(SustainabilityTeamMember.surname.ilike(f"%{surname}%"))
-
-        if search_params.email:
-            email = normalize_text(search_params.email)
-            if email:
-                query = query.filter(SustainabilityTeamMember.email.ilike(f"%{email}%"))
-
-        if search_params.role:
-            role = normalize_text(search_params.role)
-            if role:
-                query = query.filter(SustainabilityTeamMember.role.ilike(f"%{role}%"))
-
-        if search_params.organization:
-            organization = normalize_text(search_params.organization)
-            if organization:
-                query = query.filter(SustainabilityTeamMember.organization.ilike(f"%{organization}%"))
-
-        return query.all()
+        prefix = search_params.prefix
+        query = db.query(
+            SustainabilityTeamMember.id,
+            User.name,
+            User.surname,
+            User.email,
+            User.phone_number,
+            SustainabilityTeamMember.type,
+            SustainabilityTeamMember.organization,
+            SustainabilityTeamMember.report_id,
+            SustainabilityTeamMember.user_id
+        ).join(
+            User, SustainabilityTeamMember.user_id == User.id
+        ).filter(SustainabilityTeamMember.report_id == report_id)
+
+        search = build_text_search(
+            db,
+            [User.name, User.surname, User.email, SustainabilityTeamMember.organization],
+            search_params.search_term,
+            prefix=prefix
+        )
+        if search is not None:
+            roles = _matching_roles(search_params.search_term)
+            if roles:
+                query = query.filter(or_(search.condition, SustainabilityTeamMember.type.in_(roles)))
+            else:
+                query = query.filter(search.condition)
+
+        query = apply_text_search(query, db, [User.name], search_params.name, ranked=False, prefix=prefix)
+        query = apply_text_search(query, db, [User.surname], search_params.surname, ranked=False, prefix=prefix)
+        query = apply_text_search(query, db, [User.email], search_params.email, ranked=False, prefix=prefix)
+        query = apply_text_search(query, db, [SustainabilityTeamMember.organization], search_params.organization, ranked=False, prefix=prefix)
+
+        roles = _matching_roles(search_params.role)
+        if roles is not None:
+            query = query.filter(SustainabilityTeamMember.type.in_(roles))
+
+        page_query = query.order_by(SustainabilityTeamMember.id)
+        limit, offset = search_params.limit, search_params.offset
+        if limit is not None:
+            page_query = page_query.offset(offset).limit(min(limit, TEAM_SEARCH_MAX_LIMIT))
+        elif offset:
+            page_query = page_query.offset(offset)
+
+        members = [
+            TeamMemberList(
+                id=row.id,
+                name=row.name,
+                surname=row.surname,
+                email=row.email,
+                phone_number=row.phone_number,
+                role=TEAM_ROLE_LABELS.get(row.type, row.type),
+                organization=row.organization,
+                report_id=row.report_id,
+                user_id=row.user_id
+            )
+            for row in page_query.all()
+        ]
+
+        if limit is None and not offset:
+            total = len(members)
+        else:
+            total = query.with_entities(func.count()).order_by(None).scalar()
+
+        return members, total
     except Exception as e:
         raise e
 
@@ -134,6 +161,7 @@ def create_team_member(
 
         db.add(team_member)
         db.commit()
+        auth_context.invalidate_user(team_member_data.user_id)
         db.refresh(team_member)
         return team_member
     except Exception as e:
@@ -160,6 +188,7 @@ def update_team_member(
         db.add(member)
         db.commit()
         db.refresh(member)
+        auth_context.invalidate_user(member.user_id)
         return member
     except Exception as e:
         raise e
@@ -177,9 +206,10 @@ def delete_team_member(
         if not member:
             raise ValueError("Miembro del equipo no encontrado")
 
-        
+        user_id = member.user_id
         db.delete(member)
         db.commit()
+        auth_context.invalidate_user(user_id)
     except Exception as e:
         raise e
 
@@ -4,10 +4,14 @@ from app.services.security import verify_password
 from app.models.models import User
 from app.schemas.user import UserCreate
 from app.services.security import get_password_hash
+from app.services.search import apply_text_search
+from app.services import auth_context
 from datetime import datetime, timedelta
 import secrets
 import logging
 
+logger = logging.getLogger(__name__)
+
 
 def authenticate(db: Session, *, email: str, password: str) -> Optional[User]:
     """
@@ -23,16 +27,12 @@ def authenticate(db: Session, *, email: str, password: str) -> Optional[User]:
     except Exception as e:
         raise e
 
-import logging
-
-logger = logging.getLogger(__name__)
-
 def get_by_email(db: Session, *, email: str) -> Optional[User]:
     """
     Obtiene un usuario por email.
     """
     try:    
-        logger.info(f"Buscando usuario por email: {email}")
+        logger.debug(f"Buscando usuario por email: {email}")
         
         query = db.query(User).filter(User.email == email)
            
@@ -90,6 +90,7 @@ def update(db: Session, user: User, user_data: dict) -> User:
         
         db.add(user)
         db.commit()
+        auth_context.invalidate_user(user.id)
         db.refresh(user)
         return user
     except Exception as e:
@@ -100,8 +101,10 @@ def delete(db: Session, user: User) -> None:
     Elimina un usuario de la base de datos.
     """
     try:
+        user_id = user.id
         db.delete(user)
         db.commit()
+        auth_context.invalidate_user(user_id)
     except Exception as e:
         raise e 
 
@@ -111,43 +114,23 @@ def search(
     name: Optional[str] = None,
     surname: Optional[str] = None,
     email: Optional[str] = None,
-    is_admin: Optional[bool] = None
+    is_admin: Optional[bool] = None,
+    prefix: bool = False
 ) -> List[User]:
     """
-    Busca usuarios con filtros opcionales.
+    Busca usuarios con filtros opcionales, ordenados por relevancia cuando hay índice FULLTEXT.
+    Con prefix=True nombre, apellidos y email se comparan por prefijo sobre la clave sin tildes.
     """
     try:
         query = db.query(User)
 
-        def normalize_text(text: str) -> Optional[str]:
-            if not text or text.isspace():
-                return None
-            return text.strip()
-
-        
-        if search_term:
-            search = normalize_text(search_term)
-            if search:
-                search = f"%{search}%"
-                query = query.filter(
-                    User.name.ilike(search) |
-                    User.surname.ilike(search) |
-                    User.email.ilike(search)
-                )
-
-        
-        if name:
-            name_val = normalize_text(name)
-            if name_val:
-                query = query.filter(User.name.ilike(f"%{name_val}%"))
-        if surname:
-            surname_val = normalize_text(surname)
-            if surname_val:
-                query = query.filter(User.surname.ilike(f"%{surname_val}%"))
-        if email:
-            email_val = normalize_text(email)
-            if email_val:
-                query = query.filter(User.email.ilike(f"%{email_val}%"))
+        
+        query = apply_text_search(query, db, [User.name, User.surname, User.email], search_term, prefix=prefix)
+
+        
+        query = apply_text_search(query, db, [User.name], name, prefix=prefix)
+        query = apply_text_search(query, db, [User.surname], surname, prefix=prefix)
+        query = apply_text_search(query, db, [User.email], email, prefix=prefix)
         if is_admin is not None:
             query = query.filter(User.admin == is_admin)
 
@@ -155,6 +138,19 @@ def search(
     except Exception as e:
         raise e
 
+def set_password_hash(db: Session, user: User, hashed_password: str) -> None:
+    """
+    Sustituye el hash de la contraseña (por ejemplo, al cambiar el coste de bcrypt).
+    """
+    try:
+        user.password = hashed_password
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    except Exception as e:
+        db.rollback()
+        raise e
+
 def change_password(db: Session, user_id: int, old_password: str, new_password: str) -> Optional[User]:
     """
     Cambia la contraseña de un usuario.
@@ -168,13 +164,14 @@ def change_password(db: Session, user_id: int, old_password: str, new_password:
         user.password = get_password_hash(new_password)
         db.add(user)
         db.commit()
+        auth_context.invalidate_user(user.id)
         db.refresh(user)
         return user 
     except Exception as e:
-        print("Error al cambiar la contraseña: ", e)
+        logger.error(f"Error al cambiar la contraseña: {str(e)}")
         raise e
 
-async def generate_change_password_token(db: Session, email: str) -> str:
+def generate_change_password_token(db: Session, email: str) -> str:
     """
     Genera un token de cambio de contraseña.
     """
@@ -230,6 +227,7 @@ def reset_password(db: Session, token: str, new_password: str) -> User:
         user.reset_expires = None
         
         db.commit()
+        auth_context.invalidate_user(user.id)
         db.refresh(user)
         return user
     except Exception as e:
@@ -0,0 +1,87 @@
+"""
+Pool de conexiones instrumentado.
+
+`InstrumentedQueuePool` es un QueuePool que cuenta las peticiones de conexión, el
+tiempo que cada una espera a obtenerla (incluida la apertura de conexiones nuevas
+del overflow) y los agotamientos de `pool_timeout`. `pool_stats` combina esos
+contadores con el estado actual del pool.
+"""
+import logging
+import threading
+import time
+from typing import Dict
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+
+# SQLAlchemy nombra el logger del pool según el módulo de su clase; se mantiene
+# el mismo nivel que tenía sqlalchemy.pool (solo avisos).
+logging.getLogger(__name__).setLevel(logging.WARNING)
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, wait: float, timed_out: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_total,
+                "wait_seconds_max": self.wait_max,
+                "wait_seconds_avg": self.wait_total / self.checkouts if self.checkouts else 0.0
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que registra el tiempo de espera de cada checkout.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.stats.record(time.perf_counter() - started, timed_out)
+
+
+def pool_stats(engine: Engine) -> Dict[str, object]:
+    """
+    Estado del pool de un engine: tamaño, conexiones prestadas y libres, overflow
+    en uso y, si está instrumentado, checkouts, timeouts y tiempos de espera.
+    """
+    pool = engine.pool
+    stats: Dict[str, object] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow())
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.stats.snapshot())
+    return stats
@@ -1,8 +1,27 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
-from app.config import settings
+"""
+Conexión a la base de datos.
+
+El engine se crea en el primer uso (`get_engine`), no al importar el módulo: así
+Alembic, los scripts y los benchmarks pueden importar la aplicación sin una base
+de datos MySQL disponible. Los diagnósticos de conexión (`check_database_connection`)
+se ejecutan al arrancar el servidor y en el endpoint /health.
+
+El tamaño del pool se configura en Settings (DB_POOL_SIZE, DB_MAX_OVERFLOW...).
+Si DATABASE_REPLICA_URL está definida, `ReadSessionLocal` abre sesiones sobre un
+segundo engine de solo lectura; si no, usa el principal. Para probarlo en local
+basta con apuntar DATABASE_REPLICA_URL a la misma base de datos que DATABASE_URL:
+las lecturas irán por un pool propio.
+"""
 import logging
+import threading
+import time
+from typing import Dict
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.orm import Session, sessionmaker
+from app.config import settings
+from app.db.pool import InstrumentedQueuePool, pool_stats
 
 
 logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
@@ -12,38 +31,167 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-logger.info("Configuración de la base de datos:")
-logger.info(f"URL: {settings.DATABASE_URL}")
+_engines: Dict[str, Engine] = {}
+_engine_lock = threading.Lock()
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+
+
+def _set_read_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("SET SESSION TRANSACTION READ ONLY")
+    cursor.close()
+
+
+def _create_engine(database_url: str, pool_size: int, max_overflow: int, read_only: bool = False) -> Engine:
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        # Solo para pruebas y benchmarks.
+        if url.database in (None, "", ":memory:"):
+            return create_engine(url, connect_args={"check_same_thread": False}, echo=False)
+        return create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=InstrumentedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            echo=False
+        )
+
+    engine = create_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        poolclass=InstrumentedQueuePool,
+        echo=False
+    )
+    if read_only and engine.dialect.name == "mysql":
+        # Una escritura enviada por error a la réplica falla en lugar de divergir.
+        event.listen(engine, "connect", _set_read_only)
+    return engine
+
+
+def get_engine() -> Engine:
+    """
+    Devuelve el engine de la aplicación, creándolo en la primera llamada.
+    Crear el engine no abre ninguna conexión.
+    """
+    engine = _engines.get("primary")
+    if engine is None:
+        with _engine_lock:
+            engine = _engines.get("primary")
+            if engine is None:
+                if not settings.DATABASE_URL:
+                    raise RuntimeError("DATABASE_URL no está configurada")
+                engine = _create_engine(
+                    str(settings.DATABASE_URL),
+                    pool_size=settings.DB_POOL_SIZE,
+                    max_overflow=settings.DB_MAX_OVERFLOW
+                )
+                _engines["primary"] = engine
+    return engine
+
+
+def has_read_replica() -> bool:
+    return bool(settings.DATABASE_REPLICA_URL)
 
 
+def get_read_engine() -> Engine:
+    """
+    Engine de solo lectura (DATABASE_REPLICA_URL) o, si no hay réplica, el principal.
+    """
+    if not has_read_replica():
+        return get_engine()
+    engine = _engines.get("replica")
+    if engine is None:
+        with _engine_lock:
+            engine = _engines.get("replica")
+            if engine is None:
+                engine = _create_engine(
+                    str(settings.DATABASE_REPLICA_URL),
+                    pool_size=settings.DB_REPLICA_POOL_SIZE,
+                    max_overflow=settings.DB_REPLICA_MAX_OVERFLOW,
+                    read_only=True
+                )
+                _engines["replica"] = engine
+    return engine
 
-engine = create_engine(
-    str(settings.DATABASE_URL),
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=1800,  
-    pool_pre_ping=True,  
-    poolclass=QueuePool,
-    echo=False  
-)
 
-try:
-    
+def SessionLocal(**kwargs) -> Session:
+    """
+    Abre una sesión sobre el engine de la aplicación.
+    """
+    return _session_factory(bind=get_engine(), **kwargs)
+
+
+def ReadSessionLocal(**kwargs) -> Session:
+    """
+    Abre una sesión para consultas de solo lectura (réplica si está configurada).
+    Puede ir por detrás del principal: no usar para leer lo que se acaba de escribir.
+    """
+    return _session_factory(bind=get_read_engine(), **kwargs)
+
+
+def dispose_engine() -> None:
+    """
+    Cierra las conexiones de los pools y descarta los engines.
+    """
+    with _engine_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+def get_pool_stats() -> Dict[str, Dict[str, object]]:
+    """
+    Estado de los pools de los engines ya creados (principal y réplica).
+    """
+    return {name: pool_stats(engine) for name, engine in list(_engines.items())}
+
+
+def check_database_connection() -> Dict[str, object]:
+    """
+    Abre una conexión y devuelve el servidor, la versión, el número de tablas y la
+    latencia de la comprobación. Lanza la excepción del driver si no hay conexión.
+    """
+    engine = get_engine()
+    started = time.perf_counter()
     with engine.connect() as connection:
-        version = connection.execute(text("SELECT VERSION()")).scalar()
-        logger.info(f"Conexión exitosa a MySQL versión: {version}")
-        logger.info(f"Base de datos: {settings.MYSQL_DB}")
-        logger.info(f"Servidor: {settings.MYSQL_SERVER}:{settings.MYSQL_PORT}")
-        
-        
-        tables = connection.execute(text("SHOW TABLES")).fetchall()
-        logger.info("Tablas en la base de datos:")
-        for table in tables:
-            logger.info(f"   - {table[0]}")
-            
-except Exception as e:
-    logger.error(f"Error al conectar a la base de datos: {str(e)}")
-    raise
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+        version = connection.dialect.server_version_info
+        tables = inspect(connection).get_table_names()
+    return {
+        "dialect": engine.dialect.name,
+        "server": f"{engine.url.host}:{engine.url.port}" if engine.url.host else None,
+        "database": engine.url.database,
+        "version": ".".join(str(part) for part in version) if version else None,
+        "tables": len(tables),
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+def log_database_diagnostics() -> bool:
+    """
+    Registra el resultado de `check_database_connection` al arrancar el servidor.
+    Devuelve False si no se pudo conectar.
+    """
+    try:
+        info = check_database_connection()
+    except Exception as e:
+        logger.error(f"Error al conectar a la base de datos: {str(e)}")
+        return False
+    location = "/".join(part for part in (info["server"], info["database"]) if part)
+    logger.info(
+        f"Conexión exitosa a {info['dialect']} versión {info['version']} "
+        f"({location}, {info['tables']} tablas, {info['latency_ms']} ms)"
+    )
+    return True
+
+
+def __getattr__(name: str):
+    # Compatibilidad con `from app.db.session import engine`.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
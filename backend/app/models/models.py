@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Enum, Text, DECIMAL, ForeignKey, Boolean, ForeignKeyConstraint, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Enum, Text, DECIMAL, ForeignKey, Boolean, ForeignKeyConstraint, DateTime, Index
+from sqlalchemy.orm import relationship, validates
 from app.db.base_class import Base
+from app.utils.text_normalization import fold_text
 
 class User(Base):
     __tablename__ = "users"
@@ -18,6 +19,20 @@ class User(Base):
     reset_token_expiration = Column(DateTime, nullable=True)
     reset_token_state = Column(Boolean, nullable=False, default=False)
 
+    
+    name_search = Column(String(100), nullable=True, index=True)
+    surname_search = Column(String(255), nullable=True, index=True)
+    email_search = Column(String(255), nullable=True, index=True)
+
+    __table_args__ = (
+        Index('ft_users_search', 'name', 'surname', 'email', mysql_prefix='FULLTEXT'),
+    )
+
+    @validates('name', 'surname', 'email')
+    def _update_search_key(self, key, value):
+        setattr(self, f"{key}_search", fold_text(value))
+        return value
+
 class Dimension(Base):
     __tablename__ = "dimensions"
 
@@ -50,11 +65,24 @@ class HeritageResource(Base):
     postal_address = Column(String(255), nullable=True)
     web_address = Column(String(255), nullable=True)
     phone_number = Column(String(255), nullable=True)
+
+    
+    name_search = Column(String(255), nullable=True, index=True)
     
     
     typologies = relationship("HeritageResourceTypology", back_populates="resource", cascade="all, delete-orphan")
     social_networks = relationship("HeritageResourceSocialNetwork", back_populates="resource", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('ft_heritage_resources_search', 'name', 'ownership', 'management_model', 'postal_address', mysql_prefix='FULLTEXT'),
+        Index('ft_heritage_resources_name', 'name', mysql_prefix='FULLTEXT'),
+    )
+
+    @validates('name')
+    def _update_search_key(self, key, value):
+        self.name_search = fold_text(value)
+        return value
+
 class HeritageResourceTypology(Base):
     __tablename__ = "heritage_resource_typologies"
 
@@ -166,6 +194,11 @@ class Stakeholder(Base):
     type = Column(Enum('internal', 'external', name='stakeholder_type'), nullable=False)
     report_id = Column(Integer, ForeignKey("sustainability_reports.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
 
+    __table_args__ = (
+        Index('ft_stakeholders_search', 'name', 'description', mysql_prefix='FULLTEXT'),
+        Index('ft_stakeholders_name', 'name', mysql_prefix='FULLTEXT'),
+    )
+
 class MaterialTopic(Base):
     __tablename__ = "material_topics"
 
@@ -178,6 +211,9 @@ class MaterialTopic(Base):
     goal_number = Column(String(2), nullable=True)
     report_id = Column(Integer, ForeignKey("sustainability_reports.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
 
+    
+    name_search = Column(String(255), nullable=True, index=True)
+
     __table_args__ = (
         ForeignKeyConstraint(
             ['goal_ods_id', 'goal_number'],
@@ -185,8 +221,15 @@ class MaterialTopic(Base):
             ondelete="CASCADE",
             onupdate="CASCADE"
         ),
+        Index('ft_material_topics_search', 'name', 'description', mysql_prefix='FULLTEXT'),
+        Index('ft_material_topics_name', 'name', mysql_prefix='FULLTEXT'),
     )
 
+    @validates('name')
+    def _update_search_key(self, key, value):
+        self.name_search = fold_text(value)
+        return value
+
 class SecondaryODSMaterialTopic(Base):
     __tablename__ = "secondary_ods_material_topics"
 
@@ -201,6 +244,19 @@ class Assessment(Base):
     material_topic_id = Column(Integer, ForeignKey("material_topics.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
     stakeholder_id = Column(Integer, ForeignKey("stakeholders.id", ondelete="CASCADE", onupdate="CASCADE"), nullable=False)
 
+class MaterialityAggregate(Base):
+    """
+    Acumulados de las valoraciones por asunto y tipo de grupo de interés
+    (n, suma y suma de cuadrados), mantenidos al insertar o eliminar valoraciones.
+    """
+    __tablename__ = "materiality_aggregates"
+
+    material_topic_id = Column(Integer, ForeignKey("material_topics.id", ondelete="CASCADE", onupdate="CASCADE"), primary_key=True)
+    stakeholder_type = Column(Enum('internal', 'external', name='stakeholder_type'), primary_key=True)
+    assessment_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(BigInteger, nullable=False, default=0)
+    score_sum_sq = Column(BigInteger, nullable=False, default=0)
+
 class DiagnosisIndicator(Base):
     __tablename__ = "diagnosis_indicators"
 
@@ -1,6 +1,7 @@
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from enum import Enum
+from app.schemas.search import TEXT_SEARCH_DESCRIPTION
 
 class PriorityLevel(str, Enum):
     HIGH = "high"
@@ -36,8 +37,8 @@ class MaterialTopic(MaterialTopicBase):
         from_attributes = True
 
 class MaterialTopicSearch(BaseModel):
-    search_term: Optional[str] = None
-    name: Optional[str] = None
+    search_term: Optional[str] = Field(default=None, description=TEXT_SEARCH_DESCRIPTION)
+    name: Optional[str] = Field(default=None, description=TEXT_SEARCH_DESCRIPTION)
     report_id: Optional[int] = None
 
     class Config:
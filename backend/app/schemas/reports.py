@@ -1,7 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal
 from decimal import Decimal
 from datetime import datetime
+from app.schemas.search import TEXT_SEARCH_DESCRIPTION
 
 class ReportNormBase(BaseModel):
     norm: str
@@ -174,8 +175,19 @@ class UserRoleResponse(BaseModel):
     role: str 
 
 class ReportSearch(BaseModel):
-    search_term: Optional[str] = None
-    heritage_resource_name: Optional[str] = None
+    search_term: Optional[str] = Field(default=None, description=TEXT_SEARCH_DESCRIPTION)
+    heritage_resource_name: Optional[str] = Field(default=None, description=TEXT_SEARCH_DESCRIPTION)
     year: Optional[int] = None
     state: Optional[str] = None
+    limit: Optional[int] = Field(default=None, ge=1)
+    offset: int = Field(default=0, ge=0)
+    sort_by: Literal['year', 'state', 'heritage_resource_name', 'id'] = 'year'
+    sort_order: Literal['asc', 'desc'] = 'desc'
+
+class PublicReportSearch(ReportSearch):
+    # El catálogo público se filtra en memoria (subcadena del nombre del recurso) y
+    # solo contiene memorias publicadas: no se ordena por estado.
+    search_term: Optional[str] = Field(default=None, description="Subcadena del nombre del recurso, sin distinguir mayúsculas ni tildes.")
+    heritage_resource_name: Optional[str] = Field(default=None, description="Subcadena del nombre del recurso, sin distinguir mayúsculas ni tildes.")
+    sort_by: Literal['year', 'heritage_resource_name', 'id'] = 'year'
 
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, Field, EmailStr
 from typing import List, Optional
 from datetime import datetime
+from app.schemas.search import TEXT_SEARCH_DESCRIPTION
 
 class SocialNetworkBase(BaseModel):
     network: str
@@ -36,11 +37,12 @@ class HeritageResource(HeritageResourceBase):
         from_attributes = True
 
 class ResourceSearch(BaseModel):
-    search_term: Optional[str] = None
-    name: Optional[str] = None
+    search_term: Optional[str] = Field(default=None, description=TEXT_SEARCH_DESCRIPTION)
+    name: Optional[str] = Field(default=None, description=TEXT_SEARCH_DESCRIPTION)
     ownership: Optional[str] = None
     management_model: Optional[str] = None
     postal_address: Optional[str] = None 
+    prefix: bool = False
 
 
 
@@ -0,0 +1,11 @@
+"""
+Descripción común de los campos de búsqueda de texto (ver app/services/search.py).
+"""
+
+TEXT_SEARCH_DESCRIPTION = (
+    "Texto a buscar, sin distinguir mayúsculas ni tildes. En MySQL se resuelve con "
+    "el índice FULLTEXT: cada palabra debe ser el comienzo de una palabra del texto "
+    "(\"cord\" encuentra \"Córdoba\", \"doba\" no). Con otros motores, o si alguna "
+    "palabra tiene menos de 3 letras, se busca como subcadena. Con prefix=True, si "
+    "todas las columnas tienen clave normalizada, se buscan valores que empiecen por el texto."
+)
@@ -1,6 +1,7 @@
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from enum import Enum
+from app.schemas.search import TEXT_SEARCH_DESCRIPTION
 
 class StakeholderType(str, Enum):
     INTERNAL = "internal"
@@ -29,8 +30,8 @@ class Stakeholder(StakeholderBase):
         from_attributes = True
 
 class StakeholderSearch(BaseModel):
-    search_term: Optional[str] = None
-    name: Optional[str] = None
+    search_term: Optional[str] = Field(default=None, description=TEXT_SEARCH_DESCRIPTION)
+    name: Optional[str] = Field(default=None, description=TEXT_SEARCH_DESCRIPTION)
     type: Optional[StakeholderType] = None
     report_id: Optional[int] = None
 
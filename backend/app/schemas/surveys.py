@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, validator
 from typing import List, Optional, Union
+from app.schemas.search import TEXT_SEARCH_DESCRIPTION
 
 
 class AssessmentBase(BaseModel):
@@ -29,8 +30,8 @@ class MultipleAssessmentsCreate(BaseModel):
     scale: int
 
 class SurveySearch(BaseModel):
-    search_term: Optional[str] = None
-    heritage_resource_name: Optional[str] = None
+    search_term: Optional[str] = Field(default=None, description=TEXT_SEARCH_DESCRIPTION)
+    heritage_resource_name: Optional[str] = Field(default=None, description=TEXT_SEARCH_DESCRIPTION)
     year: Optional[Union[str, int]] = None
 
 class Survey(BaseModel):
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class TeamMemberBase(BaseModel):
     id: int
@@ -19,6 +19,9 @@ class TeamMemberSearch(BaseModel):
     email: Optional[str] = None
     role: Optional[str] = None
     organization: Optional[str] = None
+    prefix: bool = False
+    limit: Optional[int] = Field(default=None, ge=1)
+    offset: int = Field(default=0, ge=0)
 
 
 class TeamMemberCreateParams(BaseModel):
@@ -1,5 +1,6 @@
 from typing import Optional
-from pydantic import BaseModel, EmailStr, constr
+from pydantic import BaseModel, Field, EmailStr, constr
+from app.schemas.search import TEXT_SEARCH_DESCRIPTION
 
 class UserBase(BaseModel):
     email: Optional[EmailStr] = None
@@ -25,11 +26,12 @@ class UserInDB(UserInDBBase):
     password: str 
 
 class UserSearch(BaseModel):
-    search_term: Optional[str] = None
+    search_term: Optional[str] = Field(default=None, description=TEXT_SEARCH_DESCRIPTION)
     name: Optional[str] = None
     surname: Optional[str] = None
     email: Optional[str] = None
     is_admin: Optional[bool] = None
+    prefix: bool = False
 
     class Config:
         json_schema_extra = {
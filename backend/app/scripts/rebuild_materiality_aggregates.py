@@ -0,0 +1,31 @@
+"""
+Recalcula la tabla materiality_aggregates a partir de las valoraciones.
+
+Los acumulados se mantienen al guardar encuestas y al modificar o eliminar grupos
+de interés; este comando los vuelve a sincronizar (por ejemplo, tras cargar una
+copia de seguridad o editar valoraciones a mano).
+
+Uso:
+    python -m app.scripts.rebuild_materiality_aggregates [--report-id 12]
+"""
+import argparse
+from app.crud.materiality_aggregates import rebuild_materiality_aggregates
+from app.db.session import SessionLocal
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--report-id", type=int, default=None, help="Memoria a recalcular (por defecto, todas)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_materiality_aggregates(db, args.report_id)
+        scope = f"la memoria {args.report_id}" if args.report_id is not None else "todas las memorias"
+        print(f"Acumulados de materialidad recalculados para {scope}: {rows} filas")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
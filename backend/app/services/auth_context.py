@@ -0,0 +1,109 @@
+"""
+Contexto de autenticación cacheado.
+
+Para cada sujeto del token (email) se guarda durante AUTH_CONTEXT_TTL segundos el
+id del usuario, si es administrador y su rol en cada memoria, leídos con una sola
+consulta. Así `get_current_user` y `PermissionResolver` no consultan la base
+de datos en cada petición. Se invalida al modificar o eliminar el usuario, al
+cambiar su contraseña y al cambiar su pertenencia a equipos.
+"""
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional
+from sqlalchemy.orm import Session
+from app.config import Settings
+from app.models.models import SustainabilityTeamMember, User
+from app.services.cache import TTLCache
+
+settings = Settings()
+
+_cache = TTLCache(ttl=settings.AUTH_CONTEXT_TTL, maxsize=settings.AUTH_CONTEXT_MAXSIZE, shared="auth_context")
+_subjects: Dict[int, str] = {}
+_subjects_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class AuthContext:
+    user_id: int
+    email: str
+    admin: bool
+    roles: Mapping[int, str]
+
+
+def load_auth_context(db: Session, email: str) -> Optional[AuthContext]:
+    """
+    Lee el usuario y sus roles por memoria (join externo con los equipos).
+    """
+    rows = db.query(
+        User.id, User.admin, SustainabilityTeamMember.report_id, SustainabilityTeamMember.type
+    ).outerjoin(
+        SustainabilityTeamMember, SustainabilityTeamMember.user_id == User.id
+    ).filter(User.email == email).all()
+    if not rows:
+        return None
+
+    roles = {report_id: member_type for _, _, report_id, member_type in rows if report_id is not None}
+    return AuthContext(
+        user_id=rows[0].id,
+        email=email,
+        admin=bool(rows[0].admin),
+        roles=MappingProxyType(roles)
+    )
+
+
+def get_auth_context(db: Session, email: str) -> Optional[AuthContext]:
+    """
+    Devuelve el contexto del sujeto, cargándolo si no está en caché.
+    Los usuarios inexistentes no se cachean.
+    """
+    def load() -> Optional[AuthContext]:
+        context = load_auth_context(db, email)
+        if context is not None:
+            with _subjects_lock:
+                _subjects[context.user_id] = email
+        return context
+
+    return _cache.get_or_set(email, load, store_none=False)
+
+
+def get_cached_context(user_id: int) -> Optional[AuthContext]:
+    """
+    Contexto cacheado del usuario por id, si lo hay (no consulta la base de datos).
+    """
+    with _subjects_lock:
+        email = _subjects.get(user_id)
+    if email is None:
+        return None
+    context = _cache.get(email)
+    if context is None or context.user_id != user_id:
+        return None
+    return context
+
+
+def invalidate_user(user_id: int) -> None:
+    """
+    Descarta el contexto de un usuario.
+    """
+    with _subjects_lock:
+        email = _subjects.pop(user_id, None)
+    # Aunque no esté cacheado, invalidar incrementa la versión de la caché y evita
+    # que se guarde un contexto que se estuviera leyendo en ese momento.
+    _cache.invalidate(email if email is not None else ("user", user_id))
+
+
+def invalidate_users(user_ids: Iterable[int]) -> None:
+    for user_id in set(user_ids):
+        invalidate_user(user_id)
+
+
+def invalidate_report_members(db: Session, report_id: int) -> None:
+    """
+    Descarta el contexto de los miembros del equipo de una memoria.
+    """
+    invalidate_users(
+        user_id for (user_id,) in db.query(SustainabilityTeamMember.user_id).filter(
+            SustainabilityTeamMember.report_id == report_id
+        )
+    )
+
@@ -0,0 +1,215 @@
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: las cachés quedan locales al proceso
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+class SharedGeneration:
+    """
+    Contador compartido por todos los procesos de la máquina (los workers de
+    gunicorn): un entero de 8 bytes en un fichero mapeado en memoria. Leerlo no
+    hace ninguna llamada al sistema; incrementarlo toma un bloqueo del fichero.
+    Si el fichero no se puede crear, el contador queda local al proceso.
+    """
+
+    _FORMAT = "Q"
+
+    def __init__(self, name: str, directory: Optional[Path] = None):
+        self.path = Path(directory or settings.CACHE_SYNC_DIR) / f"{name}.gen"
+        self._map: Optional[mmap.mmap] = None
+        self._fd: Optional[int] = None
+        self._local = 0
+        self._lock = threading.Lock()
+        self._opened = False
+
+    def _open(self) -> None:
+        with self._lock:
+            if self._opened:
+                return
+            self._opened = True
+            if fcntl is None:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    if os.fstat(fd).st_size < struct.calcsize(self._FORMAT):
+                        os.ftruncate(fd, struct.calcsize(self._FORMAT))
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                self._map = mmap.mmap(fd, struct.calcsize(self._FORMAT))
+                self._fd = fd
+            except OSError as e:
+                logger.warning(f"Invalidación de caché entre procesos no disponible ({self.path}): {e}")
+
+    def value(self) -> int:
+        if not self._opened:
+            self._open()
+        if self._map is None:
+            return self._local
+        return struct.unpack_from(self._FORMAT, self._map, 0)[0]
+
+    def bump(self) -> int:
+        """
+        Incrementa el contador y devuelve el nuevo valor.
+        """
+        if not self._opened:
+            self._open()
+        if self._map is None:
+            with self._lock:
+                self._local += 1
+                return self._local
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            value = struct.unpack_from(self._FORMAT, self._map, 0)[0] + 1
+            struct.pack_into(self._FORMAT, self._map, 0, value)
+            return value
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+
+class TTLCache:
+    """
+    Caché en memoria del proceso con caducidad por entrada, segura entre hilos.
+
+    Cada invalidación incrementa `version`; un valor calculado mientras se
+    invalidaba la caché no se guarda, para no reintroducir datos obsoletos.
+
+    Con `shared` (un nombre), las invalidaciones se propagan al resto de procesos
+    de la máquina mediante un SharedGeneration: cuando otro proceso invalida,
+    este vacía su copia entera en el siguiente acceso.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024, shared: Optional[str] = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.version = 0
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.RLock()
+        # Clave -> [bloqueo, hilos que lo usan]; se borra al salir el último.
+        self._build_locks: Dict[Hashable, list] = {}
+        self._generation = SharedGeneration(shared) if shared else None
+        self._seen_generation: Optional[int] = None
+
+    def _sync(self) -> None:
+        # Llamar con self._lock tomado.
+        if self._generation is None:
+            return
+        generation = self._generation.value()
+        if generation != self._seen_generation:
+            if self._seen_generation is not None:
+                self._data.clear()
+                self.version += 1
+            self._seen_generation = generation
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Devuelve el valor de la clave si existe y no ha caducado.
+        """
+        with self._lock:
+            self._sync()
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Guarda un valor con la caducidad indicada (por defecto la de la caché).
+        """
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._evict()
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+
+    def get_or_set(
+        self,
+        key: Hashable,
+        factory: Callable[[], Any],
+        ttl: Optional[float] = None,
+        store_none: bool = True,
+        on_store: Optional[Callable[[Any], None]] = None
+    ) -> Any:
+        """
+        Devuelve el valor cacheado o lo calcula con `factory`.
+        Solo un hilo calcula cada clave; el resto espera y reutiliza el resultado.
+        Con store_none=False un resultado None no se guarda. `on_store` se llama
+        con el valor solo si se guarda (no hubo invalidaciones durante el cálculo),
+        con la caché bloqueada para que ninguna invalidación se intercale.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            build_entry = self._build_locks.setdefault(key, [threading.Lock(), 0])
+            build_entry[1] += 1
+
+        try:
+            with build_entry[0]:
+                value = self.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+                version = self.version
+                value = factory()
+                with self._lock:
+                    self._sync()
+                    if version == self.version and (store_none or value is not None):
+                        self.set(key, value, ttl)
+                        if on_store is not None:
+                            on_store(value)
+                return value
+        finally:
+            with self._lock:
+                build_entry[1] -= 1
+                if build_entry[1] == 0:
+                    del self._build_locks[key]
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Elimina una clave o, si no se indica, todo el contenido.
+        """
+        with self._lock:
+            self._sync()
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+            self.version += 1
+            if self._generation is not None:
+                generation = self._generation.bump()
+                if generation != self._seen_generation + 1:
+                    # Otro proceso invalidó entretanto: no se puede saber qué.
+                    self._data.clear()
+                self._seen_generation = generation
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at < now]
+        for key in expired:
+            del self._data[key]
+        if len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
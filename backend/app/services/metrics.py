@@ -0,0 +1,348 @@
+"""
+Métricas de la aplicación en formato Prometheus.
+
+`RequestMetricsMiddleware` (app/api/middleware.py) registra por ruta (la plantilla,
+p. ej. /api/reports/get/{report_id}) el número de peticiones por código, la
+latencia, el tamaño de la respuesta y las consultas SQL que ha lanzado y su
+tiempo. Las consultas se atribuyen a la petición mediante un ContextVar, que
+FastAPI propaga a los endpoints síncronos ejecutados en el pool de hilos.
+
+Con varios workers de gunicorn cada proceso guarda periódicamente su estado en
+METRICS_DIR y /metrics suma los de todos; los ficheros de workers ya terminados
+se acumulan en `archived.json` para que los contadores no retrocedan.
+"""
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+Labels = Tuple[str, ...]
+
+
+@dataclass
+class RequestStats:
+    """
+    Consultas SQL de la petición en curso.
+    """
+    queries: int = 0
+    query_seconds: float = 0.0
+
+
+_current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("metrics_request", default=None)
+
+
+def start_request() -> Tuple[RequestStats, contextvars.Token]:
+    stats = RequestStats()
+    return stats, _current_request.set(stats)
+
+
+def end_request(token: contextvars.Token) -> None:
+    _current_request.reset(token)
+
+
+def current_request() -> Optional[RequestStats]:
+    return _current_request.get()
+
+
+class MetricsRegistry:
+    """
+    Contadores e histogramas con etiquetas, seguros entre hilos y serializables
+    para combinarlos entre procesos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, List[float]]] = {}
+        self.buckets: Dict[str, Sequence[float]] = {}
+        self.in_flight = 0
+
+    def inc(self, name: str, labels: Labels, value: float = 1.0) -> None:
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0.0) + value
+
+    def observe(self, name: str, labels: Labels, value: float, buckets: Sequence[float]) -> None:
+        """
+        Registra una observación. Cada serie guarda [cuenta por bucket..., +Inf, suma].
+        """
+        with self._lock:
+            self.buckets.setdefault(name, buckets)
+            series = self.histograms.setdefault(name, {})
+            data = series.get(labels)
+            if data is None:
+                data = series[labels] = [0.0] * (len(buckets) + 2)
+            data[bisect.bisect_left(buckets, value)] += 1
+            data[-1] += value
+
+    def add_in_flight(self, delta: int) -> None:
+        with self._lock:
+            self.in_flight += delta
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "in_flight": self.in_flight,
+                "counters": {name: [[list(labels), value] for labels, value in series.items()] for name, series in self.counters.items()},
+                "histograms": {name: [[list(labels), list(data)] for labels, data in series.items()] for name, series in self.histograms.items()},
+                "buckets": {name: list(buckets) for name, buckets in self.buckets.items()}
+            }
+
+
+registry = MetricsRegistry()
+
+
+# -- Consultas SQL ---------------------------------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_request.get() is not None:
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_request.get()
+    if stats is None:
+        return
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    stats.queries += 1
+    stats.query_seconds += time.perf_counter() - starts.pop()
+
+
+_sql_hooks_installed = False
+
+
+def install_sql_hooks() -> None:
+    """
+    Registra los eventos de SQLAlchemy en todos los engines (una sola vez).
+    """
+    global _sql_hooks_installed
+    if _sql_hooks_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _sql_hooks_installed = True
+
+
+# -- Registro de peticiones -----------------------------------------------------
+
+def record_request(method: str, route: str, status: int, seconds: float, response_bytes: int, stats: RequestStats) -> None:
+    registry.inc("http_requests_total", (method, route, str(status)))
+    registry.observe("http_request_duration_seconds", (method, route), seconds, LATENCY_BUCKETS)
+    registry.observe("http_response_size_bytes", (method, route), response_bytes, SIZE_BUCKETS)
+    registry.observe("db_queries_per_request", (method, route), stats.queries, QUERY_COUNT_BUCKETS)
+    registry.observe("db_query_duration_seconds_per_request", (method, route), stats.query_seconds, LATENCY_BUCKETS)
+    maybe_write_snapshot()
+
+
+# -- Varios procesos ----------------------------------------------------------------
+
+_last_snapshot = 0.0
+# El pid puede reutilizarse tras reciclar un worker: el nombre del fichero lleva
+# también el instante de arranque del proceso.
+_snapshot_name = f"{os.getpid()}_{int(time.time() * 1000)}.json"
+
+
+def _metrics_dir() -> Path:
+    return Path(settings.METRICS_DIR)
+
+
+def _snapshot_pid(path: Path) -> Optional[int]:
+    pid, _, started = path.stem.partition("_")
+    return int(pid) if pid.isdigit() and started.isdigit() else None
+
+
+def write_snapshot() -> None:
+    """
+    Guarda el estado de este proceso en METRICS_DIR/<pid>_<arranque>.json.
+    """
+    global _last_snapshot
+    _last_snapshot = time.monotonic()
+    directory = _metrics_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / _snapshot_name
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(registry.snapshot()), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError:
+        pass
+
+
+def maybe_write_snapshot() -> None:
+    if settings.METRICS_MULTIPROCESS and time.monotonic() - _last_snapshot >= settings.METRICS_SNAPSHOT_INTERVAL:
+        write_snapshot()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge(target: Dict[str, object], snapshot: Dict[str, object], include_gauges: bool) -> None:
+    for name, series in snapshot["counters"].items():
+        merged = target["counters"].setdefault(name, {})
+        for labels, value in series:
+            merged[tuple(labels)] = merged.get(tuple(labels), 0.0) + value
+    for name, series in snapshot["histograms"].items():
+        merged = target["histograms"].setdefault(name, {})
+        for labels, data in series:
+            current = merged.get(tuple(labels))
+            merged[tuple(labels)] = data if current is None else [a + b for a, b in zip(current, data)]
+    target["buckets"].update(snapshot["buckets"])
+    if include_gauges:
+        target["in_flight"] += snapshot["in_flight"]
+
+
+def _to_snapshot(merged: Dict[str, object]) -> Dict[str, object]:
+    return {
+        "pid": 0,
+        "in_flight": 0,
+        "counters": {name: [[list(labels), value] for labels, value in series.items()] for name, series in merged["counters"].items()},
+        "histograms": {name: [[list(labels), data] for labels, data in series.items()] for name, series in merged["histograms"].items()},
+        "buckets": merged["buckets"]
+    }
+
+
+def collect() -> Dict[str, object]:
+    """
+    Estado combinado: este proceso, los demás workers vivos y los ya terminados.
+    Con un solo worker es simplemente el registro en memoria.
+    """
+    merged = {"counters": {}, "histograms": {}, "buckets": {}, "in_flight": 0}
+    _merge(merged, registry.snapshot(), include_gauges=True)
+    if not settings.METRICS_MULTIPROCESS:
+        return merged
+
+    directory = _metrics_dir()
+    if not directory.is_dir():
+        return merged
+
+    lock_file = open(directory / ".lock", "a+") if fcntl is not None else None
+    try:
+        if lock_file is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        archived_path = directory / "archived.json"
+        archived = {"counters": {}, "histograms": {}, "buckets": {}, "in_flight": 0}
+        if archived_path.exists():
+            _merge(archived, json.loads(archived_path.read_text(encoding="utf-8")), include_gauges=False)
+
+        dead = []
+        for path in directory.glob("*_*.json"):
+            pid = _snapshot_pid(path)
+            if pid is None or path.name == _snapshot_name:
+                continue
+            try:
+                snapshot = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if _pid_alive(pid):
+                _merge(merged, snapshot, include_gauges=True)
+            else:
+                _merge(archived, snapshot, include_gauges=False)
+                dead.append(path)
+
+        if dead:
+            tmp_path = archived_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(_to_snapshot(archived)), encoding="utf-8")
+            tmp_path.replace(archived_path)
+            for path in dead:
+                path.unlink(missing_ok=True)
+        _merge(merged, _to_snapshot(archived), include_gauges=False)
+    finally:
+        if lock_file is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+    return merged
+
+
+# -- Exposición --------------------------------------------------------------------
+
+HELP = {
+    "http_requests_total": ("counter", "Peticiones HTTP atendidas por método, ruta y código"),
+    "http_request_duration_seconds": ("histogram", "Latencia de las peticiones HTTP"),
+    "http_response_size_bytes": ("histogram", "Tamaño del cuerpo de las respuestas"),
+    "db_queries_per_request": ("histogram", "Consultas SQL lanzadas por petición"),
+    "db_query_duration_seconds_per_request": ("histogram", "Tiempo total en consultas SQL por petición"),
+    "report_stage_duration_seconds": ("histogram", "Tiempo por etapa de la generación de informes")
+}
+
+LABEL_NAMES = {
+    "http_requests_total": ("method", "route", "status"),
+    "report_stage_duration_seconds": ("stage",)
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus() -> str:
+    """
+    Texto de exposición de Prometheus (versión 0.0.4).
+    """
+    data = collect()
+    lines = [
+        "# HELP http_requests_in_flight Peticiones HTTP en curso",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {data['in_flight']}"
+    ]
+
+    for name, series in sorted(data["counters"].items()):
+        kind, text = HELP.get(name, ("counter", name))
+        label_names = LABEL_NAMES.get(name, ("method", "route"))
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+        for labels, value in sorted(series.items()):
+            lines.append(f"{name}{_labels(label_names, labels)} {_format_number(value)}")
+
+    for name, series in sorted(data["histograms"].items()):
+        kind, text = HELP.get(name, ("histogram", name))
+        label_names = LABEL_NAMES.get(name, ("method", "route"))
+        buckets = data["buckets"][name]
+        lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+        for labels, values in sorted(series.items()):
+            cumulative = 0.0
+            for bound, count in zip(list(buckets) + ["+Inf"], values[:-1]):
+                cumulative += count
+                le = 'le="+Inf"' if bound == "+Inf" else f'le="{_format_number(bound)}"'
+                lines.append(f"{name}_bucket{_labels(label_names, labels, le)} {_format_number(cumulative)}")
+            lines.append(f"{name}_sum{_labels(label_names, labels)} {_format_number(values[-1])}")
+            lines.append(f"{name}_count{_labels(label_names, labels)} {_format_number(cumulative)}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,147 @@
+"""
+Resolución de permisos por petición.
+
+`PermissionResolver` carga una sola vez por petición el mapa {report_id: rol} del
+usuario (desde el contexto de autenticación cacheado) y responde a todas las
+comprobaciones de la petición sin más consultas. Las entidades hijas (asuntos,
+indicadores, objetivos, acciones...) se asocian a su memoria mediante un índice
+de pertenencia cacheado: una entidad nunca cambia de memoria, así que la entrada
+solo caduca por tamaño o tiempo.
+"""
+from typing import Callable, Dict, Mapping, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config import Settings
+from app.models.models import (
+    MaterialTopic,
+    DiagnosisIndicator,
+    SpecificObjective,
+    Action,
+    PerformanceIndicator,
+    Stakeholder
+)
+from app.schemas.auth import TokenData
+from app.services import auth_context
+from app.services.cache import TTLCache
+
+settings = Settings()
+
+_ownership_cache = TTLCache(ttl=settings.OWNERSHIP_CACHE_TTL, maxsize=settings.OWNERSHIP_CACHE_MAXSIZE)
+
+
+def _material_topic(entity_id: int):
+    return select(MaterialTopic.report_id).where(MaterialTopic.id == entity_id)
+
+
+def _diagnosis_indicator(entity_id: int):
+    return select(MaterialTopic.report_id)\
+        .join(DiagnosisIndicator, DiagnosisIndicator.material_topic_id == MaterialTopic.id)\
+        .where(DiagnosisIndicator.id == entity_id)
+
+
+def _specific_objective(entity_id: int):
+    return select(MaterialTopic.report_id)\
+        .join(SpecificObjective, SpecificObjective.material_topic_id == MaterialTopic.id)\
+        .where(SpecificObjective.id == entity_id)
+
+
+def _action(entity_id: int):
+    return select(MaterialTopic.report_id)\
+        .join(SpecificObjective, SpecificObjective.material_topic_id == MaterialTopic.id)\
+        .join(Action, Action.specific_objective_id == SpecificObjective.id)\
+        .where(Action.id == entity_id)
+
+
+def _performance_indicator(entity_id: int):
+    return select(MaterialTopic.report_id)\
+        .join(SpecificObjective, SpecificObjective.material_topic_id == MaterialTopic.id)\
+        .join(Action, Action.specific_objective_id == SpecificObjective.id)\
+        .join(PerformanceIndicator, PerformanceIndicator.action_id == Action.id)\
+        .where(PerformanceIndicator.id == entity_id)
+
+
+def _stakeholder(entity_id: int):
+    return select(Stakeholder.report_id).where(Stakeholder.id == entity_id)
+
+
+OWNERSHIP_QUERIES: Dict[str, Callable[[int], object]] = {
+    "material_topic": _material_topic,
+    "diagnosis_indicator": _diagnosis_indicator,
+    "specific_objective": _specific_objective,
+    "action": _action,
+    "performance_indicator": _performance_indicator,
+    "stakeholder": _stakeholder
+}
+
+
+def resolve_report_id(db: Session, entity: str, entity_id: int) -> Optional[int]:
+    """
+    Memoria a la que pertenece una entidad hija (None si la entidad no existe).
+    """
+    build_query = OWNERSHIP_QUERIES[entity]
+    return _ownership_cache.get_or_set(
+        (entity, entity_id),
+        lambda: db.execute(build_query(entity_id)).scalar(),
+        store_none=False
+    )
+
+
+class PermissionResolver:
+    """
+    Permisos del usuario actual para la duración de una petición.
+    """
+
+    def __init__(self, db: Session, current_user: TokenData):
+        self.db = db
+        self.current_user = current_user
+        self._roles: Optional[Mapping[int, str]] = None
+
+    @property
+    def is_admin(self) -> bool:
+        return bool(self.current_user.admin)
+
+    @property
+    def roles(self) -> Mapping[int, str]:
+        """
+        Mapa {report_id: rol} del usuario, cargado en el primer uso.
+        """
+        if self._roles is None:
+            context = auth_context.get_cached_context(self.current_user.id)
+            if context is None and self.current_user.email:
+                context = auth_context.get_auth_context(self.db, self.current_user.email)
+            self._roles = context.roles if context is not None else {}
+        return self._roles
+
+    def role(self, report_id: int) -> Optional[str]:
+        return self.roles.get(report_id)
+
+    def check(self, report_id: Optional[int], require_manager: bool = False) -> Tuple[bool, str]:
+        """
+        Comprueba que el usuario tiene rol en la memoria (gestor si `require_manager`).
+        Los administradores siempre tienen acceso.
+        """
+        if self.is_admin:
+            return True, ""
+
+        member_type = self.role(report_id) if report_id is not None else None
+        if not member_type:
+            return False, "No tienes permisos para acceder a este recurso"
+
+        if require_manager and member_type != 'manager':
+            return False, "Solo los gestores pueden realizar esta acción"
+
+        return True, ""
+
+    def report_id_for(self, entity: str, entity_id: int) -> Optional[int]:
+        return resolve_report_id(self.db, entity, entity_id)
+
+    def check_entity(self, entity: str, entity_id: int, require_manager: bool = False) -> Tuple[Optional[int], bool, str]:
+        """
+        Resuelve la memoria de una entidad hija y comprueba el permiso sobre ella.
+        Devuelve (report_id, tiene_permiso, mensaje); report_id es None si la entidad no existe.
+        """
+        report_id = self.report_id_for(entity, entity_id)
+        if report_id is None:
+            return None, self.is_admin, "" if self.is_admin else "No tienes permisos para acceder a este recurso"
+        has_permission, error_message = self.check(report_id, require_manager)
+        return report_id, has_permission, error_message
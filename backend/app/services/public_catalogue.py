@@ -0,0 +1,199 @@
+"""
+Catálogo de memorias publicadas.
+
+El listado público se construye con una única consulta y se guarda en memoria
+(con caducidad PUBLIC_CATALOGUE_TTL). Se reconstruye al publicar una memoria y se
+invalida cuando cambia el estado, se elimina una memoria o se modifica un recurso.
+Si PUBLIC_CATALOGUE_SNAPSHOT indica un fichero, el catálogo se persiste en JSON y
+se reutiliza al arrancar mientras no haya caducado.
+"""
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import Settings
+from app.db.session import SessionLocal, has_read_replica
+from app.models.models import SustainabilityReport, HeritageResource
+from app.services.cache import TTLCache
+from app.utils.text_normalization import normalize_text, fold_text
+
+settings = Settings()
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE_KEY = "public_reports"
+
+SORT_FIELDS = {
+    "year": "year",
+    "heritage_resource_name": "resource_name",
+    "id": "report_id"
+}
+
+_cache = TTLCache(ttl=settings.PUBLIC_CATALOGUE_TTL, maxsize=1, shared="public_catalogue")
+
+
+@dataclass(frozen=True)
+class Catalogue:
+    items: Tuple[Dict[str, Any], ...]
+    search_keys: Tuple[str, ...]
+    etag: str
+    built_at: float
+    from_snapshot: bool = field(default=False, compare=False)
+
+
+def _make_catalogue(items: List[Dict[str, Any]], built_at: float, from_snapshot: bool = False) -> Catalogue:
+    payload = json.dumps(items, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return Catalogue(
+        items=tuple(items),
+        search_keys=tuple(fold_text(item["resource_name"]) or "" for item in items),
+        etag=hashlib.sha1(payload).hexdigest(),
+        built_at=built_at,
+        from_snapshot=from_snapshot
+    )
+
+
+def build_catalogue(db: Session) -> Catalogue:
+    """
+    Consulta las memorias publicadas junto con el nombre de su recurso.
+    """
+    rows = db.query(
+        SustainabilityReport.id,
+        SustainabilityReport.year,
+        HeritageResource.id,
+        HeritageResource.name
+    ).join(
+        HeritageResource, SustainabilityReport.heritage_resource_id == HeritageResource.id
+    ).filter(
+        SustainabilityReport.state == 'Published'
+    ).order_by(
+        SustainabilityReport.year.desc(), HeritageResource.name, SustainabilityReport.id
+    ).all()
+
+    items = [
+        {
+            "resource_id": resource_id,
+            "resource_name": resource_name,
+            "year": year,
+            "report_id": report_id
+        } for report_id, year, resource_id, resource_name in rows
+    ]
+    return _make_catalogue(items, time.time())
+
+
+def _snapshot_path() -> Optional[Path]:
+    return Path(settings.PUBLIC_CATALOGUE_SNAPSHOT) if settings.PUBLIC_CATALOGUE_SNAPSHOT else None
+
+
+def _save_snapshot(catalogue: Catalogue) -> None:
+    """
+    Persiste el catálogo. Se llama desde la caché solo cuando acepta el valor, así
+    que un catálogo construido mientras se invalidaba nunca llega al disco.
+    """
+    path = _snapshot_path()
+    if path is None or catalogue.from_snapshot:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps({"built_at": catalogue.built_at, "items": list(catalogue.items)}), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError as e:
+        logger.warning(f"No se pudo guardar el catálogo público: {e}")
+
+
+def _load_snapshot() -> Optional[Catalogue]:
+    path = _snapshot_path()
+    if path is None or not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if time.time() - data["built_at"] > settings.PUBLIC_CATALOGUE_TTL:
+            return None
+        return _make_catalogue(data["items"], data["built_at"], from_snapshot=True)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"No se pudo leer el catálogo público: {e}")
+        return None
+
+
+def _build_from_primary(db: Session) -> Catalogue:
+    """
+    Construye el catálogo siempre contra la base principal: si se leyera de una
+    réplica con retraso tras publicar, la versión anterior quedaría cacheada
+    durante todo el TTL sin otra invalidación que la corrija.
+    """
+    if not has_read_replica():
+        return build_catalogue(db)
+    primary_db = SessionLocal()
+    try:
+        return build_catalogue(primary_db)
+    finally:
+        primary_db.close()
+
+
+def get_catalogue(db: Session) -> Catalogue:
+    """
+    Devuelve el catálogo cacheado, construyéndolo si es necesario.
+    """
+    return _cache.get_or_set(
+        CATALOGUE_KEY,
+        lambda: _load_snapshot() or _build_from_primary(db),
+        on_store=_save_snapshot
+    )
+
+
+def rebuild_catalogue(db: Session) -> Catalogue:
+    """
+    Reconstruye el catálogo tras publicar una memoria.
+    """
+    invalidate_catalogue()
+    return get_catalogue(db)
+
+
+def invalidate_catalogue() -> None:
+    """
+    Descarta el catálogo en memoria y el persistido.
+    """
+    _cache.invalidate()
+    path = _snapshot_path()
+    if path is not None:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"No se pudo eliminar el catálogo público: {e}")
+
+
+def search_catalogue(
+    catalogue: Catalogue,
+    search_term: Optional[str] = None,
+    heritage_resource_name: Optional[str] = None,
+    year: Optional[int] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    sort_by: str = "year",
+    sort_order: str = "desc"
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Filtra, ordena y pagina el catálogo en memoria.
+    La comparación por nombre de recurso no distingue mayúsculas ni tildes.
+    """
+    terms = [fold_text(term) for term in (normalize_text(search_term), normalize_text(heritage_resource_name)) if term]
+
+    items = [
+        item for item, key in zip(catalogue.items, catalogue.search_keys)
+        if all(term in key for term in terms) and (not year or item["year"] == year)
+    ]
+
+    field = SORT_FIELDS.get(sort_by, "year")
+    if not (field == "year" and sort_order == "desc"):
+        items.sort(key=lambda item: (item[field], item["report_id"]), reverse=sort_order == "desc")
+
+    total = len(items)
+    if limit is not None:
+        items = items[offset:offset + limit]
+    elif offset:
+        items = items[offset:]
+    return items, total
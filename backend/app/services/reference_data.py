@@ -0,0 +1,133 @@
+"""
+Registro en memoria de los datos de referencia: dimensiones, ODS y metas.
+
+Son datos estáticos de la semilla, así que se cargan una sola vez (al arrancar o
+en el primer uso) en estructuras inmutables indexadas por ods_id y por
+(ods_id, goal_number). `reload_reference_data` vuelve a leerlos si cambian.
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, asdict
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.models.models import Dimension, ODS, Goal
+
+
+DIMENSION_ODS = {
+    "Persona": (1, 2, 3, 4, 5),
+    "Planeta": (6, 12, 13, 14, 15),
+    "Prosperidad": (7, 8, 9, 10, 11),
+    "Paz": (16,),
+    "Alianzas": (17,)
+}
+
+
+@dataclass(frozen=True)
+class DimensionRef:
+    id: int
+    name: str
+    description: Optional[str]
+
+
+@dataclass(frozen=True)
+class ODSRef:
+    id: int
+    name: str
+    description: Optional[str]
+    dimension_id: int
+
+
+@dataclass(frozen=True)
+class GoalRef:
+    ods_id: int
+    goal_number: str
+    description: str
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    dimensions: Tuple[DimensionRef, ...]
+    ods: Tuple[ODSRef, ...]
+    goals: Tuple[GoalRef, ...]
+    ods_by_id: Mapping[int, ODSRef]
+    goals_by_ods: Mapping[int, Tuple[GoalRef, ...]]
+    goals_by_key: Mapping[Tuple[int, str], GoalRef]
+    ods_by_dimension: Mapping[str, Tuple[ODSRef, ...]]
+    etag: str
+
+
+_registry: Optional[ReferenceData] = None
+_lock = threading.Lock()
+
+
+def _build(dimensions: List[DimensionRef], ods: List[ODSRef], goals: List[GoalRef]) -> ReferenceData:
+    ods_by_id = {item.id: item for item in ods}
+
+    goals_by_ods: Dict[int, List[GoalRef]] = {}
+    for goal in goals:
+        goals_by_ods.setdefault(goal.ods_id, []).append(goal)
+
+    payload = json.dumps(
+        [[asdict(d) for d in dimensions], [asdict(o) for o in ods], [asdict(g) for g in goals]],
+        sort_keys=True, ensure_ascii=False
+    ).encode("utf-8")
+
+    return ReferenceData(
+        dimensions=tuple(dimensions),
+        ods=tuple(ods),
+        goals=tuple(goals),
+        ods_by_id=MappingProxyType(ods_by_id),
+        goals_by_ods=MappingProxyType({ods_id: tuple(items) for ods_id, items in goals_by_ods.items()}),
+        goals_by_key=MappingProxyType({(goal.ods_id, goal.goal_number): goal for goal in goals}),
+        ods_by_dimension=MappingProxyType({
+            name: tuple(ods_by_id[ods_id] for ods_id in ods_ids if ods_id in ods_by_id)
+            for name, ods_ids in DIMENSION_ODS.items()
+        }),
+        etag=hashlib.sha1(payload).hexdigest()
+    )
+
+
+def load_reference_data(db: Session) -> ReferenceData:
+    """
+    Lee dimensiones, ODS y metas de la base de datos y construye el registro.
+    """
+    dimensions = [
+        DimensionRef(id=row.id, name=row.name, description=row.description)
+        for row in db.query(Dimension.id, Dimension.name, Dimension.description).order_by(Dimension.id)
+    ]
+    ods = [
+        ODSRef(id=row.id, name=row.name, description=row.description, dimension_id=row.dimension_id)
+        for row in db.query(ODS.id, ODS.name, ODS.description, ODS.dimension_id).order_by(ODS.id)
+    ]
+    goals = [
+        GoalRef(ods_id=row.ods_id, goal_number=row.goal_number, description=row.description)
+        for row in db.query(Goal.ods_id, Goal.goal_number, Goal.description).order_by(Goal.ods_id, Goal.goal_number)
+    ]
+    return _build(dimensions, ods, goals)
+
+
+def get_reference_data(db: Session) -> ReferenceData:
+    """
+    Devuelve el registro, cargándolo en el primer uso.
+    """
+    global _registry
+    registry = _registry
+    if registry is not None:
+        return registry
+    with _lock:
+        if _registry is None:
+            _registry = load_reference_data(db)
+        return _registry
+
+
+def reload_reference_data(db: Session) -> ReferenceData:
+    """
+    Vuelve a cargar el registro (por ejemplo, tras modificar la semilla).
+    """
+    global _registry
+    registry = load_reference_data(db)
+    with _lock:
+        _registry = registry
+    return registry
@@ -1,5 +1,5 @@
 import os
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from app.config import Settings
@@ -7,6 +7,7 @@ from bs4 import BeautifulSoup
 from app.utils.data_dump import DataDump
 import re
 from app.utils.text_processing import paginate_html_text, paginate_html_tables, paginate_material_topics
+from app.services.tracing import span, traced
 import dotenv
 
 dotenv.load_dotenv()
@@ -14,12 +15,21 @@ dotenv.load_dotenv()
 settings = Settings()
 
 
+class TracedTemplate(Template):
+    """
+    Plantilla Jinja que mide cada renderizado como una etapa de la traza en curso.
+    """
+    def render(self, *args, **kwargs) -> str:
+        with span(f"render:{self.name}"):
+            return super().render(*args, **kwargs)
+
 
 class ReportGenerator:
     def __init__(self):
         self.output_folder = settings.REPORTS_DIR
         os.makedirs(self.output_folder, exist_ok=True)
         self.template_env = Environment(loader=FileSystemLoader(searchpath=Path(__file__).parent / "../templates"))
+        self.template_env.template_class = TracedTemplate
 
     def generate_combined_html(self, data: Dict[str, Any]) -> str:
         """
@@ -178,6 +188,7 @@ class ReportGenerator:
         template = self.template_env.get_template("consistency_legend.html")
         return template.render(data=data)
 
+    @traced()
     def generate_report(self, data: Dict[str, Any]) -> str:
         """
         Genera el reporte completo combinando todas las secciones.
@@ -570,6 +581,7 @@ class ReportGenerator:
             logger.error(f"Error al generar el reporte: {str(e)}")
             raise e
 
+    @traced()
     def generate_report_preview(self, data: Dict[str, Any]) -> str:
         """
         Genera una vista previa del reporte sin paginación.
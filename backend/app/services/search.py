@@ -0,0 +1,135 @@
+"""
+Búsqueda de texto sobre las columnas de los modelos.
+
+En MySQL se usan los índices FULLTEXT declarados en los modelos
+(MATCH ... AGAINST en modo booleano, con comodín de prefijo) y los resultados se
+ordenan por relevancia. Si el motor no es MySQL, si ningún índice FULLTEXT cubre
+exactamente las columnas pedidas o si el término no se puede expresar como
+búsqueda FULLTEXT (palabras demasiado cortas o vacías), se recurre a LIKE.
+
+Las dos vías no devuelven lo mismo: FULLTEXT (+palabra*) exige que cada palabra
+sea el comienzo de una palabra del texto ("cord" encuentra "Córdoba", "doba" no),
+mientras que LIKE busca subcadenas. Los esquemas de búsqueda lo documentan en la
+descripción de sus campos (app/schemas/search.py).
+
+Las columnas con clave de búsqueda persistida (<columna>_search, en minúsculas y
+sin tildes) se comparan contra esa clave, de modo que "cordoba" encuentra
+"Córdoba" con independencia de la collation; las búsquedas por prefijo sobre
+ella usan el índice B-tree.
+"""
+import re
+from typing import NamedTuple, Optional, Sequence
+from sqlalchemy import or_
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.elements import ColumnElement
+from app.utils.text_normalization import normalize_text, fold_text
+
+
+FULLTEXT_MIN_TOKEN_SIZE = 3
+
+FULLTEXT_STOPWORDS = frozenset({
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for",
+    "from", "how", "i", "in", "is", "it", "la", "of", "on", "or", "that", "the",
+    "this", "to", "was", "what", "when", "where", "who", "will", "with", "und", "www"
+})
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class TextSearch(NamedTuple):
+    condition: ColumnElement
+    rank: Optional[ColumnElement]
+
+
+def fulltext_query(term: str) -> Optional[str]:
+    """
+    Convierte el término en una expresión booleana FULLTEXT (+palabra* por palabra).
+    Devuelve None si alguna palabra no puede resolverse con el índice.
+    """
+    tokens = [token.lower() for token in _TOKEN_PATTERN.findall(term)]
+    tokens = [token for token in tokens if token not in FULLTEXT_STOPWORDS]
+    if not tokens or any(len(token) < FULLTEXT_MIN_TOKEN_SIZE for token in tokens):
+        return None
+    return " ".join(f"+{token}*" for token in tokens)
+
+
+def _has_fulltext_index(columns: Sequence[ColumnElement]) -> bool:
+    """
+    Comprueba si la tabla declara un índice FULLTEXT con exactamente esas columnas.
+    """
+    tables = {column.table for column in columns}
+    if len(tables) != 1:
+        return False
+    table = tables.pop()
+    names = {column.name for column in columns}
+    for index in getattr(table, "indexes", ()):
+        if index.dialect_options["mysql"].get("prefix") == "FULLTEXT" and {c.name for c in index.columns} == names:
+            return True
+    return False
+
+
+def search_key_column(column: ColumnElement) -> Optional[ColumnElement]:
+    """
+    Devuelve la columna con la clave de búsqueda normalizada, si la tabla la tiene.
+    """
+    table = getattr(column, "table", None)
+    if table is None:
+        return None
+    return table.columns.get(f"{column.name}_search")
+
+
+def _like_condition(column: ColumnElement, term: str, prefix: bool) -> ColumnElement:
+    """
+    Condición LIKE sobre la clave normalizada o, si no existe, sobre la propia columna.
+    """
+    key = search_key_column(column)
+    if key is not None:
+        folded = fold_text(term)
+        return key.startswith(folded, autoescape=True) if prefix else key.contains(folded, autoescape=True)
+    return column.ilike(f"{term}%") if prefix else column.ilike(f"%{term}%")
+
+
+def build_text_search(
+    db: Session,
+    columns: Sequence[ColumnElement],
+    term: Optional[str],
+    prefix: bool = False
+) -> Optional[TextSearch]:
+    """
+    Construye la condición de búsqueda (y la relevancia, si la hay) para las columnas dadas.
+    Con prefix=True se buscan valores que empiecen por el término.
+    """
+    term = normalize_text(term)
+    if not term:
+        return None
+
+    columns = [getattr(column, "expression", column) for column in columns]
+    use_key = prefix and all(search_key_column(column) is not None for column in columns)
+    if not use_key and db.get_bind().dialect.name == "mysql" and _has_fulltext_index(columns):
+        against = fulltext_query(term)
+        if against:
+            rank = match(*columns, against=against).in_boolean_mode()
+            return TextSearch(condition=rank, rank=rank)
+
+    return TextSearch(condition=or_(*[_like_condition(column, term, prefix) for column in columns]), rank=None)
+
+
+def apply_text_search(
+    query: Query,
+    db: Session,
+    columns: Sequence[ColumnElement],
+    term: Optional[str],
+    ranked: bool = True,
+    prefix: bool = False
+) -> Query:
+    """
+    Filtra la consulta por el término y, si hay relevancia, ordena por ella.
+    """
+    search = build_text_search(db, columns, term, prefix=prefix)
+    if search is None:
+        return query
+    query = query.filter(search.condition)
+    if ranked and search.rank is not None:
+        query = query.order_by(search.rank.desc())
+    return query
@@ -1,34 +1,75 @@
 from datetime import datetime, timedelta
 from typing import Any, Union
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
 import bcrypt
+import logging
+
+logger = logging.getLogger(__name__)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Verifica si la contraseña en texto plano coincide con el hash
-    """
+# bcrypt libera el GIL, pero cada operación tarda cientos de milisegundos: se
+# ejecutan en un pool acotado para no bloquear el bucle de eventos ni saturar la CPU.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+
+def _checkpw(plain_password: str, hashed_password: str) -> bool:
     try:
         return bcrypt.checkpw(
             plain_password.encode('utf-8'),
             hashed_password.encode('utf-8')
         )
     except Exception as e:
-        print(f"Error verificando contraseña: {e}")
+        logger.warning(f"Error verificando contraseña: {e}")
         return False
 
-def get_password_hash(password: str) -> str:
-    """
-    Genera un hash bcrypt de la contraseña.
-    """
+def _hashpw(password: str) -> str:
     return bcrypt.hashpw(
         password.encode('utf-8'),
-        bcrypt.gensalt()
+        bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     ).decode('utf-8')
 
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifica si la contraseña en texto plano coincide con el hash
+    """
+    return _hash_executor.submit(_checkpw, plain_password, hashed_password).result()
+
+def get_password_hash(password: str) -> str:
+    """
+    Genera un hash bcrypt de la contraseña con el coste BCRYPT_ROUNDS.
+    """
+    return _hash_executor.submit(_hashpw, password).result()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Versión asíncrona de verify_password: espera al pool sin bloquear el bucle de eventos.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, _checkpw, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Versión asíncrona de get_password_hash.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, _hashpw, password)
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Indica si el hash se generó con un coste distinto de BCRYPT_ROUNDS.
+    """
+    try:
+        return int(hashed_password.split('$')[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta | None = None
 ) -> str:
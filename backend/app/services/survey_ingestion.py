@@ -0,0 +1,293 @@
+"""
+Ingesta de respuestas de encuestas.
+
+Cada envío se valida contra el estado de la encuesta (cacheado durante
+SURVEY_STATE_TTL segundos e invalidado al modificar la memoria) y se inserta con
+un único INSERT de varias filas. Si SURVEY_BUFFERED_WRITES está activo, los envíos
+se encolan y un hilo los escribe por lotes cada SURVEY_FLUSH_INTERVAL segundos;
+con la cola llena se rechazan con SurveyBackpressureError.
+"""
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.config import Settings
+from app.crud import materiality_aggregates
+from app.models.models import Assessment, SustainabilityReport
+from app.services.cache import TTLCache
+
+settings = Settings()
+
+logger = logging.getLogger(__name__)
+
+_state_cache = TTLCache(ttl=settings.SURVEY_STATE_TTL, maxsize=4096, shared="survey_state")
+
+
+class SurveyBackpressureError(Exception):
+    """
+    La cola de escritura está llena; el cliente debe reintentar más tarde.
+    """
+
+
+@dataclass(frozen=True)
+class Submission:
+    stakeholder_id: int
+    rows: Tuple[Dict[str, int], ...]
+    received_at: float
+
+
+def get_survey_state(db: Session, report_id: int) -> Optional[str]:
+    """
+    Estado de la encuesta de una memoria (None si no existe), cacheado por memoria.
+    """
+    return _state_cache.get_or_set(
+        report_id,
+        lambda: db.query(SustainabilityReport.survey_state).filter(SustainabilityReport.id == report_id).scalar()
+    )
+
+
+def invalidate_survey_state(report_id: Optional[int] = None) -> None:
+    """
+    Descarta el estado cacheado de una memoria o, si no se indica, de todas.
+    """
+    _state_cache.invalidate(report_id)
+
+
+def build_submission(
+    db: Session,
+    stakeholder_id: int,
+    assessments: List[Dict],
+    report_id: int,
+    scale: int
+) -> Submission:
+    """
+    Valida un envío y prepara sus filas. Lanza ValueError si la encuesta no está
+    activa o alguna puntuación está fuera de la escala.
+    """
+    if get_survey_state(db, report_id) != 'active':
+        raise ValueError("La encuesta no está activa")
+
+    rows = []
+    for assessment_data in assessments:
+        score = assessment_data['score']
+        if score < 1 or score > scale:
+            raise ValueError(f"Score {score} fuera del rango permitido [1,{scale}]")
+        rows.append({
+            "material_topic_id": assessment_data['material_topic_id'],
+            "stakeholder_id": stakeholder_id,
+            "score": score
+        })
+    return Submission(stakeholder_id=stakeholder_id, rows=tuple(rows), received_at=time.monotonic())
+
+
+def insert_rows(db: Session, rows: List[Dict[str, int]], return_ids: bool = False) -> Optional[List[int]]:
+    """
+    Inserta las valoraciones con una sola sentencia INSERT ... VALUES (...), (...)
+    y actualiza los acumulados de materialidad. No hace commit.
+
+    Con `return_ids`, si el dialecto admite INSERT ... RETURNING con el orden de
+    los parámetros (SQLite, PostgreSQL, MariaDB), devuelve los ids en el orden de
+    `rows`. En MySQL no hay forma fiable de obtenerlos (lastrowid más un rango
+    consecutivo falla con auto_increment_increment distinto de 1) y se devuelve
+    None.
+    """
+    if not rows:
+        return []
+    table = Assessment.__table__
+    ids = None
+    if return_ids and db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        ids = list(db.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows).scalars())
+    else:
+        db.execute(insert(table).values(rows))
+    materiality_aggregates.apply_assessment_rows(db, rows)
+    return ids
+
+
+class AssessmentWriter:
+    """
+    Escritor en segundo plano que agrupa envíos de varias peticiones.
+
+    La cola está acotada a `max_pending` envíos. El hilo escribe un lote en cuanto
+    reúne `batch_size` filas o cuando han pasado `flush_interval` segundos desde el
+    primer envío pendiente. Si un lote falla, se reintenta envío a envío para no
+    perder los válidos.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_pending: int,
+        flush_interval: float,
+        batch_size: int
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Submission]" = queue.Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "accepted": 0,
+            "rejected": 0,
+            "written_rows": 0,
+            "failed_submissions": 0,
+            "batches": 0,
+            "max_queue_depth": 0,
+            "last_batch_rows": 0,
+            "last_flush_seconds": 0.0,
+            "max_wait_seconds": 0.0
+        }
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="survey-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Detiene el hilo tras escribir lo que quede en la cola.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, submission: Submission) -> None:
+        """
+        Encola un envío o lanza SurveyBackpressureError si la cola está llena.
+        """
+        try:
+            self._queue.put_nowait(submission)
+        except queue.Full:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise SurveyBackpressureError("Demasiadas respuestas pendientes de guardar")
+        with self._lock:
+            self._stats["accepted"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queue.qsize())
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["queue_capacity"] = self._queue.maxsize
+        stats["running"] = self._thread is not None and self._thread.is_alive()
+        return stats
+
+    def _next_batch(self) -> List[Submission]:
+        try:
+            first = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        rows = len(first.rows)
+        deadline = first.received_at + self.flush_interval
+        while rows < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                submission = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(submission)
+            rows += len(submission.rows)
+        return batch
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, batch: List[Submission]) -> None:
+        started = time.monotonic()
+        rows = [row for submission in batch for row in submission.rows]
+        written, failed = 0, 0
+
+        db = self.session_factory()
+        try:
+            try:
+                insert_rows(db, rows)
+                db.commit()
+                written = len(rows)
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Error al guardar un lote de {len(batch)} respuestas, se reintenta una a una: {e}")
+                for submission in batch:
+                    try:
+                        insert_rows(db, list(submission.rows))
+                        db.commit()
+                        written += len(submission.rows)
+                    except Exception as e:
+                        db.rollback()
+                        failed += 1
+                        logger.error(f"Respuesta descartada del grupo de interés {submission.stakeholder_id}: {e}")
+        finally:
+            db.close()
+
+        finished = time.monotonic()
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["written_rows"] += written
+            self._stats["failed_submissions"] += failed
+            self._stats["last_batch_rows"] = len(rows)
+            self._stats["last_flush_seconds"] = finished - started
+            self._stats["max_wait_seconds"] = max(
+                self._stats["max_wait_seconds"],
+                max(finished - submission.received_at for submission in batch)
+            )
+
+
+_writer: Optional[AssessmentWriter] = None
+
+
+def start_writer(session_factory: Callable[[], Session]) -> Optional[AssessmentWriter]:
+    """
+    Arranca el escritor por lotes si SURVEY_BUFFERED_WRITES está activo.
+    """
+    global _writer
+    if not settings.SURVEY_BUFFERED_WRITES:
+        return None
+    if _writer is None:
+        _writer = AssessmentWriter(
+            session_factory,
+            max_pending=settings.SURVEY_QUEUE_SIZE,
+            flush_interval=settings.SURVEY_FLUSH_INTERVAL,
+            batch_size=settings.SURVEY_BATCH_SIZE
+        )
+    _writer.start()
+    return _writer
+
+
+def stop_writer() -> None:
+    """
+    Vacía la cola y detiene el escritor por lotes.
+    """
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+
+def get_writer() -> Optional[AssessmentWriter]:
+    return _writer
+
+
+def ingestion_stats() -> Dict[str, object]:
+    """
+    Métricas de la ingesta: modo de escritura, tamaño de la caché de estados y,
+    si hay escritor por lotes, profundidad de cola, rechazos y latencias.
+    """
+    writer = _writer
+    return {
+        "buffered": writer is not None,
+        "cached_survey_states": len(_state_cache),
+        "writer": writer.stats() if writer is not None else None
+    }
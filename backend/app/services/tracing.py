@@ -0,0 +1,214 @@
+"""
+Trazas por etapas y perfilado de la generación de informes.
+
+`trace(name)` abre una traza para la operación en curso (por ejemplo, generar el
+HTML de una memoria) y `span(name)` mide cada etapa dentro de ella: carga de
+datos, matriz de materialidad, cada gráfica, cada `paginate_*` y cada plantilla
+Jinja. Fuera de una traza `span` no hace nada más que consultar un ContextVar,
+así que las funciones instrumentadas cuestan lo mismo en el resto de la
+aplicación. Al cerrar la traza se registra un resumen por etapa en el log y en
+la métrica `report_stage_duration_seconds`.
+
+`profile_to(directory, ...)` ejecuta un bloque bajo cProfile (o pyinstrument si
+está instalado y se pide) y guarda el perfil, su resumen y la traza.
+"""
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import logging
+import pstats
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    name: str
+    depth: int
+    start: float
+    duration: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Trace:
+    name: str
+    start: float = field(default_factory=time.perf_counter)
+    spans: List[Span] = field(default_factory=list)
+    depth: int = 0
+    duration: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def stage_totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Tiempo total y número de llamadas por nombre de etapa.
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            entry = totals.setdefault(span.name, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += span.duration
+            entry["calls"] += 1
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "seconds": self.duration,
+            **({"attributes": self.attributes} if self.attributes else {}),
+            "stages": self.stage_totals(),
+            "spans": [
+                {
+                    "name": span.name,
+                    "depth": span.depth,
+                    "offset": span.start - self.start,
+                    "seconds": span.duration,
+                    **({"attributes": span.attributes} if span.attributes else {})
+                }
+                for span in self.spans
+            ]
+        }
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("report_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def trace(name: str, log_threshold: float = 0.0, **attributes: Any) -> Iterator[Trace]:
+    """
+    Abre una traza. Al cerrarla registra su duración y la de cada etapa en las
+    métricas y, si ha durado más de `log_threshold` segundos, un resumen en el
+    log. Dentro de otra traza se comporta como una etapa más de la exterior.
+    Los atributos (p. ej. report_id) van al log y al volcado, no a las métricas.
+    """
+    outer = _current_trace.get()
+    if outer is not None:
+        with span(name, **attributes):
+            yield outer
+        return
+
+    current = Trace(name=name, attributes=attributes)
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+        current.duration = time.perf_counter() - current.start
+        metrics.registry.observe("report_stage_duration_seconds", (name,), current.duration, metrics.LATENCY_BUCKETS)
+        for stage, totals in current.stage_totals().items():
+            metrics.registry.observe("report_stage_duration_seconds", (stage,), totals["seconds"], metrics.LATENCY_BUCKETS)
+        if current.duration >= log_threshold:
+            slowest = sorted(current.stage_totals().items(), key=lambda item: item[1]["seconds"], reverse=True)[:8]
+            summary = ", ".join(f"{stage}={totals['seconds']:.3f}s/{int(totals['calls'])}" for stage, totals in slowest)
+            label = " ".join([name] + [f"{key}={value}" for key, value in attributes.items()])
+            logger.info(f"{label}: {current.duration:.3f}s ({summary})")
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Mide una etapa de la traza en curso (no hace nada si no hay traza).
+    """
+    current = _current_trace.get()
+    if current is None:
+        yield None
+        return
+
+    item = Span(name=name, depth=current.depth, start=time.perf_counter(), attributes=attributes)
+    current.spans.append(item)
+    current.depth += 1
+    try:
+        yield item
+    finally:
+        current.depth -= 1
+        item.duration = time.perf_counter() - item.start
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorador que mide cada llamada a la función como una etapa.
+    """
+    def decorator(func: Callable) -> Callable:
+        stage = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+@contextmanager
+def profile_to(directory: Path, label: str, profiler: str = "cprofile", **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Perfila el bloque y guarda en `directory`:
+      - <fecha>_<label>.prof (pstats) y .txt con las 60 funciones de más tiempo acumulado
+      - <fecha>_<label>.html si se usa pyinstrument
+      - <fecha>_<label>.trace.json con las etapas medidas durante el bloque
+    Devuelve un diccionario que al salir incluye las rutas generadas.
+    """
+    result: Dict[str, Any] = {"files": []}
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    base = Path(directory) / f"{stamp}_{label}"
+
+    pyinstrument_profiler = None
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+            pyinstrument_profiler = Profiler()
+        except ImportError:
+            logger.warning("pyinstrument no está instalado; se usa cProfile")
+    c_profiler = None if pyinstrument_profiler is not None else cProfile.Profile()
+
+    active: Optional[Trace] = None
+    try:
+        with trace("profile", **attributes) as active:
+            if pyinstrument_profiler is not None:
+                pyinstrument_profiler.start()
+            else:
+                c_profiler.enable()
+            try:
+                yield result
+            finally:
+                if pyinstrument_profiler is not None:
+                    pyinstrument_profiler.stop()
+                else:
+                    c_profiler.disable()
+    finally:
+        base.parent.mkdir(parents=True, exist_ok=True)
+        if pyinstrument_profiler is not None:
+            html_path = base.with_suffix(".html")
+            html_path.write_text(pyinstrument_profiler.output_html(), encoding="utf-8")
+            result["files"].append(str(html_path))
+        else:
+            prof_path = base.with_suffix(".prof")
+            c_profiler.dump_stats(prof_path)
+            text = io.StringIO()
+            pstats.Stats(c_profiler, stream=text).sort_stats("cumulative").print_stats(60)
+            txt_path = base.with_suffix(".txt")
+            txt_path.write_text(text.getvalue(), encoding="utf-8")
+            result["files"] += [str(prof_path), str(txt_path)]
+
+        if active is not None:
+            trace_path = base.with_name(base.name + ".trace.json")
+            trace_path.write_text(json.dumps(active.to_dict(), indent=2), encoding="utf-8")
+            result["files"].append(str(trace_path))
+        logger.info(f"Perfil de {label} guardado en {base.parent}")
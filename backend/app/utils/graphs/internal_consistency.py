@@ -1,5 +1,4 @@
-import matplotlib.pyplot as plt
-import numpy as np
+from app.utils.lazy import pyplot as plt
 from typing import Dict, List, Tuple
 import io
 import base64
@@ -83,40 +82,3 @@ def generate_internal_consistency_graph(
         raise
     finally:
         plt.close('all')
-
-def get_dimension_totals(
-    primary_impacts: list,
-    secondary_impacts: list,
-    main_weight,
-    secondary_weight
-) -> Tuple[dict, list]:
-    ods_dimensions = {
-        1: "PERSONAS", 2: "PERSONAS", 3: "PERSONAS", 4: "PERSONAS", 5: "PERSONAS",
-        6: "PLANETA", 12: "PLANETA", 13: "PLANETA", 14: "PLANETA", 15: "PLANETA",
-        7: "PROSPERIDAD", 8: "PROSPERIDAD", 9: "PROSPERIDAD", 10: "PROSPERIDAD", 11: "PROSPERIDAD",
-        16: "PAZ",
-        17: "ALIANZAS"
-    }
-    dimension_totals = {dim: 0.0 for dim in ["PERSONAS", "PLANETA", "PROSPERIDAD", "PAZ", "ALIANZAS"]}
-     
-    for impact in primary_impacts:
-        if impact.get('ods_id') and impact['ods_id'] in ods_dimensions:
-            dimension = ods_dimensions[impact['ods_id']]
-            count = float(impact.get('count', 0))
-            weighted_count = count * main_weight
-            dimension_totals[dimension] += weighted_count
-
-    for impact in secondary_impacts:
-        if impact.get('ods_id') and impact['ods_id'] in ods_dimensions:
-            dimension = ods_dimensions[impact['ods_id']]
-            count = float(impact.get('count', 0))
-            weighted_count = count * secondary_weight
-            dimension_totals[dimension] += weighted_count
-
-    dimension_totals_list = [
-        {"dimension": dim, "total": dimension_totals[dim]}
-        for dim in ["PERSONAS", "PLANETA", "PROSPERIDAD", "PAZ", "ALIANZAS"]
-    ]
-    return dimension_totals, dimension_totals_list
-
-
@@ -1,10 +1,10 @@
-import matplotlib
-matplotlib.use('Agg')  # Configurar el backend antes de importar pyplot
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
+from app.utils.lazy import pyplot as plt
 import io
 import base64
 from typing import List, Dict, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 # Colores oficiales ODS
@@ -99,7 +99,16 @@ def get_secondary_impacts_material_topics_graph(secondary_impacts: List[Dict]) -
                     if 1 <= ods_id <= 17:
                         impact_counts[ods_id - 1] += 1
         
-        return generate_graph(impact_counts, "IMPACTOS ODS SECUNDARIO")
+        return get_secondary_impacts_counts_graph(impact_counts)
     except Exception as e:
         logger.error(f"Error al generar gráfica de impactos secundarios: {str(e)}")
         raise
+
+def get_secondary_impacts_counts_graph(impact_counts: List[int]) -> str:
+    """
+    Genera la gráfica de impactos secundarios a partir del recuento por ODS ya calculado
+    (17 valores, posición i = ODS i+1)
+    """
+    if len(impact_counts) != 17:
+        raise ValueError("Se esperan 17 valores, uno por ODS")
+    return generate_graph(list(impact_counts), "IMPACTOS ODS SECUNDARIO")
@@ -1,13 +1,12 @@
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+from app.utils.lazy import pyplot as plt, mpl_patches as patches
 import io
 import base64
 import math
-from typing import Dict, List, Tuple
+import numpy as np
+from typing import Dict, Optional, Tuple
 from sqlalchemy.orm import Session
-from app.models.models import Assessment, MaterialTopic, Stakeholder
+from app.models.models import Assessment, MaterialTopic, Stakeholder, SustainabilityReport
+from app.crud import materiality_aggregates
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,32 +21,138 @@ DIMENSION_COLORS = {
 }
 
 
-def calculate_averages(assessments: List[Assessment], stakeholders: Dict[int, Stakeholder]) -> Dict[int, Tuple[float, float]]:
-    """Calcula las medias internas y externas para cada material topic."""
-    topic_scores: Dict[int, Dict[str, List[float]]] = {}
-    
-    for assessment in assessments:
-        stakeholder = stakeholders.get(assessment.stakeholder_id)
-        if not stakeholder:
-            continue
-
-        topic_id = assessment.material_topic_id
-        if topic_id not in topic_scores:
-            topic_scores[topic_id] = {"internal": [], "external": []}
-
-        score_type = "internal" if stakeholder.type == "internal" else "external"
-        topic_scores[topic_id][score_type].append(assessment.score)
-
-    averages = {}
-    for topic_id, scores in topic_scores.items():
-        internal_avg = sum(scores["internal"]) / len(scores["internal"]) if scores["internal"] else 0
-        external_avg = sum(scores["external"]) / len(scores["external"]) if scores["external"] else 0
-        averages[topic_id] = (internal_avg, external_avg)
-
-    return averages
-
-def create_materiality_matrix_data(db: Session, report_id: int, normalize: bool = False, scale: int = None) -> Dict:
-    """Genera los datos para la matriz de materialidad."""
+def fetch_assessment_scores(db: Session, report_id: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Obtiene las valoraciones de una memoria como vectores (asunto, es_interno, puntuación)
+    leyendo solo esas tres columnas.
+    """
+    rows = db.query(Assessment.material_topic_id, Stakeholder.type, Assessment.score)\
+        .join(Stakeholder, Assessment.stakeholder_id == Stakeholder.id)\
+        .join(MaterialTopic, Assessment.material_topic_id == MaterialTopic.id)\
+        .filter(MaterialTopic.report_id == report_id)\
+        .all()
+
+    topic_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    internal = np.fromiter((row[1] == "internal" for row in rows), dtype=bool, count=len(rows))
+    scores = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+    return topic_ids, internal, scores
+
+
+def statistics_from_moments(count: np.ndarray, total: np.ndarray, total_sq: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula media y desviación típica (poblacional) a partir de n, suma y suma de cuadrados.
+    Los grupos vacíos tienen media y desviación 0.
+    """
+    count = np.asarray(count, dtype=np.float64)
+    safe_count = np.where(count > 0, count, 1)
+    mean = np.where(count > 0, np.asarray(total, dtype=np.float64) / safe_count, 0.0)
+    variance = np.where(count > 0, np.asarray(total_sq, dtype=np.float64) / safe_count - mean ** 2, 0.0)
+    return mean, np.sqrt(np.clip(variance, 0.0, None))
+
+
+def _group_medians(group: np.ndarray, scores: np.ndarray, count: np.ndarray) -> np.ndarray:
+    """Mediana de cada grupo ordenando una sola vez por (grupo, puntuación)."""
+    order = np.lexsort((scores, group))
+    sorted_scores = scores[order]
+    starts = np.concatenate(([0], np.cumsum(count)[:-1]))
+    last = max(len(sorted_scores) - 1, 0)
+    low = np.clip(starts + (count - 1) // 2, 0, last)
+    high = np.clip(starts + count // 2, 0, last)
+    if len(sorted_scores) == 0:
+        return np.zeros(len(count))
+    return np.where(count > 0, (sorted_scores[low] + sorted_scores[high]) / 2, 0.0)
+
+
+def calculate_topic_statistics(
+    topic_ids: np.ndarray,
+    internal: np.ndarray,
+    scores: np.ndarray
+) -> Dict[int, Dict[str, Dict[str, float]]]:
+    """
+    Calcula por asunto y tipo de grupo de interés (interno/externo) el número de
+    valoraciones, la media, la mediana y la desviación típica, de forma vectorizada.
+    """
+    if len(topic_ids) == 0:
+        return {}
+
+    unique_topics, topic_index = np.unique(topic_ids, return_inverse=True)
+    group = topic_index * 2 + (~np.asarray(internal, dtype=bool)).astype(np.int64)
+    n_groups = len(unique_topics) * 2
+
+    count = np.bincount(group, minlength=n_groups)
+    total = np.bincount(group, weights=scores, minlength=n_groups)
+    total_sq = np.bincount(group, weights=scores * scores, minlength=n_groups)
+    mean, std = statistics_from_moments(count, total, total_sq)
+    median = _group_medians(group, scores, count)
+
+    return pack_topic_statistics(unique_topics, count, mean, std, median)
+
+
+def pack_topic_statistics(
+    topic_ids: np.ndarray,
+    count: np.ndarray,
+    mean: np.ndarray,
+    std: np.ndarray,
+    median: Optional[np.ndarray] = None
+) -> Dict[int, Dict[str, Dict[str, float]]]:
+    """Convierte los vectores por grupo (interno, externo por asunto) en un diccionario."""
+    statistics = {}
+    for index, topic_id in enumerate(topic_ids):
+        topic_statistics = {}
+        for offset, score_type in enumerate(("internal", "external")):
+            position = index * 2 + offset
+            topic_statistics[score_type] = {
+                "count": int(count[position]),
+                "mean": float(mean[position]),
+                "median": float(median[position]) if median is not None else None,
+                "std": float(std[position])
+            }
+        statistics[int(topic_id)] = topic_statistics
+    return statistics
+
+
+def aggregate_topic_statistics(db: Session, report_id: int) -> Dict[int, Dict[str, Dict[str, float]]]:
+    """
+    Calcula n, media y desviación por asunto y tipo de grupo de interés a partir de
+    los acumulados de materialidad (una fila por asunto y tipo), sin leer las
+    valoraciones. La mediana no se puede obtener de los acumulados y queda a None.
+    """
+    aggregates = materiality_aggregates.get_report_aggregates(db, report_id)
+    if not aggregates:
+        return {}
+
+    unique_topics = np.array(sorted({row[0] for row in aggregates}), dtype=np.int64)
+    topic_index = {int(topic_id): index for index, topic_id in enumerate(unique_topics)}
+    count = np.zeros(len(unique_topics) * 2)
+    total = np.zeros(len(unique_topics) * 2)
+    total_sq = np.zeros(len(unique_topics) * 2)
+    for topic_id, stakeholder_type, assessment_count, score_sum, score_sum_sq in aggregates:
+        position = topic_index[topic_id] * 2 + (0 if stakeholder_type == "internal" else 1)
+        count[position] = assessment_count
+        total[position] = score_sum
+        total_sq[position] = score_sum_sq
+
+    mean, std = statistics_from_moments(count, total, total_sq)
+    return pack_topic_statistics(unique_topics, count, mean, std)
+
+
+def normalize_points(points: np.ndarray, scale: int) -> np.ndarray:
+    """
+    Normaliza cada eje de los puntos (n, 2) al intervalo [1, scale].
+    Si un eje no tiene rango, todos sus valores se sitúan en el centro.
+    """
+    minimums = points.min(axis=0)
+    ranges = points.max(axis=0) - minimums
+    safe_ranges = np.where(ranges > 0, ranges, 1)
+    return np.where(ranges > 0, (points - minimums) / safe_ranges * (scale - 1) + 1, (scale + 1) / 2)
+
+
+def create_materiality_matrix_data(db: Session, report_id: int, normalize: bool = False, scale: int = None, exact: bool = False) -> Dict:
+    """
+    Genera los datos para la matriz de materialidad.
+    Por defecto usa los acumulados por asunto; con exact=True recorre las
+    valoraciones e incluye también la mediana.
+    """
     
     def get_dimension_by_ods(ods_id: int) -> str:
         """Determina la dimensión basada en el ODS."""
@@ -64,41 +169,34 @@ def create_materiality_matrix_data(db: Session, report_id: int, normalize: bool
         else:
             return "OTROS"
     try:
-        # Obtener todos los datos necesarios
-        material_topics = db.query(MaterialTopic).filter(MaterialTopic.report_id == report_id).all()
-        stakeholders = {s.id: s for s in db.query(Stakeholder).filter(Stakeholder.report_id == report_id).all()}
-        assessments = db.query(Assessment)\
-            .join(MaterialTopic, Assessment.material_topic_id == MaterialTopic.id)\
+        # Obtener solo las columnas necesarias
+        material_topics = db.query(MaterialTopic.id, MaterialTopic.name, MaterialTopic.goal_ods_id)\
             .filter(MaterialTopic.report_id == report_id)\
             .all()
 
         # Usar el scale recibido o buscarlo en la base de datos
         if scale is None:
-            print("scale is None")
-            report = db.execute(
-                f"SELECT scale FROM sustainability_reports WHERE id = {report_id}"
-            ).fetchone()
-            scale = report[0] if report else 10  # Por defecto 10 si no se encuentra
+            report_scale = db.query(SustainabilityReport.scale).filter(SustainabilityReport.id == report_id).scalar()
+            scale = report_scale if report_scale is not None else 10  # Por defecto 10 si no se encuentra
 
-        # Calcular medias
-        averages = calculate_averages(assessments, stakeholders)
+        # Calcular estadísticas (media, desviación y, si exact, mediana) por asunto y tipo de grupo
+        if exact:
+            statistics = calculate_topic_statistics(*fetch_assessment_scores(db, report_id))
+        else:
+            statistics = aggregate_topic_statistics(db, report_id)
+        averages = {
+            topic_id: (topic_statistics["internal"]["mean"], topic_statistics["external"]["mean"])
+            for topic_id, topic_statistics in statistics.items()
+        }
 
         # Si normalize es True, normalizar los datos en [1, scale]
         if normalize and averages:
-            all_x = [avg[0] for avg in averages.values()]
-            all_y = [avg[1] for avg in averages.values()]
-            min_x, max_x = min(all_x), max(all_x)
-            min_y, max_y = min(all_y), max(all_y)
-            def norm(val, min_val, max_val):
-                if max_val - min_val == 0:
-                    return (scale + 1) / 2  # Centro del rango
-                return ((val - min_val) / (max_val - min_val)) * (scale - 1) + 1
-            for topic_id in averages:
-                x, y = averages[topic_id]
-                averages[topic_id] = (
-                    norm(x, min_x, max_x),
-                    norm(y, min_y, max_y)
-                )
+            topic_order = list(averages.keys())
+            normalized = normalize_points(np.array([averages[topic_id] for topic_id in topic_order]), scale)
+            averages = {
+                topic_id: (float(point[0]), float(point[1]))
+                for topic_id, point in zip(topic_order, normalized)
+            }
 
         # Organizar asuntos por dimensión y ordenar por id
         dimension_topics = {}
@@ -135,7 +233,8 @@ def create_materiality_matrix_data(db: Session, report_id: int, normalize: bool
             "dimension_colors": DIMENSION_COLORS,
             "legend_numbers": legend_numbers,
             "leyenda_order": leyenda_order,
-            "scale": scale
+            "scale": scale,
+            "statistics": statistics
         }
 
         for topic in material_topics:
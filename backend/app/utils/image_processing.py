@@ -1,8 +1,10 @@
 import io
-from PIL import Image
 import os
 from pathlib import Path
 from app.config import Settings
+from app.utils.lazy import lazy_import
+
+Image = lazy_import("PIL.Image")
 
 settings = Settings().copy()
 
@@ -0,0 +1,76 @@
+"""
+Importación diferida de los subsistemas de renderizado.
+
+matplotlib, python-docx, BeautifulSoup (paginación del informe) y Pillow solo se
+necesitan al generar gráficas, documentos o imágenes, pero importarlos al cargar
+los routers alarga el arranque y la memoria de cada worker. `lazy_import` devuelve
+un objeto que se comporta como el módulo y lo importa en el primer acceso a uno
+de sus atributos.
+"""
+import importlib
+import sys
+import threading
+from types import ModuleType
+from typing import Callable, Optional
+
+
+class LazyModule(ModuleType):
+    """
+    Módulo que se importa en el primer acceso a un atributo.
+    """
+
+    def __init__(self, name: str, setup: Optional[Callable[[], None]] = None):
+        super().__init__(name)
+        self.__dict__["_lazy_setup"] = setup
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    setup = self.__dict__["_lazy_setup"]
+                    if setup is not None:
+                        setup()
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._load(), attribute)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "cargado" if self.__dict__["_lazy_module"] is not None else "diferido"
+        return f"<módulo {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str, setup: Optional[Callable[[], None]] = None) -> ModuleType:
+    """
+    Devuelve el módulo `name` si ya está importado o un LazyModule que lo importará
+    en el primer uso. `setup` se ejecuta justo antes de la importación.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name, setup)
+
+
+def is_loaded(module: ModuleType) -> bool:
+    if isinstance(module, LazyModule):
+        return module.__dict__["_lazy_module"] is not None
+    return True
+
+
+def _use_agg_backend() -> None:
+    # El backend sin interfaz gráfica debe fijarse antes de importar pyplot.
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+pyplot = lazy_import("matplotlib.pyplot", setup=_use_agg_backend)
+mpl_patches = lazy_import("matplotlib.patches", setup=_use_agg_backend)
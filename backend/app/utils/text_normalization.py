@@ -0,0 +1,23 @@
+import unicodedata
+from typing import Optional
+
+
+def normalize_text(text: Optional[str]) -> Optional[str]:
+    """
+    Elimina los espacios de los extremos; devuelve None si el texto está vacío.
+    """
+    if not text or text.isspace():
+        return None
+    return text.strip()
+
+
+def fold_text(text: Optional[str]) -> Optional[str]:
+    """
+    Genera la clave de búsqueda de un texto: minúsculas, sin tildes ni diacríticos
+    y con los espacios colapsados ("  Córdoba  Norte" -> "cordoba norte").
+    """
+    if text is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.lower().split())
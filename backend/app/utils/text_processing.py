@@ -1,5 +1,7 @@
 from bs4 import BeautifulSoup, Tag
+from app.services.tracing import traced
 
+@traced()
 def paginate_html_text(html: str, max_lines: int = 60, chars_per_line: int = 40) -> list:
     """
     Divide el texto HTML en páginas según un límite de líneas virtuales y caracteres por línea,
@@ -281,6 +283,7 @@ def paginate_html_text(html: str, max_lines: int = 60, chars_per_line: int = 40)
     return blocks
 
 
+@traced()
 def paginate_html_tables(html: str, max_lines: int = 60) -> list:
     """
     Pagina tablas HTML, títulos (h2, h3, h4, etc.) y párrafos: parte la tabla por filas o títulos cuando no quepan más en la página.
@@ -467,6 +470,7 @@ def paginate_html_tables(html: str, max_lines: int = 60) -> list:
         blocks.append(current_page)
     return blocks
 
+@traced()
 def paginate_material_topics(html: str, max_lines: int = 60, chars_per_line: int = 40) -> list:
     """
     Función específica para paginar el contenido de temas de materialidad.
@@ -0,0 +1,199 @@
+"""
+Benchmark de latencia bajo carga mixta (endpoints async frente a def).
+
+Monta una aplicación FastAPI con dos rutas por modo sobre una base de datos
+SQLite sintética:
+  - slow: matriz de materialidad recorriendo todas las valoraciones
+  - fast: lectura de una memoria por id
+En modo "async" las rutas son `async def` con SQLAlchemy síncrono (bloquean el
+bucle de eventos); en modo "sync" son `def` y FastAPI las ejecuta en el pool de
+hilos. Se lanzan a la vez clientes lentos y rápidos llamando a la aplicación ASGI
+directamente; las rápidas se emiten a ritmo fijo y su latencia (p50/p95/p99) se
+mide desde la hora prevista de envío.
+
+SQLite calcula en el propio proceso; --db-latency añade a cada consulta lenta una
+espera que libera el GIL, como la del servidor MySQL en producción.
+
+Uso:
+    python -m benchmarks.bench_concurrency --topics 60 --stakeholders 150 --requests 40
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Optional
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.models.models import SustainabilityReport
+from app.utils.graphs.materiality_matrix import create_materiality_matrix_data
+from benchmarks.fixtures import create_session, seed_reference_data, create_synthetic_report
+
+
+def build_app(session_factory, report_id: int, db_latency: float) -> FastAPI:
+    app = FastAPI()
+
+    def slow_query() -> dict:
+        db = session_factory()
+        try:
+            time.sleep(db_latency)
+            return {"points": len(create_materiality_matrix_data(db, report_id, exact=True)["points"])}
+        finally:
+            db.close()
+
+    def fast_query() -> dict:
+        db = session_factory()
+        try:
+            return {"year": db.query(SustainabilityReport.year).filter(SustainabilityReport.id == report_id).scalar()}
+        finally:
+            db.close()
+
+    @app.get("/async/slow")
+    async def async_slow():
+        return slow_query()
+
+    @app.get("/async/fast")
+    async def async_fast():
+        return fast_query()
+
+    @app.get("/sync/slow")
+    def sync_slow():
+        return slow_query()
+
+    @app.get("/sync/fast")
+    def sync_fast():
+        return fast_query()
+
+    return app
+
+
+async def call(app: FastAPI, path: str, scheduled: Optional[float] = None) -> float:
+    """
+    Ejecuta una petición GET contra la aplicación ASGI y devuelve su duración,
+    contada desde `scheduled` si se indica (incluye la espera a que el bucle la atienda).
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("bench", 0),
+        "server": ("bench", 80)
+    }
+    status: Dict[str, int] = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    start = scheduled if scheduled is not None else time.perf_counter()
+    await app(scope, receive, send)
+    elapsed = time.perf_counter() - start
+    assert status.get("code") == 200, f"{path} respondió {status.get('code')}"
+    return elapsed
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_mode(
+    app: FastAPI,
+    mode: str,
+    slow_clients: int,
+    fast_clients: int,
+    requests: int,
+    interval: float
+) -> dict:
+    fast_latencies: List[float] = []
+    slow_latencies: List[float] = []
+
+    async def slow_client() -> None:
+        for _ in range(max(1, requests // 4)):
+            slow_latencies.append(await call(app, f"/{mode}/slow"))
+
+    start = time.perf_counter()
+
+    async def fast_client(offset: float) -> None:
+        # Carga en bucle abierto: cada petición tiene su hora prevista y la latencia
+        # se cuenta desde ella, así que un bucle bloqueado sí penaliza la medida.
+        first = start + offset
+        for i in range(requests):
+            scheduled = first + i * interval
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            fast_latencies.append(await call(app, f"/{mode}/fast", scheduled))
+
+    await asyncio.gather(
+        *(slow_client() for _ in range(slow_clients)),
+        *(fast_client(interval * i / fast_clients) for i in range(fast_clients))
+    )
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "fast_requests": len(fast_latencies),
+        "slow_requests": len(slow_latencies),
+        "fast_p50": statistics.median(fast_latencies),
+        "fast_p95": percentile(fast_latencies, 0.95),
+        "fast_p99": percentile(fast_latencies, 0.99),
+        "slow_p50": statistics.median(slow_latencies),
+        "slow_p99": percentile(slow_latencies, 0.99)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=60)
+    parser.add_argument("--stakeholders", type=int, default=150)
+    parser.add_argument("--slow-clients", type=int, default=4)
+    parser.add_argument("--fast-clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--db-latency", type=float, default=0.05)
+    parser.add_argument("--interval", type=float, default=0.02, help="segundos entre peticiones de cada cliente rápido")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        db = create_session(url)
+        seed_reference_data(db)
+        report = create_synthetic_report(db, topics=args.topics, stakeholders=args.stakeholders, seed=7)
+        report_id = report.id
+        db.close()
+
+        engine = create_engine(url, connect_args={"check_same_thread": False}, pool_size=20, max_overflow=20)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        app = build_app(session_factory, report_id, args.db_latency)
+
+        results = [
+            asyncio.run(run_mode(app, mode, args.slow_clients, args.fast_clients, args.requests, args.interval))
+            for mode in ("async", "sync")
+        ]
+        engine.dispose()
+
+    print(json.dumps({
+        "benchmark": "concurrency",
+        "topics": args.topics,
+        "stakeholders": args.stakeholders,
+        "slow_clients": args.slow_clients,
+        "fast_clients": args.fast_clients,
+        "db_latency": args.db_latency,
+        "results": results
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
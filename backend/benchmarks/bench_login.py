@@ -0,0 +1,95 @@
+"""
+Benchmark de la verificación de contraseñas en el login.
+
+Lanza ráfagas de verificaciones bcrypt concurrentes dentro de un bucle asyncio,
+como haría el endpoint de login, y compara:
+  - blocking: bcrypt.checkpw directamente en el bucle (comportamiento anterior)
+  - pool: security.verify_password_async (pool acotado PASSWORD_HASH_WORKERS)
+
+Mide logins por segundo, latencia por login y el retraso máximo del bucle de
+eventos (lo que esperaría cualquier otra petición durante la ráfaga).
+
+Uso:
+    python -m benchmarks.bench_login --logins 64 --concurrency 16 --rounds 12
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import bcrypt
+from app.config import settings
+from app.services import security
+
+
+PASSWORD = "contraseña-de-prueba"
+
+
+async def _heartbeat(stop: asyncio.Event, interval: float, lags: list) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _run(mode: str, hashed: str, logins: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def login() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            if mode == "blocking":
+                ok = bcrypt.checkpw(PASSWORD.encode("utf-8"), hashed.encode("utf-8"))
+            else:
+                ok = await security.verify_password_async(PASSWORD, hashed)
+            assert ok
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0)
+
+    stop = asyncio.Event()
+    lags: list = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, 0.01, lags))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await heartbeat
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "logins_per_second": logins / elapsed,
+        "latency_p50": statistics.median(latencies),
+        "latency_p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "max_event_loop_lag": max(lags) if lags else 0.0
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=settings.BCRYPT_ROUNDS)
+    parser.add_argument("--mode", choices=["blocking", "pool", "both"], default="both")
+    args = parser.parse_args()
+
+    hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=args.rounds)).decode("utf-8")
+    modes = ["blocking", "pool"] if args.mode == "both" else [args.mode]
+
+    results = [asyncio.run(_run(mode, hashed, args.logins, args.concurrency)) for mode in modes]
+    print(json.dumps({
+        "benchmark": "login",
+        "bcrypt_rounds": args.rounds,
+        "hash_workers": settings.PASSWORD_HASH_WORKERS,
+        "logins": args.logins,
+        "concurrency": args.concurrency,
+        "results": results
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark de la clonación de memorias plantilla (transfer_report_data).
+
+Uso:
+    python -m benchmarks.bench_report_cloning --topics 300 --indicators 4 --repeat 3
+"""
+import argparse
+import json
+import time
+from sqlalchemy import func
+from app.models.models import SustainabilityReport, MaterialTopic, DiagnosisIndicator, PerformanceIndicator
+from app.crud.reports import transfer_report_data
+from benchmarks.fixtures import create_session, seed_reference_data, create_synthetic_report
+
+
+def count_rows(db, report_id: int) -> dict:
+    topic_ids = db.query(MaterialTopic.id).filter(MaterialTopic.report_id == report_id)
+    return {
+        "material_topics": topic_ids.count(),
+        "diagnosis_indicators": db.query(func.count(DiagnosisIndicator.id)).filter(
+            DiagnosisIndicator.material_topic_id.in_(topic_ids)
+        ).scalar()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="sqlite://")
+    parser.add_argument("--topics", type=int, default=300)
+    parser.add_argument("--indicators", type=int, default=4)
+    parser.add_argument("--objectives", type=int, default=2)
+    parser.add_argument("--actions", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db = create_session(args.url)
+    seed_reference_data(db)
+    template = create_synthetic_report(
+        db,
+        topics=args.topics,
+        indicators_per_topic=args.indicators,
+        objectives_per_topic=args.objectives,
+        actions_per_objective=args.actions,
+        stakeholders=20,
+        assessments_per_stakeholder=0,
+        text_paragraphs=2,
+        template=True
+    )
+
+    timings = []
+    for year in range(args.repeat):
+        new_report = SustainabilityReport(
+            heritage_resource_id=template.heritage_resource_id,
+            year=3000 + year,
+            state='Draft',
+            observation='',
+            scale=5
+        )
+        db.add(new_report)
+        db.commit()
+
+        start = time.perf_counter()
+        transfer_report_data(db, template.id, new_report.id)
+        timings.append(time.perf_counter() - start)
+
+        expected = count_rows(db, template.id)
+        copied = count_rows(db, new_report.id)
+        assert expected == copied, f"Copia incompleta: {copied} != {expected}"
+
+    print(json.dumps({
+        "benchmark": "report_cloning",
+        "dialect": db.get_bind().dialect.name,
+        "template": count_rows(db, template.id),
+        "performance_indicators": db.query(func.count(PerformanceIndicator.id)).scalar(),
+        "seconds": timings,
+        "best_seconds": min(timings)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Benchmark de la generación de informes sobre memorias sintéticas.
+
+Reproduce las etapas de generate_report_html y mide cada una con las trazas de
+app.services.tracing: get_report_data, la matriz de materialidad, cada gráfica,
+cada transformación de DataDump, cada paginate_* y ReportGenerator.generate_report
+(y generate_report_preview). Las imágenes se generan pero no se guardan y el HTML
+se escribe en un directorio temporal, así que no se toca static/.
+
+El resultado es un JSON con el commit actual para poder comparar ejecuciones.
+
+Uso:
+    python -m benchmarks.bench_report_rendering --size medium --repeat 3
+    python -m benchmarks.bench_report_rendering --topics 80 --photos 20 --output resultados.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from app.crud.reports import get_report_data
+from app.models.models import MaterialTopic, DiagnosisIndicator, Action, PerformanceIndicator, ReportPhoto
+from app.services import report_generator, tracing
+from app.utils.data_dump import DataDump
+from app.utils.graphs.internal_consistency import generate_internal_consistency_graph
+from app.utils.graphs.main_secondary_impacts import get_main_impacts_material_topics_graph, get_secondary_impacts_material_topics_graph
+from app.utils.graphs.materiality_matrix import create_materiality_matrix_data, generate_matrix_image
+from benchmarks.fixtures import create_session, seed_reference_data, create_synthetic_report
+
+
+SIZES = {
+    "small": {"topics": 10, "indicators": 2, "objectives": 1, "actions": 2, "action_indicators": 1, "stakeholders": 5, "photos": 3, "paragraphs": 3},
+    "medium": {"topics": 40, "indicators": 3, "objectives": 2, "actions": 2, "action_indicators": 2, "stakeholders": 15, "photos": 10, "paragraphs": 8},
+    "large": {"topics": 120, "indicators": 4, "objectives": 2, "actions": 3, "action_indicators": 2, "stakeholders": 30, "photos": 30, "paragraphs": 20}
+}
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def count_rows(db, report_id: int) -> dict:
+    topic_ids = db.query(MaterialTopic.id).filter(MaterialTopic.report_id == report_id)
+    return {
+        "material_topics": topic_ids.count(),
+        "diagnosis_indicators": db.query(func.count(DiagnosisIndicator.id)).filter(
+            DiagnosisIndicator.material_topic_id.in_(topic_ids)
+        ).scalar(),
+        "actions": db.query(func.count(Action.id)).scalar(),
+        "performance_indicators": db.query(func.count(PerformanceIndicator.id)).scalar(),
+        "photos": db.query(func.count(ReportPhoto.id)).filter(ReportPhoto.report_id == report_id).scalar()
+    }
+
+
+def run_data_dump(data: dict) -> None:
+    """
+    Ejecuta por separado cada transformación que usa generate_report.
+    """
+    dump = DataDump()
+    transforms = {
+        "cover": lambda: dump.dump_cover_data(data),
+        "resource_info": lambda: dump.dump_resource_info_data(data["resource"]),
+        "norms": lambda: dump.dump_norms_data(data["norms"]),
+        "agreements": lambda: dump.dump_agreements_data(data["agreements"]),
+        "bibliography": lambda: dump.dump_bibliography_data(data["bibliographies"]),
+        "gallery": lambda: dump.dump_gallery_data(data["gallery"]),
+        "team_members": lambda: dump.dump_team_members_data(data["team_members"]),
+        "stakeholders": lambda: dump.dump_stakeholders_data(data["stakeholders"]),
+        "material_topics": lambda: dump.dump_material_topics_data(data["material_topics"]),
+        "legend": lambda: dump.material_topics_data_from_legend(data["legend"]),
+        "diagnosis_tables": lambda: dump.dump_diagnosis_tables_data(data),
+        "action_plan": lambda: dump.dump_action_plan_data(data)
+    }
+    for name, transform in transforms.items():
+        with tracing.span(f"data_dump:{name}"):
+            transform()
+
+
+def render_once(db, report_id: int) -> tracing.Trace:
+    """
+    Una generación completa con las mismas etapas que generate_report_html.
+    """
+    with tracing.trace("report_rendering") as current:
+        with tracing.span("get_report_data"):
+            data = get_report_data(db, report_id)
+        with tracing.span("create_materiality_matrix_data"):
+            matrix_data = create_materiality_matrix_data(db, report_id, scale=data['scale'])
+
+        with tracing.span("graph:materiality_matrix"):
+            generate_matrix_image(matrix_data, scale=data['scale'])
+        with tracing.span("graph:main_impacts"):
+            get_main_impacts_material_topics_graph(data['material_topics'])
+        with tracing.span("graph:secondary_impacts"):
+            get_secondary_impacts_material_topics_graph(data['secondary_impacts'])
+        with tracing.span("graph:internal_consistency"):
+            _, dimension_totals_list = generate_internal_consistency_graph(data['dimension_totals'])
+
+        data['legend'] = matrix_data
+        data['dimension_totals'] = dimension_totals_list
+        for key in ("materiality_matrix", "main_impacts_graph", "secondary_impacts_graph", "internal_consistency_graph"):
+            data[key] = f"\\static\\uploads\\reports\\{report_id}\\{key}.png"
+
+        run_data_dump(data)
+
+        generator = report_generator.ReportGenerator()
+        generator.generate_report_preview(data)
+        generator.generate_report(data)
+    return current
+
+
+def summarize(runs: List[tracing.Trace]) -> Dict[str, dict]:
+    """
+    Por etapa: llamadas por generación y mejor/mediana del tiempo total.
+    """
+    stages: Dict[str, List[float]] = {}
+    calls: Dict[str, int] = {}
+    for run in runs:
+        for name, totals in run.stage_totals().items():
+            stages.setdefault(name, []).append(totals["seconds"])
+            calls[name] = int(totals["calls"])
+    stages["total"] = [run.duration for run in runs]
+    calls["total"] = 1
+    return {
+        name: {
+            "calls": calls[name],
+            "best_seconds": round(min(values), 6),
+            "median_seconds": round(statistics.median(values), 6)
+        }
+        for name, values in sorted(stages.items(), key=lambda item: -statistics.median(item[1]))
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite://")
+    parser.add_argument("--size", choices=SIZES, default="medium")
+    for option in SIZES["medium"]:
+        parser.add_argument(f"--{option.replace('_', '-')}", type=int, dest=option, help="Sustituye el valor de --size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1, help="Generaciones descartadas (plantillas, fuentes de matplotlib)")
+    parser.add_argument("--output", type=Path, help="Fichero donde guardar el JSON además de imprimirlo")
+    args = parser.parse_args()
+
+    size = {option: getattr(args, option) if getattr(args, option) is not None else value for option, value in SIZES[args.size].items()}
+
+    db = create_session(args.url)
+    seed_reference_data(db)
+    started = time.perf_counter()
+    report = create_synthetic_report(
+        db,
+        topics=size["topics"],
+        indicators_per_topic=size["indicators"],
+        objectives_per_topic=size["objectives"],
+        actions_per_objective=size["actions"],
+        indicators_per_action=size["action_indicators"],
+        stakeholders=size["stakeholders"],
+        photos=size["photos"],
+        text_paragraphs=size["paragraphs"]
+    )
+    fixture_seconds = time.perf_counter() - started
+
+    # Algunas etapas imprimen trazas de depuración; se desvían para que stdout sea solo JSON.
+    with tempfile.TemporaryDirectory() as output_dir, redirect_stdout(sys.stderr):
+        report_generator.settings.REPORTS_DIR = Path(output_dir)
+        for _ in range(args.warmup):
+            render_once(db, report.id)
+        runs = [render_once(db, report.id) for _ in range(args.repeat)]
+
+    result = {
+        "benchmark": "report_rendering",
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "dialect": db.get_bind().dialect.name,
+        "size": {"preset": args.size, **size},
+        "rows": count_rows(db, report.id),
+        "fixture_seconds": round(fixture_seconds, 3),
+        "repeat": args.repeat,
+        "stages": summarize(runs)
+    }
+    output = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
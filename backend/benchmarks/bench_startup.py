@@ -0,0 +1,152 @@
+"""
+Benchmark del arranque de un worker.
+
+Importa cada módulo en un intérprete nuevo con `python -X importtime`, sin base de
+datos (DATABASE_URL apunta a un fichero SQLite que no existe: importar no debe
+conectar), y mide:
+  - tiempo total del proceso e import acumulado del módulo
+  - memoria residente máxima (ru_maxrss) tras la importación
+  - los paquetes de primer nivel que más tardan en importarse
+  - qué subsistemas de renderizado (matplotlib, docx, bs4, Pillow...) quedan
+    cargados tras importar
+
+Con --compare-eager se repite cada medida importando además esos subsistemas,
+como ocurría antes de diferirlos (app/utils/lazy.py), y se muestra la diferencia.
+
+Uso:
+    python -m benchmarks.bench_startup --runs 3 --top 10 --compare-eager main app.db.session
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+RENDERING_MODULES = [
+    "matplotlib.pyplot",
+    "docx",
+    "bs4",
+    "PIL.Image",
+    "requests",
+    "app.services.report_generator",
+    "app.services.monitoring_templates"
+]
+
+CHILD_CODE = (
+    "import importlib, json, resource, sys, time\n"
+    "start = time.perf_counter()\n"
+    "for name in sys.argv[1:]:\n"
+    "    importlib.import_module(name)\n"
+    "elapsed = time.perf_counter() - start\n"
+    "rendering = [name for name in %r if name in sys.modules]\n"
+    "print(json.dumps([elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, rendering]))\n"
+) % (RENDERING_MODULES,)
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, object]]:
+    """
+    Convierte la salida de -X importtime en filas {module, self_us, cumulative_us, depth}.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": (len(match.group(3)) - 1) // 2
+            })
+    return rows
+
+
+def measure(module: str, env: Dict[str, str], eager: bool = False) -> Dict[str, object]:
+    modules = [module] + (RENDERING_MODULES if eager else [])
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_CODE, *modules],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Error al importar {module}:\n{result.stderr[-2000:]}")
+
+    import_seconds, max_rss_kb, rendering = json.loads(result.stdout.strip().splitlines()[-1])
+    return {
+        "wall_seconds": wall,
+        "import_seconds": import_seconds,
+        "max_rss_mb": max_rss_kb / 1024,
+        "rendering_loaded": rendering,
+        "rows": parse_importtime(result.stderr)
+    }
+
+
+def top_packages(rows: List[Dict[str, object]], top: int) -> List[Dict[str, object]]:
+    """
+    Paquetes de primer nivel (sin contar los de la aplicación) ordenados por el
+    tiempo acumulado de su primera importación, esté donde esté en el árbol.
+    """
+    totals: Dict[str, int] = {}
+    for row in rows:
+        package = str(row["module"])
+        if "." not in package and package not in ("app", "main", "benchmarks"):
+            totals[package] = max(totals.get(package, 0), int(row["cumulative_us"]))
+    ordered = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+    return [{"package": package, "import_ms": us / 1000} for package, us in ordered]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=["main"])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--compare-eager", action="store_true", help="mide también con los subsistemas de renderizado precargados")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ)
+        env["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'no-existe.db')}"
+        env["PYTHONPATH"] = str(BACKEND_DIR)
+
+        def summarize(module: str, eager: bool) -> Dict[str, object]:
+            runs = [measure(module, env, eager) for _ in range(args.runs)]
+            best = min(runs, key=lambda run: run["wall_seconds"])
+            return {
+                "module": module,
+                "eager_rendering": eager,
+                "wall_seconds": best["wall_seconds"],
+                "import_seconds": best["import_seconds"],
+                "max_rss_mb": min(run["max_rss_mb"] for run in runs),
+                "rendering_loaded": best["rendering_loaded"],
+                "connected_at_import": os.path.exists(os.path.join(tmp, "no-existe.db")),
+                "top_packages": top_packages(best["rows"], args.top)
+            }
+
+        results = []
+        for module in args.modules:
+            lazy = summarize(module, eager=False)
+            results.append(lazy)
+            if args.compare_eager:
+                eager = summarize(module, eager=True)
+                eager["saved_seconds"] = eager["import_seconds"] - lazy["import_seconds"]
+                eager["saved_rss_mb"] = eager["max_rss_mb"] - lazy["max_rss_mb"]
+                results.append(eager)
+
+    print(json.dumps({"benchmark": "startup", "runs": args.runs, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
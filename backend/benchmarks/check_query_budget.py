@@ -0,0 +1,182 @@
+"""
+Presupuesto de consultas SQL de las funciones crud.
+
+Cuenta las sentencias que llega a ejecutar cada función (evento
+before_cursor_execute del engine) sobre dos bases SQLite sembradas con
+memorias de distinto tamaño, y falla si alguna:
+  - supera su presupuesto, o
+  - lanza más consultas con la base grande que con la pequeña (N+1).
+
+Cada función se llama una vez antes de medir para que las cachés de datos de
+referencia (ODS, metas) ya estén cargadas y no cuenten.
+
+Uso:
+    python -m benchmarks.check_query_budget
+    python -m benchmarks.check_query_budget --only diagnosis --verbose
+"""
+import argparse
+import json
+import sys
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.crud import (
+    action_plan,
+    diagnosis_indicators,
+    impact_analytics,
+    material_topics,
+    ods,
+    reports,
+    stakeholders,
+    surveys,
+    team
+)
+from app.models.models import Action, SustainabilityTeamMember, User
+from app.schemas.team import TeamMemberSearch
+from app.utils.graphs.materiality_matrix import create_materiality_matrix_data
+from benchmarks.fixtures import create_session, seed_reference_data, create_synthetic_report
+
+
+SIZES = {
+    "small": {"topics": 5, "indicators": 2, "action_indicators": 1, "stakeholders": 3, "team_members": 2, "photos": 1, "reports": 2},
+    "large": {"topics": 40, "indicators": 5, "action_indicators": 4, "stakeholders": 20, "team_members": 10, "photos": 10, "reports": 15}
+}
+
+
+class Fixture(NamedTuple):
+    report_id: int
+    user_id: int
+    action_id: int
+
+
+class EntryPoint(NamedTuple):
+    name: str
+    budget: int
+    call: Callable[[Session, Fixture], Any]
+
+
+ENTRY_POINTS: List[EntryPoint] = [
+    EntryPoint("material_topics.get_all_by_report", 1, lambda db, f: material_topics.get_all_by_report(db, f.report_id)),
+    EntryPoint("material_topics.search", 1, lambda db, f: material_topics.search(db, report_id=f.report_id)),
+    EntryPoint("stakeholders.get_all_stakeholders_by_report", 1, lambda db, f: stakeholders.get_all_stakeholders_by_report(db, f.report_id)),
+    EntryPoint("diagnosis_indicators.get_all_by_report", 1, lambda db, f: diagnosis_indicators.get_all_by_report(db, f.report_id)),
+    EntryPoint("ods.get_all_secondary_impacts_by_report", 1, lambda db, f: ods.get_all_secondary_impacts_by_report(db, f.report_id)),
+    EntryPoint("ods.get_secondary_impact_counts_by_report", 1, lambda db, f: ods.get_secondary_impact_counts_by_report(db, f.report_id)),
+    EntryPoint("ods.get_all_action_secondary_impacts", 1, lambda db, f: ods.get_all_action_secondary_impacts(db, f.report_id)),
+    EntryPoint("action_plan.get_all_specific_objectives_by_report", 1, lambda db, f: action_plan.get_all_specific_objectives_by_report(db, f.report_id)),
+    EntryPoint("action_plan.get_all_actions_by_report", 1, lambda db, f: action_plan.get_all_actions_by_report(db, f.report_id)),
+    EntryPoint("action_plan.get_all_performance_indicators", 1, lambda db, f: action_plan.get_all_performance_indicators(db, f.action_id)),
+    EntryPoint("action_plan.get_all_performance_indicators_by_report", 1, lambda db, f: action_plan.get_all_performance_indicators_by_report(db, f.report_id)),
+    EntryPoint("action_plan.get_action_plan_by_report", 3, lambda db, f: action_plan.get_action_plan_by_report(db, f.report_id)),
+    EntryPoint("impact_analytics.get_dimension_totals", 1, lambda db, f: impact_analytics.get_dimension_totals(db, f.report_id, 1.0, 0.5)),
+    EntryPoint("surveys.get_all_assessments", 1, lambda db, f: surveys.get_all_assessments(db, f.report_id)),
+    EntryPoint("team.search_team_members", 1, lambda db, f: team.search_team_members(db, f.report_id, TeamMemberSearch(report_id=f.report_id))),
+    EntryPoint("team.search_team_members (paginado)", 2, lambda db, f: team.search_team_members(db, f.report_id, TeamMemberSearch(report_id=f.report_id, limit=5))),
+    EntryPoint("team.get_all_team_members_by_report", 1, lambda db, f: team.get_all_team_members_by_report(db, f.report_id)),
+    EntryPoint("reports.search_reports (miembro)", 1, lambda db, f: reports.search_reports(db, user_id=f.user_id)),
+    EntryPoint("reports.search_reports (admin, paginado)", 2, lambda db, f: reports.search_reports(db, is_admin=True, limit=10)),
+    EntryPoint("materiality_matrix.create_materiality_matrix_data", 2, lambda db, f: create_materiality_matrix_data(db, f.report_id, scale=5)),
+    EntryPoint("reports.get_report_data", 17, lambda db, f: reports.get_report_data(db, f.report_id))
+]
+
+
+@contextmanager
+def count_queries(db: Session) -> Iterator[List[str]]:
+    """
+    Recoge las sentencias SQL ejecutadas por la sesión dentro del bloque.
+    """
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def build_fixture(size: Dict[str, int]) -> tuple:
+    """
+    Una memoria principal del tamaño indicado y `reports` memorias más pequeñas
+    en las que participa el mismo usuario (para search_reports).
+    """
+    db = create_session("sqlite://")
+    seed_reference_data(db)
+    report = create_synthetic_report(
+        db,
+        topics=size["topics"],
+        indicators_per_topic=size["indicators"],
+        indicators_per_action=size["action_indicators"],
+        stakeholders=size["stakeholders"],
+        team_members=size["team_members"],
+        photos=size["photos"],
+        text_paragraphs=1
+    )
+
+    user = User(email="budget@example.com", password="x", admin=False, name="Presupuesto", surname="Consultas")
+    db.add(user)
+    db.flush()
+    for seed in range(1, size["reports"] + 1):
+        other = create_synthetic_report(db, topics=1, stakeholders=1, team_members=1, text_paragraphs=1, seed=seed)
+        db.add(SustainabilityTeamMember(type='consultant', organization="Organización", report_id=other.id, user_id=user.id))
+    db.commit()
+
+    action_id = db.query(Action.id).order_by(Action.id).first()[0]
+    return db, Fixture(report_id=report.id, user_id=user.id, action_id=action_id)
+
+
+def measure(db: Session, fixture: Fixture, entry: EntryPoint) -> List[str]:
+    entry.call(db, fixture)
+    db.expire_all()
+    with count_queries(db) as statements:
+        entry.call(db, fixture)
+    db.expire_all()
+    return statements
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="Mide solo las funciones cuyo nombre contiene este texto")
+    parser.add_argument("--verbose", action="store_true", help="Muestra las sentencias de las funciones que fallan")
+    args = parser.parse_args()
+
+    entries = [entry for entry in ENTRY_POINTS if not args.only or args.only in entry.name]
+    fixtures = {name: build_fixture(size) for name, size in SIZES.items()}
+
+    results = []
+    failures = 0
+    for entry in entries:
+        counts = {}
+        statements = {}
+        for name, (db, fixture) in fixtures.items():
+            statements[name] = measure(db, fixture, entry)
+            counts[name] = len(statements[name])
+
+        problems = []
+        if max(counts.values()) > entry.budget:
+            problems.append(f"supera el presupuesto de {entry.budget}")
+        if counts["large"] > counts["small"]:
+            problems.append("crece con el tamaño de la memoria")
+        failures += bool(problems)
+
+        results.append({"function": entry.name, "budget": entry.budget, "queries": counts, "problems": problems})
+        if problems and args.verbose:
+            print(f"{entry.name}: {', '.join(problems)}", file=sys.stderr)
+            for statement in statements["large"]:
+                print("    " + " ".join(statement.split())[:200], file=sys.stderr)
+
+    print(json.dumps({
+        "benchmark": "query_budget",
+        "sizes": SIZES,
+        "results": results,
+        "failures": failures
+    }, indent=2, ensure_ascii=False))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Fixtures sintéticas para los benchmarks.
+
+Crean una base de datos SQLite (en memoria o en fichero) con el esquema de la
+aplicación, los datos de referencia (dimensiones, ODS y metas) y memorias de
+sostenibilidad de tamaño configurable.
+"""
+import random
+from typing import Optional
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db.base_class import Base
+from app.crud.materiality_aggregates import rebuild_materiality_aggregates
+from app.models.models import (
+    Dimension,
+    ODS,
+    Goal,
+    User,
+    HeritageResource,
+    SustainabilityReport,
+    SustainabilityTeamMember,
+    Stakeholder,
+    MaterialTopic,
+    SecondaryODSMaterialTopic,
+    Assessment,
+    DiagnosisIndicator,
+    DiagnosisIndicatorQuantitative,
+    DiagnosisIndicatorQualitative,
+    SpecificObjective,
+    Action,
+    SecondaryODSAction,
+    PerformanceIndicator,
+    PerformanceIndicatorQuantitative,
+    PerformanceIndicatorQualitative,
+    ReportNorm,
+    ReportAgreement,
+    ReportBibliography,
+    ReportPhoto
+)
+
+
+DIMENSIONS = {
+    "Persona": [1, 2, 3, 4, 5],
+    "Planeta": [6, 12, 13, 14, 15],
+    "Prosperidad": [7, 8, 9, 10, 11],
+    "Paz": [16],
+    "Alianzas": [17]
+}
+
+GOALS_PER_ODS = 10
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, "
+    "quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat."
+)
+
+
+def create_session(url: str = "sqlite://") -> Session:
+    """
+    Crea el esquema en la base de datos indicada y devuelve una sesión.
+    """
+    if url == "sqlite://":
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def seed_reference_data(db: Session) -> None:
+    """
+    Inserta las dimensiones, los 17 ODS y sus metas.
+    """
+    for dimension_id, (name, ods_ids) in enumerate(DIMENSIONS.items(), start=1):
+        db.add(Dimension(id=dimension_id, name=name, description=f"Dimensión {name}"))
+        for ods_id in ods_ids:
+            db.add(ODS(id=ods_id, name=f"ODS {ods_id}", description=f"Objetivo {ods_id}", dimension_id=dimension_id))
+            for goal in range(1, GOALS_PER_ODS + 1):
+                db.add(Goal(ods_id=ods_id, goal_number=str(goal), description=f"Meta {ods_id}.{goal}"))
+    db.commit()
+
+
+def long_text(paragraphs: int) -> str:
+    """
+    Genera un texto HTML con el número de párrafos indicado.
+    """
+    return "".join(f"<p>{LOREM}</p>" for _ in range(paragraphs))
+
+
+def create_synthetic_report(
+    db: Session,
+    topics: int = 20,
+    indicators_per_topic: int = 3,
+    objectives_per_topic: int = 2,
+    actions_per_objective: int = 2,
+    indicators_per_action: int = 2,
+    stakeholders: int = 10,
+    assessments_per_stakeholder: Optional[int] = None,
+    text_paragraphs: int = 5,
+    team_members: int = 3,
+    photos: int = 0,
+    template: bool = False,
+    seed: int = 0
+) -> SustainabilityReport:
+    """
+    Crea un recurso patrimonial y una memoria con el volumen de datos indicado.
+    """
+    rng = random.Random(seed)
+
+    resource = HeritageResource(name=f"Recurso sintético {seed}", ownership="Pública")
+    db.add(resource)
+    db.flush()
+
+    text = long_text(text_paragraphs)
+    report = SustainabilityReport(
+        heritage_resource_id=resource.id,
+        year=2024,
+        state='Draft',
+        observation='',
+        scale=5,
+        template=template,
+        main_impact_weight=1.0,
+        secondary_impact_weight=0.5,
+        commitment_letter=text,
+        mission=text,
+        vision=text,
+        values=text,
+        org_chart_text=text,
+        diagnosis_description=text,
+        stakeholders_description=text,
+        materiality_text=text,
+        materiality_matrix_text=text,
+        main_secondary_impacts_text=text,
+        action_plan_text=text,
+        internal_consistency_description=text,
+        diffusion_text=text
+    )
+    db.add(report)
+    db.flush()
+
+    for i in range(team_members):
+        user = User(
+            email=f"user{seed}_{i}@example.com",
+            password="x",
+            admin=False,
+            name=f"Nombre {i}",
+            surname=f"Apellido {i}"
+        )
+        db.add(user)
+        db.flush()
+        db.add(SustainabilityTeamMember(
+            type='manager' if i == 0 else 'consultant',
+            organization="Organización",
+            report_id=report.id,
+            user_id=user.id
+        ))
+
+    for i in range(3):
+        db.add(ReportNorm(norm=f"Norma {i} https://example.com/{i}", report_id=report.id))
+        db.add(ReportAgreement(agreement=f"Acuerdo {i}", report_id=report.id))
+        db.add(ReportBibliography(reference=f"Referencia {i}", report_id=report.id))
+
+    for i in range(photos):
+        db.add(ReportPhoto(photo=f"/static/uploads/gallery/synthetic_{seed}_{i}.jpg", description=LOREM, report_id=report.id))
+
+    stakeholder_rows = []
+    for i in range(stakeholders):
+        stakeholder = Stakeholder(
+            name=f"Grupo {i}",
+            description=LOREM,
+            type='internal' if i % 2 == 0 else 'external',
+            report_id=report.id
+        )
+        db.add(stakeholder)
+        stakeholder_rows.append(stakeholder)
+    db.flush()
+
+    topic_rows = []
+    for t in range(topics):
+        ods_id = rng.randint(1, 17)
+        topic = MaterialTopic(
+            name=f"Asunto {t}",
+            description=LOREM,
+            priority=rng.choice(['high', 'medium', 'low']),
+            main_objective=LOREM,
+            goal_ods_id=ods_id,
+            goal_number=str(rng.randint(1, GOALS_PER_ODS)),
+            report_id=report.id
+        )
+        db.add(topic)
+        topic_rows.append(topic)
+    db.flush()
+
+    for topic in topic_rows:
+        for ods_id in rng.sample(range(1, 18), 3):
+            db.add(SecondaryODSMaterialTopic(ods_id=ods_id, material_topic_id=topic.id))
+
+        for i in range(indicators_per_topic):
+            indicator_type = 'quantitative' if i % 2 == 0 else 'qualitative'
+            indicator = DiagnosisIndicator(name=f"Indicador {topic.id}.{i}", type=indicator_type, material_topic_id=topic.id)
+            db.add(indicator)
+            db.flush()
+            if indicator_type == 'quantitative':
+                db.add(DiagnosisIndicatorQuantitative(diagnosis_indicator_id=indicator.id, numeric_response=rng.randint(0, 1000), unit="u"))
+            else:
+                db.add(DiagnosisIndicatorQualitative(diagnosis_indicator_id=indicator.id, response=LOREM))
+
+        for o in range(objectives_per_topic):
+            objective = SpecificObjective(description=LOREM, responsible=f"Responsable {o}", material_topic_id=topic.id)
+            db.add(objective)
+            db.flush()
+            for a in range(actions_per_objective):
+                action = Action(
+                    description=LOREM,
+                    difficulty=rng.choice(['low', 'medium', 'high']),
+                    execution_time="6 meses",
+                    ods_id=rng.randint(1, 17),
+                    specific_objective_id=objective.id
+                )
+                db.add(action)
+                db.flush()
+                for ods_id in rng.sample(range(1, 18), 2):
+                    db.add(SecondaryODSAction(action_id=action.id, specific_objective_id=objective.id, ods_id=ods_id))
+                for p in range(indicators_per_action):
+                    indicator_type = 'quantitative' if p % 2 == 0 else 'qualitative'
+                    indicator = PerformanceIndicator(
+                        name=f"Indicador de rendimiento {action.id}.{p}",
+                        human_resources="Personal",
+                        material_resources="Material",
+                        type=indicator_type,
+                        action_id=action.id
+                    )
+                    db.add(indicator)
+                    db.flush()
+                    if indicator_type == 'quantitative':
+                        db.add(PerformanceIndicatorQuantitative(performance_indicator_id=indicator.id, numeric_response=rng.randint(0, 100), unit="%"))
+                    else:
+                        db.add(PerformanceIndicatorQualitative(performance_indicator_id=indicator.id, response=LOREM))
+
+    answered_topics = topic_rows if assessments_per_stakeholder is None else topic_rows[:assessments_per_stakeholder]
+    for stakeholder in stakeholder_rows:
+        for topic in answered_topics:
+            db.add(Assessment(score=rng.randint(1, report.scale), material_topic_id=topic.id, stakeholder_id=stakeholder.id))
+
+    db.commit()
+    rebuild_materiality_aggregates(db, report.id)
+    db.refresh(report)
+    return report
@@ -0,0 +1,401 @@
+"""
+Pruebas de carga del tráfico anónimo: encuestas públicas y catálogo de memorias.
+
+Escenarios (se eligen al azar con los pesos de --mix):
+  - survey_search:  POST /api/survey/search/
+  - survey_submit:  POST /api/survey/create/assessments (una encuesta completa)
+  - public_search:  POST /api/public-reports/search (paginado, a veces con texto)
+  - static_report:  GET del HTML estático de una memoria publicada
+
+Cada usuario virtual mantiene una conexión HTTP/1.1 keep-alive, lanza un
+escenario, espera un tiempo de reflexión y repite hasta agotar --duration. Los
+usuarios arrancan escalonados durante --ramp-up. Al final se imprime un JSON con
+el rendimiento (peticiones/s) y los percentiles de latencia por escenario.
+
+El cliente HTTP es asyncio puro para no añadir dependencias; basta para medir
+la aplicación detrás de uvicorn/gunicorn o del proxy de docker-compose.
+
+Uso contra una instancia SQLite local:
+    python -m benchmarks.load_test prepare --url sqlite:///./load.db --reports 20 --output load_targets.json
+    DATABASE_URL=sqlite:///./load.db gunicorn -c gunicorn.conf.py main:app
+    python -m benchmarks.load_test run --targets load_targets.json --users 100 --duration 60
+
+Contra docker-compose (memorias y encuestas ya existentes), sin --targets el
+envío de encuestas se desactiva porque necesita stakeholders y asuntos:
+    python -m benchmarks.load_test run --base-url http://localhost --users 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+SCENARIOS = ("survey_search", "survey_submit", "public_search", "static_report")
+DEFAULT_MIX = "survey_search=3,survey_submit=2,public_search=4,static_report=3"
+SEARCH_TERMS = ("recurso", "sintético", "museo", "2024", "catedral")
+
+
+class HttpError(Exception):
+    pass
+
+
+class HttpConnection:
+    """
+    Conexión HTTP/1.1 persistente mínima (Content-Length y chunked). Se reabre
+    sola si el servidor la cierra.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, payload: Any = None) -> Tuple[int, bytes]:
+        """
+        Envía la petición y devuelve el código y el cuerpo de la respuesta.
+        """
+        try:
+            return await asyncio.wait_for(self._request(method, path, payload), self.timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _request(self, method: str, path: str, payload: Any) -> Tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        body = json.dumps(payload).encode() if payload is not None else b""
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", "Accept: */*", f"Content-Length: {len(body)}"]
+        if payload is not None:
+            head.append("Content-Type: application/json")
+        self.writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise HttpError("El servidor cerró la conexión")
+        status = int(status_line.split()[1])
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if method == "HEAD" or status in (204, 304):
+            content = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                chunk_size = int((await self.reader.readline()).split(b";")[0], 16)
+                if chunk_size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append((await self.reader.readexactly(chunk_size + 2))[:-2])
+            content = b"".join(chunks)
+        elif "content-length" in headers:
+            content = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            content = await self.reader.read()
+            headers["connection"] = "close"
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, content
+
+
+@dataclass
+class Sample:
+    scenario: str
+    status: int
+    seconds: float
+    size: int
+    error: Optional[str] = None
+
+
+@dataclass
+class Targets:
+    surveys: List[Dict[str, Any]] = field(default_factory=list)
+    static_paths: List[str] = field(default_factory=list)
+    resource_names: List[str] = field(default_factory=list)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Escenario desconocido: {name}. Opciones: {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def run_scenario(name: str, connection: HttpConnection, targets: Targets, api: str, rng: random.Random) -> Tuple[int, bytes]:
+    if name == "survey_search":
+        payload: Dict[str, Any] = {}
+        if targets.resource_names and rng.random() < 0.3:
+            payload["heritage_resource_name"] = rng.choice(targets.resource_names)[:6]
+        return await connection.request("POST", f"{api}/survey/search/", payload)
+
+    if name == "survey_submit":
+        survey = rng.choice(targets.surveys)
+        return await connection.request("POST", f"{api}/survey/create/assessments", {
+            "report_id": survey["report_id"],
+            "scale": survey["scale"],
+            "stakeholder_id": rng.choice(survey["stakeholder_ids"]),
+            "assessments": [
+                {"material_topic_id": topic_id, "score": rng.randint(1, survey["scale"])}
+                for topic_id in survey["material_topic_ids"]
+            ]
+        })
+
+    if name == "public_search":
+        payload = {"limit": 20, "offset": 20 * rng.randint(0, 2), "sort_by": "year", "sort_order": "desc"}
+        if rng.random() < 0.3:
+            payload["search_term"] = rng.choice(SEARCH_TERMS)
+        return await connection.request("POST", f"{api}/public-reports/search", payload)
+
+    return await connection.request("GET", rng.choice(targets.static_paths))
+
+
+async def virtual_user(
+    index: int,
+    args: argparse.Namespace,
+    targets: Targets,
+    mix: Dict[str, float],
+    started: float,
+    deadline: float,
+    samples: List[Sample]
+) -> None:
+    rng = random.Random(args.seed + index)
+    url = urlsplit(args.base_url)
+    connection = HttpConnection(url.hostname, url.port or 80, args.timeout)
+    names, weights = list(mix), list(mix.values())
+
+    await asyncio.sleep(args.ramp_up * index / max(1, args.users))
+    try:
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            request_started = time.perf_counter()
+            try:
+                status, content = await run_scenario(name, connection, targets, args.api_prefix, rng)
+                size, error = len(content), None
+            except (OSError, asyncio.TimeoutError, HttpError, ValueError, asyncio.IncompleteReadError) as e:
+                status, size, error = 0, 0, type(e).__name__
+            if request_started - started >= args.ramp_up:
+                samples.append(Sample(name, status, time.perf_counter() - request_started, size, error))
+            if args.think_time:
+                await asyncio.sleep(args.think_time * rng.uniform(0.5, 1.5))
+    finally:
+        await connection.close()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Percentil por rango más cercano sobre una lista ordenada.
+    """
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[rank]
+
+
+def summarize(samples: List[Sample], seconds: float) -> Dict[str, Any]:
+    def stats(group: List[Sample]) -> Dict[str, Any]:
+        latencies = sorted(sample.seconds * 1000 for sample in group if sample.error is None)
+        statuses: Dict[str, int] = {}
+        for sample in group:
+            key = sample.error or str(sample.status)
+            statuses[key] = statuses.get(key, 0) + 1
+        failed = sum(1 for sample in group if sample.error or sample.status >= 400)
+        return {
+            "requests": len(group),
+            "failed": failed,
+            "error_rate": round(failed / len(group), 4) if group else 0.0,
+            "throughput_rps": round(len(group) / seconds, 2) if seconds else 0.0,
+            "bytes_per_request": round(sum(sample.size for sample in group) / len(group)) if group else 0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50), 2),
+                "p90": round(percentile(latencies, 0.90), 2),
+                "p95": round(percentile(latencies, 0.95), 2),
+                "p99": round(percentile(latencies, 0.99), 2),
+                "max": round(latencies[-1], 2) if latencies else 0.0
+            },
+            "statuses": statuses
+        }
+
+    by_scenario: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_scenario.setdefault(sample.scenario, []).append(sample)
+    return {
+        "total": stats(samples),
+        "scenarios": {name: stats(group) for name, group in sorted(by_scenario.items())}
+    }
+
+
+async def discover_targets(args: argparse.Namespace, targets: Targets) -> None:
+    """
+    Completa los objetivos con lo que expone la propia API anónima: nombres de
+    recursos con encuesta activa y memorias publicadas para el HTML estático.
+    """
+    url = urlsplit(args.base_url)
+    connection = HttpConnection(url.hostname, url.port or 80, args.timeout)
+
+    async def get_items(path: str, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        status, content = await connection.request("POST", f"{args.api_prefix}{path}", payload)
+        if status != 200:
+            raise HttpError(f"{path} respondió {status}")
+        return json.loads(content).get("items", [])
+
+    try:
+        if not targets.resource_names:
+            surveys = await get_items("/survey/search/", {})
+            targets.resource_names = sorted({item["heritage_resource_name"] for item in surveys})
+        if not targets.static_paths:
+            catalogue = await get_items("/public-reports/search", {"limit": 100})
+            targets.static_paths = [
+                f"/static/uploads/reports/{item['report_id']}/report_{item['report_id']}_preview.html"
+                for item in catalogue
+            ]
+    finally:
+        await connection.close()
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    targets = Targets()
+    if args.targets:
+        data = json.loads(Path(args.targets).read_text(encoding="utf-8"))
+        targets = Targets(**{key: data.get(key, []) for key in ("surveys", "static_paths", "resource_names")})
+    await discover_targets(args, targets)
+
+    mix = dict(args.mix)
+    if not targets.surveys:
+        mix.pop("survey_submit", None)
+    if not targets.static_paths:
+        mix.pop("static_report", None)
+    disabled = sorted(set(args.mix) - set(mix))
+    if disabled:
+        print(f"Escenarios desactivados por falta de objetivos: {', '.join(disabled)}", file=sys.stderr)
+    if not mix:
+        raise SystemExit("No queda ningún escenario que ejecutar")
+
+    samples: List[Sample] = []
+    started = time.perf_counter()
+    deadline = started + args.ramp_up + args.duration
+    await asyncio.gather(*(
+        virtual_user(index, args, targets, mix, started, deadline, samples)
+        for index in range(args.users)
+    ))
+    measured = max(0.0, time.perf_counter() - started - args.ramp_up)
+
+    return {
+        "benchmark": "load_test",
+        "base_url": args.base_url,
+        "users": args.users,
+        "duration_seconds": round(measured, 2),
+        "ramp_up_seconds": args.ramp_up,
+        "think_time_seconds": args.think_time,
+        "mix": mix,
+        "targets": {"surveys": len(targets.surveys), "static_paths": len(targets.static_paths)},
+        **summarize(samples, measured)
+    }
+
+
+def prepare(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Crea en la base indicada memorias publicadas con la encuesta activa y
+    devuelve los identificadores que necesita el envío de encuestas. Con
+    --render genera el HTML de las primeras memorias en static/ (como al publicar).
+    """
+    from app.crud.reports import generate_report_html
+    from app.models.models import MaterialTopic, Stakeholder
+    from benchmarks.fixtures import create_session, seed_reference_data, create_synthetic_report
+
+    db = create_session(args.url)
+    seed_reference_data(db)
+    surveys = []
+    static_paths = []
+    for seed in range(args.reports):
+        report = create_synthetic_report(
+            db,
+            topics=args.topics,
+            stakeholders=args.stakeholders,
+            text_paragraphs=2,
+            seed=seed
+        )
+        report.state = 'Published'
+        report.survey_state = 'active'
+        db.commit()
+        surveys.append({
+            "report_id": report.id,
+            "scale": report.scale,
+            "stakeholder_ids": [row.id for row in db.query(Stakeholder.id).filter(Stakeholder.report_id == report.id)],
+            "material_topic_ids": [row.id for row in db.query(MaterialTopic.id).filter(MaterialTopic.report_id == report.id)]
+        })
+        if seed < args.render:
+            static_paths.append(generate_report_html(db, report.id))
+
+    return {"surveys": surveys, "static_paths": static_paths}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    prepare_parser = commands.add_parser("prepare", help="Siembra una base (p. ej. SQLite) y escribe el fichero de objetivos")
+    prepare_parser.add_argument("--url", required=True, help="URL de SQLAlchemy, p. ej. sqlite:///./load.db")
+    prepare_parser.add_argument("--reports", type=int, default=20)
+    prepare_parser.add_argument("--topics", type=int, default=15)
+    prepare_parser.add_argument("--stakeholders", type=int, default=10)
+    prepare_parser.add_argument("--render", type=int, default=3, help="Memorias cuyo HTML estático se genera")
+    prepare_parser.add_argument("--output", type=Path, default=Path("load_targets.json"))
+
+    run_parser = commands.add_parser("run", help="Lanza la carga y muestra el resultado en JSON")
+    run_parser.add_argument("--base-url", default="http://localhost:8000")
+    run_parser.add_argument("--api-prefix", default="/api")
+    run_parser.add_argument("--targets", type=Path, help="Fichero generado por prepare")
+    run_parser.add_argument("--users", type=int, default=50)
+    run_parser.add_argument("--duration", type=float, default=30, help="Segundos medidos tras el arranque escalonado")
+    run_parser.add_argument("--ramp-up", type=float, default=5, help="Segundos para arrancar todos los usuarios (no se miden)")
+    run_parser.add_argument("--think-time", type=float, default=1.0, help="Pausa media entre peticiones de un usuario")
+    run_parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    run_parser.add_argument("--timeout", type=float, default=30)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", type=Path, help="Fichero donde guardar el JSON además de imprimirlo")
+
+    args = parser.parse_args()
+    if args.command == "prepare":
+        targets = prepare(args)
+        args.output.write_text(json.dumps(targets, indent=2), encoding="utf-8")
+        print(f"{len(targets['surveys'])} encuestas y {len(targets['static_paths'])} memorias estáticas en {args.output}")
+        return
+
+    result = asyncio.run(run(args))
+    output = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Configuración de gunicorn para producción.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Lanza WEB_CONCURRENCY workers de uvicorn (por defecto, uno por núcleo: las
+gráficas, la paginación de informes y bcrypt consumen CPU) y recicla cada worker
+tras WORKER_MAX_REQUESTS peticiones (más un margen aleatorio) para contener el
+crecimiento de memoria de matplotlib.
+
+Los recursos por proceso se reparten antes de importar la aplicación:
+DB_CONNECTION_BUDGET conexiones a MySQL entre todos los workers y los núcleos
+entre los pools de bcrypt. Cualquier variable ya definida en el entorno tiene
+prioridad.
+"""
+import os
+import shutil
+
+
+def _int_env(name: str, default: int) -> int:
+    return int(os.getenv(name) or default)
+
+
+cpu_count = os.cpu_count() or 1
+worker_count = max(1, _int_env("WEB_CONCURRENCY", cpu_count))
+connections_per_worker = max(5, _int_env("DB_CONNECTION_BUDGET", 120) // worker_count)
+
+os.environ["WEB_CONCURRENCY"] = str(worker_count)
+os.environ.setdefault("DB_POOL_SIZE", str(min(10, connections_per_worker)))
+os.environ.setdefault("DB_MAX_OVERFLOW", str(connections_per_worker - int(os.environ["DB_POOL_SIZE"])))
+os.environ.setdefault("THREADPOOL_SIZE", str(connections_per_worker))
+os.environ.setdefault("PASSWORD_HASH_WORKERS", str(max(1, min(4, cpu_count // worker_count))))
+os.environ.setdefault("METRICS_MULTIPROCESS", "true" if worker_count > 1 else "false")
+
+from app.config import settings  # noqa: E402  (lee las variables anteriores)
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = settings.WEB_CONCURRENCY
+worker_class = "uvicorn.workers.UvicornWorker"
+
+max_requests = settings.WORKER_MAX_REQUESTS
+max_requests_jitter = settings.WORKER_MAX_REQUESTS_JITTER
+timeout = settings.WORKER_TIMEOUT
+graceful_timeout = settings.WORKER_GRACEFUL_TIMEOUT
+keepalive = 5
+
+# Cada worker importa la aplicación y crea su propio engine y cachés.
+preload_app = False
+
+# /dev/shm evita que el latido de los workers dependa de un disco lento (Docker).
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    settings.CACHE_SYNC_DIR.mkdir(parents=True, exist_ok=True)
+    # Las métricas de una ejecución anterior del servidor no se suman a esta.
+    shutil.rmtree(settings.METRICS_DIR, ignore_errors=True)
+    server.log.info(
+        f"{workers} workers, {os.environ['THREADPOOL_SIZE']} hilos y "
+        f"{os.environ['DB_POOL_SIZE']}+{os.environ['DB_MAX_OVERFLOW']} conexiones por worker, "
+        f"reciclado cada {max_requests}±{max_requests_jitter} peticiones"
+    )
+
+
+def worker_exit(server, worker):
+    server.log.info(f"Worker {worker.pid} detenido")
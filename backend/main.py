@@ -1,17 +1,65 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.endpoints import auth, users, resources, team, reports, stakeholders, material_topics, goals
-from app.api.endpoints import ods, surveys, diagnosis_indicators, action_plan, monitoring, backup, email
+from app.api.endpoints import ods, surveys, diagnosis_indicators, action_plan, monitoring, backup, email, health
+from app.api.endpoints import metrics as metrics_endpoint
+from app.api.middleware import RequestMetricsMiddleware
 from app.config import settings
+from app.db.session import SessionLocal, log_database_diagnostics, dispose_engine
+from app.services import reference_data, survey_ingestion, metrics
 from fastapi.staticfiles import StaticFiles
 import os
+import logging
+import anyio
 import dotenv
 
 dotenv.load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+def load_reference_data():
+    """Carga en memoria los datos de referencia (dimensiones, ODS y metas)."""
+    db = SessionLocal()
+    try:
+        reference_data.get_reference_data(db)
+    except Exception as e:
+        logger.warning(f"No se pudieron precargar los datos de referencia: {e}")
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Arranque y parada del servidor. Nada de esto ocurre al importar `main`:
+    crea los directorios de subida, ajusta el pool de hilos (THREADPOOL_SIZE),
+    comprueba la conexión y precarga los datos de referencia fuera del bucle de
+    eventos y arranca el escritor de encuestas. Al parar, guarda las respuestas
+    pendientes y cierra el pool de conexiones.
+    """
+    settings.create_directories()
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+
+    if await run_in_threadpool(log_database_diagnostics):
+        await run_in_threadpool(load_reference_data)
+    if survey_ingestion.start_writer(SessionLocal):
+        logger.info("Escritura por lotes de encuestas activa")
+
+    yield
+
+    survey_ingestion.stop_writer()
+    dispose_engine()
+    if settings.METRICS_MULTIPROCESS:
+        metrics.write_snapshot()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 origins = ["http://localhost:3000"]
@@ -43,6 +91,13 @@ app.include_router(action_plan.router, prefix=settings.API_V1_STR, tags=["action
 app.include_router(monitoring.router, prefix=settings.API_V1_STR, tags=["monitoring"])
 app.include_router(backup.router, prefix=settings.API_V1_STR, tags=["backup"])
 app.include_router(email.router, prefix=settings.API_V1_STR, tags=["email"])
+app.include_router(health.router, prefix=settings.API_V1_STR, tags=["health"])
+app.include_router(health.internal_router, tags=["health"])
+
+if settings.METRICS_ENABLED:
+    metrics.install_sql_hooks()
+    app.add_middleware(RequestMetricsMiddleware)
+    app.include_router(metrics_endpoint.router, tags=["metrics"])
 
 
-app.mount("/static", StaticFiles(directory="static", html=True), name="static")
\ No newline at end of file
+app.mount("/static", StaticFiles(directory="static", html=True), name="static")
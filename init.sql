@@ -1,16 +1,24 @@
 USE sustainability_db;
 
-INSERT INTO users (email, password, admin, name, surname, reset_token_state)
+-- Las claves *_search son las que calcula fold_text en los modelos (minúsculas,
+-- sin tildes); este INSERT no pasa por los @validates de SQLAlchemy.
+INSERT INTO users (email, password, admin, name, surname, reset_token_state, name_search, surname_search, email_search)
 SELECT 'i12gafej@uco.es',
        '$2b$12$hNxsfDKOVPEl16S6dr2DieSYij6Voiv7kPP1uHM9Z9EQEFx8NXRFu',
        1,
        'javier',
        'garcia fernandez',
-       0
+       0,
+       'javier',
+       'garcia fernandez',
+       'i12gafej@uco.es'
 WHERE NOT EXISTS (
     SELECT 1 FROM users WHERE email = 'i12gafej@uco.es'
 );
 
--- Actualizar la versión de Alembic a la correcta
-INSERT INTO alembic_version (version_num) VALUES ('acba37c024c3')
-ON DUPLICATE KEY UPDATE version_num = 'acba37c024c3';
\ No newline at end of file
+-- Administrador sembrado antes de existir las claves de búsqueda.
+UPDATE users
+SET name_search = 'javier',
+    surname_search = 'garcia fernandez',
+    email_search = 'i12gafej@uco.es'
+WHERE email = 'i12gafej@uco.es' AND name = 'javier' AND surname = 'garcia fernandez' AND name_search IS NULL;